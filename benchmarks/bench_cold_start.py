@@ -0,0 +1,91 @@
+"""Benchmark de arranque en frío: ``pd.read_excel`` vs cache Parquet.
+
+Cada medición corre en un intérprete nuevo (como un worker de Streamlit recién
+levantado), así que incluye el import de pandas/openpyxl o pyarrow.
+
+Uso::
+
+    python benchmarks/bench_cold_start.py            # v1, v2 y v3
+    python benchmarks/bench_cold_start.py -n 7 presup_py_v3.xlsx
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_WORKBOOKS = ["presup_py.xlsx", "presup_py_v2.xlsx", "presup_py_v3.xlsx"]
+
+# El snippet separa el tiempo de import del de lectura del Excel/Parquet.
+_SNIPPET = r"""
+import json, sys, time
+t0 = time.perf_counter()
+if sys.argv[1] == "excel":
+    import pandas as pd
+    import openpyxl
+    t1 = time.perf_counter()
+    df = pd.read_excel(sys.argv[2], sheet_name="Sheet1", engine="openpyxl")
+else:
+    import pyarrow
+    from pgn import read_excel_cached
+    t1 = time.perf_counter()
+    df = read_excel_cached(sys.argv[2], sheet_name="Sheet1")
+t2 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "read": t2 - t1, "rows": len(df)}))
+"""
+
+
+def _run(mode: str, workbook: Path, env: dict) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _SNIPPET, mode, str(workbook)],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _median(samples: list[dict], key: str) -> float:
+    return statistics.median(s[key] for s in samples)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("workbooks", nargs="*", default=DEFAULT_WORKBOOKS)
+    parser.add_argument("-n", "--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, PGN_CACHE_DIR=cache_dir, PYTHONPATH=str(ROOT))
+
+        print(
+            f"{'workbook':<20} {'rows':>6} {'excel read':>11} {'excel total':>12}"
+            f" {'pq read':>8} {'pq total':>9} {'read x':>7} {'total x':>8}"
+        )
+        for name in args.workbooks:
+            wb = Path(name) if Path(name).is_absolute() else ROOT / name
+            _run("cached", wb, env)  # construir el cache (no se mide)
+            excel = [_run("excel", wb, env) for _ in range(args.repeat)]
+            cached = [_run("cached", wb, env) for _ in range(args.repeat)]
+
+            e_read, p_read = _median(excel, "read"), _median(cached, "read")
+            e_total = statistics.median(s["import"] + s["read"] for s in excel)
+            p_total = statistics.median(s["import"] + s["read"] for s in cached)
+            print(
+                f"{wb.name:<20} {excel[0]['rows']:>6} {e_read:>11.3f} {e_total:>12.3f}"
+                f" {p_read:>8.3f} {p_total:>9.3f} {e_read / p_read:>6.1f}x {e_total / p_total:>7.1f}x"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Recarga de una revisión nueva: reconstruir lo derivado vs :func:`pgn.delta.apply_revision`.
+
+Sobre un dataset de :mod:`pgn.synthetic` (o un Excel) se arma una "revisión"
+con una fracción de los montos 2026 modificados, como entre lecturas del
+proyecto de ley. Se mide:
+
+- antes: reconstruir rankings, cubo, índice de búsqueda y vínculo entre años
+  de la versión nueva (lo que pasaba al cambiar el Excel);
+- después: diff por ``codigo`` + actualización incremental desde la versión
+  anterior (con esos artefactos ya calculados, como en un proceso andando).
+
+Además verifica que rankings y cubo incrementales sean idénticos a los reconstruidos.
+
+Uso::
+
+    python benchmarks/bench_delta.py
+    python benchmarks/bench_delta.py --rows 100000 1000000 --changed 0.001 0.01 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from pgn.artifacts import artifacts  # noqa: E402
+from pgn.data import SCHEMA, load_budget, normalize  # noqa: E402
+from pgn.delta import apply_revision  # noqa: E402
+from pgn.matching import match_sides, resolve, side  # noqa: E402
+from pgn.rankings import build_rankings, get_rankings  # noqa: E402
+from pgn.rollups import build_cube, get_cube  # noqa: E402
+from pgn.search import SEARCH_COLUMNS, build_index, get_index  # noqa: E402
+from pgn.synthetic import iter_frames  # noqa: E402
+
+
+def revised(df: pd.DataFrame, fraction: float, seed: int = 0) -> pd.DataFrame:
+    """Copia con ``fraction`` de los montos 2026 cambiados (±20 %) y la variación recalculada."""
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(df), size=max(1, int(len(df) * fraction)), replace=False)
+    out = df.copy()
+    m26 = out["monto_2026"].to_numpy(copy=True)
+    m26[rows] = (m26[rows] * rng.uniform(0.8, 1.2, len(rows))).astype(np.int64)
+    m25 = out["monto_2025"].to_numpy()
+    out["monto_2026"] = m26
+    out["variacion_pct"] = np.where(m25 > 0, (m26 / np.where(m25 > 0, m25, 1) - 1.0) * 100.0, np.nan)
+    out.attrs = {**df.attrs, "version": f"{df.attrs['version']}+{fraction}"}
+    return out
+
+
+def rebuild(df: pd.DataFrame) -> dict[str, float]:
+    times = {}
+    for name, fn in {
+        "rankings": lambda: build_rankings(df),
+        "cubo": lambda: build_cube(df),
+        "búsqueda": lambda: build_index([df[c] for c in SEARCH_COLUMNS]),
+        "vínculo": lambda: match_sides(side(df, 2025), side(df, 2026)),
+    }.items():
+        t0 = time.perf_counter()
+        fn()
+        times[name] = time.perf_counter() - t0
+    return times
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sources", nargs="*", type=Path)
+    parser.add_argument("--rows", nargs="+", type=lambda s: int(float(s)), default=[100_000])
+    parser.add_argument("--changed", nargs="+", type=float, default=[0.001, 0.01, 0.1])
+    args = parser.parse_args(argv)
+
+    if args.sources:
+        datasets = [(s.name, lambda s=s: load_budget(s)) for s in args.sources]
+    else:
+        def synthetic(rows):
+            df = pd.concat([normalize(c) for c in iter_frames(rows)], ignore_index=True)
+            df = df.astype({c: "category" for c, dtype in SCHEMA.items() if dtype == "category"})
+            df.attrs["version"] = f"synthetic-{rows}"
+            return df
+        datasets = [(f"sintético {rows:,} filas", lambda rows=rows: synthetic(rows)) for rows in args.rows]
+
+    print(f"{'dataset':<26} {'cambiadas':>10} {'reconstruir (s)':>16} {'incremental (s)':>16} {'ratio':>7}  idénticos")
+    for name, load in datasets:
+        base = load()
+        for fraction in args.changed:
+            artifacts.clear()
+            get_rankings(base), get_cube(base), get_index(base), resolve(base)  # versión anterior caliente
+            new = revised(base, fraction)
+            before = sum(rebuild(new).values())
+            t0 = time.perf_counter()
+            revision = apply_revision(base, new)
+            after = time.perf_counter() - t0
+            version = new.attrs["version"]
+            same = all(
+                np.array_equal(o, artifacts.get(version, "rankings").orders[k]) for k, o in build_rankings(new).orders.items()
+            ) and build_cube(new).table.equals(artifacts.get(version, "rollups").table)
+            print(f"{name:<26} {revision.delta.n_changed:>10,} {before:>16.3f} {after:>16.3f} {before / after:>6.0f}x  {same}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Memoria pico y tiempo: carga completa vs ingesta por bloques (pgn.ingest).
+
+Cada modo corre en un intérprete nuevo y reporta su RSS pico (``VmHWM``):
+
+- ``eager``: lo de antes, ``normalize(pd.read_excel(...))`` (o ``read_csv``).
+- ``stream``: :func:`pgn.ingest.ingest` a un Parquet canónico, sin armar el frame.
+- ``stream+load``: ingesta y después lectura del Parquet a un DataFrame
+  (lo que hace ``load_budget`` con una fuente grande).
+
+``base`` es el RSS después de importar pandas/pyarrow/openpyxl; ``pico - base``
+es lo que cuesta la carga en sí. Sin argumentos genera datasets con
+:mod:`pgn.synthetic` (xlsx de 10^5 filas y CSV de 10^6).
+
+Uso::
+
+    python benchmarks/bench_ingest.py
+    python benchmarks/bench_ingest.py extracto_situfin.xlsx --chunk-rows 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from pgn.synthetic import generate  # noqa: E402
+
+MODES = ("eager", "stream", "stream+load")
+
+_SNIPPET = r"""
+import json, resource, sys, time
+import openpyxl, pandas as pd, pyarrow, pyarrow.parquet
+from pgn import ingest, normalize
+
+def peak_kb():
+    # VmHWM es del proceso actual; ru_maxrss en Linux arrastra el pico del padre (fork+exec)
+    try:
+        with open("/proc/self/status") as fh:
+            return next(int(l.split()[1]) for l in fh if l.startswith("VmHWM:"))
+    except (OSError, StopIteration):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+base = peak_kb()
+mode, path, out, chunk_rows = sys.argv[1], sys.argv[2], sys.argv[3], int(sys.argv[4])
+t0 = time.perf_counter()
+if mode == "eager":
+    raw = pd.read_csv(path, encoding="utf-8-sig") if path.endswith(".csv") else pd.read_excel(path, engine="openpyxl")
+    rows = len(normalize(raw))
+else:
+    rows = ingest.ingest(path, out, chunk_rows=chunk_rows).rows
+    if mode == "stream+load":
+        rows = len(pyarrow.parquet.read_table(out).to_pandas())
+elapsed = time.perf_counter() - t0
+peak = peak_kb()
+print(json.dumps({"rows": rows, "seconds": elapsed, "base_kb": base, "peak_kb": peak}))
+"""
+
+
+def _run(mode: str, path: Path, out: Path, chunk_rows: int) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", _SNIPPET, mode, str(path), str(out), str(chunk_rows)],
+        cwd=ROOT,
+        env=dict(os.environ, PYTHONPATH=str(ROOT)),
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sources", nargs="*", type=Path)
+    parser.add_argument("--chunk-rows", type=int, default=50_000)
+    parser.add_argument("--json", type=Path, help="guardar resultados en este archivo")
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="pgn_ingest_") as tmp:
+        tmp = Path(tmp)
+        sources = args.sources or [
+            generate(tmp / "pgn_1e5.xlsx", 100_000),
+            generate(tmp / "pgn_1e6.csv", 1_000_000),
+        ]
+        print(f"{'fuente':<16} {'MB':>7} {'modo':<12} {'filas':>9} {'seg':>7} {'base MB':>8} {'pico MB':>8} {'carga MB':>9}")
+        for source in sources:
+            size = source.stat().st_size / 1e6
+            for mode in MODES:
+                r = _run(mode, source, tmp / "out.parquet", args.chunk_rows)
+                load_mb = (r["peak_kb"] - r["base_kb"]) / 1024
+                print(
+                    f"{source.name:<16} {size:>7.1f} {mode:<12} {r['rows']:>9,} {r['seconds']:>7.2f} "
+                    f"{r['base_kb'] / 1024:>8.0f} {r['peak_kb'] / 1024:>8.0f} {load_mb:>9.0f}"
+                )
+                results.append({"source": source.name, "mode": mode, **r})
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""Vínculo de organismos 2025 → 2026 (:mod:`pgn.matching`): blocking vs todos contra todos.
+
+Sobre un dataset de :mod:`pgn.synthetic` se "renombra" una fracción de los
+ítems 2026 (typo en una palabra, al principio o al final) y se les cambia el
+código, así sólo la pasada por similitud puede vincularlos. Se reporta:
+
+- tiempo de :func:`pgn.matching.match_sides` completo y pares candidatos;
+- cuántos de los renombrados quedaron con su pareja original (aciertos);
+- cuántos pares habría comparado todos contra todos (nombres distintos).
+
+Uso::
+
+    python benchmarks/bench_matching.py
+    python benchmarks/bench_matching.py --rows 1000 100000 --renamed 0.05 0.9
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from pgn.data import normalize  # noqa: E402
+from pgn.matching import match_sides, side  # noqa: E402
+from pgn.synthetic import iter_frames  # noqa: E402
+
+
+def _typo(name: str, rng: np.random.Generator) -> str:
+    words = name.split()
+    if not words:
+        return name
+    k = int(rng.integers(len(words)))
+    w = words[k]
+    if len(w) > 3:
+        i = int(rng.integers(len(w)))
+        words[k] = w[:i] + w[i + 1:]  # se borra una letra
+    else:
+        words[k] = w + "S"
+    return " ".join(words)
+
+
+def renamed(df: pd.DataFrame, fraction: float, seed: int = 0) -> tuple[pd.DataFrame, np.ndarray]:
+    """Copia con ``fraction`` de los ítems 2026 renombrados y recodificados; devuelve también sus filas."""
+    rng = np.random.default_rng(seed)
+    rows = np.flatnonzero(df["item_2026"].notna().to_numpy())
+    rows = np.sort(rng.choice(rows, size=int(len(rows) * fraction), replace=False))
+    out = df.copy()
+    item = out["item_2026"].astype(object)
+    item.iloc[rows] = [_typo(str(n), rng) for n in item.iloc[rows]]
+    out["item_2026"] = item.astype("category")
+    codigo = out["codigo"].astype("string")
+    codigo.iloc[rows] = [f"R-{i}" for i in range(len(rows))]
+    out["codigo"] = codigo
+    return out, rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", nargs="+", type=lambda s: int(float(s)), default=[1_000, 100_000])
+    parser.add_argument("--renamed", nargs="+", type=float, default=[0.05, 0.9])
+    args = parser.parse_args(argv)
+
+    print(f"{'filas':>10} {'renombrados':>12} {'tiempo (s)':>11} {'aciertos':>9} {'sin pareja':>11} {'todos×todos':>14}")
+    for n in args.rows:
+        base = pd.concat([normalize(c) for c in iter_frames(n)], ignore_index=True)
+        for fraction in args.renamed:
+            df, rows = renamed(base, fraction)
+            left, right = side(df, 2025), side(df, 2026)
+            t0 = time.perf_counter()
+            match = match_sides(left, right)
+            elapsed = time.perf_counter() - t0
+            pairs = match.pairs.set_index("right")["left"]
+            # en el sintético la pareja original es la misma fila
+            ok = int((pairs.reindex(rows).to_numpy() == rows).sum())
+            brute = left["nombre"].nunique() * right["nombre"].nunique()
+            print(f"{n:>10,} {len(rows):>12,} {elapsed:>11.2f} {ok / max(len(rows), 1):>8.1%} "
+                  f"{len(match.unmatched_right()):>11,} {brute:>14,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Memoria por columna del frame del PGN: representación anterior vs compacta.
+
+- antes: textos como ``string`` (un objeto por fila) y, en ``presup.py``,
+  columnas ``Monto_*_MM`` en float además de los montos originales;
+- después: textos repetidos como categóricas, ``nivel``/``entidad`` como
+  int16 parseados de ``Código`` y montos sólo en int64 (los millones se
+  calculan al mostrar).
+
+El dataset sale de :mod:`pgn.synthetic` (por defecto 10^6 filas) o de los
+archivos que se pasen.
+
+Uso::
+
+    python benchmarks/bench_memory.py
+    python benchmarks/bench_memory.py --rows 100000
+    python benchmarks/bench_memory.py presup_py_v3.xlsx
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd  # noqa: E402
+
+from pgn.data import SCHEMA, memory_report, normalize, to_display  # noqa: E402
+from pgn.ingest import iter_raw_chunks  # noqa: E402
+from pgn.synthetic import iter_frames  # noqa: E402
+
+MILLION = 1_000_000
+# Esquema anterior a los dtypes compactos
+LEGACY_SCHEMA = {col: "string" if dtype == "category" else dtype for col, dtype in SCHEMA.items()}
+
+
+def legacy_frames(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    canonical = df[list(SCHEMA)].astype(LEGACY_SCHEMA)
+    prepared = to_display(canonical)
+    prepared["Item_2025"] = prepared["Item_2025"].fillna("Item inexistente")
+    prepared["Monto_2025_MM"] = prepared["Monto_2025"] / MILLION
+    prepared["Monto_2026_MM"] = prepared["Monto_2026"] / MILLION
+    return canonical, prepared
+
+
+def compact_prepared(df: pd.DataFrame) -> pd.DataFrame:
+    # lo mismo que presup.prepare_tables (sin importar Streamlit)
+    prepared = to_display(df)
+    item = prepared["Item_2025"]
+    prepared["Item_2025"] = item.cat.add_categories(["Item inexistente"]).fillna("Item inexistente")
+    return prepared
+
+
+def _report(name: str, before: pd.DataFrame, after: pd.DataFrame) -> None:
+    b, a = memory_report(before), memory_report(after)
+    table = b.join(a, how="outer", lsuffix="_antes", rsuffix="_despues")
+    table = table.reindex([*before.columns, *(c for c in after.columns if c not in before.columns)])
+    scale, unit = (1e6, "MB") if b["bytes"].sum() > 1e7 else (1e3, "KB")
+    print(f"\n{name}")
+    print(f"{'columna':<16} {'dtype antes':<14} {unit + ' antes':>10} {'dtype después':<16} {unit + ' después':>10} {'ratio':>7}")
+    for col, r in table.iterrows():
+        size_b = r["bytes_antes"] / scale if pd.notna(r["bytes_antes"]) else 0.0
+        size_a = r["bytes_despues"] / scale if pd.notna(r["bytes_despues"]) else 0.0
+        ratio = f"{size_b / size_a:>6.1f}x" if size_a and size_b else f"{'-':>7}"
+        print(f"{col:<16} {str(r['dtype_antes']) if pd.notna(r['dtype_antes']) else '-':<14} {size_b:>10.1f} "
+              f"{str(r['dtype_despues']) if pd.notna(r['dtype_despues']) else '-':<16} {size_a:>10.1f} {ratio}")
+    total_b, total_a = b["bytes"].sum() / scale, a["bytes"].sum() / scale
+    print(f"{'TOTAL':<16} {'':<14} {total_b:>10.1f} {'':<16} {total_a:>10.1f} {total_b / total_a:>6.1f}x")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sources", nargs="*", type=Path)
+    parser.add_argument("--rows", type=lambda s: int(float(s)), default=1_000_000)
+    args = parser.parse_args(argv)
+
+    if args.sources:
+        datasets = [(s.name, (normalize(c) for c in iter_raw_chunks(s))) for s in args.sources]
+    else:
+        datasets = [(f"sintético {args.rows:,} filas", (normalize(c) for c in iter_frames(args.rows)))]
+
+    for name, chunks in datasets:
+        df = pd.concat(list(chunks), ignore_index=True)
+        for col, dtype in SCHEMA.items():  # las categorías de cada bloque se unifican al concatenar
+            if dtype == "category":
+                df[col] = df[col].astype("category")
+        canonical, prepared = legacy_frames(df)
+        _report(f"{name} — frame canónico (pgn.data.load_budget)", canonical, df)
+        _report(f"{name} — tablas de presup.py (prepare_tables)", prepared, compact_prepared(df))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""Carga de varios Excel/hojas: en serie vs pool de procesos (:mod:`pgn.parallel`).
+
+Cada caso se carga dos veces en frío (``.pgn_cache`` nuevo y cache de
+proceso vacío):
+
+- serie: :func:`pgn.data.load_budget` archivo por archivo, hoja por hoja;
+- paralelo: :func:`pgn.parallel.load_many` con ``--workers`` procesos.
+
+Casos: los tres Excel del repo (``presup_py``, ``_v2``, ``_v3``), ``--files``
+Excel sintéticos de ``--rows`` filas (:mod:`pgn.synthetic`) y un workbook con
+``--sheets`` hojas (como uno por año u objeto). Verifica que los frames sean
+idénticos en los dos modos. El speedup depende de los núcleos disponibles
+(se imprimen): con uno solo, el pool sólo suma el arranque de los procesos.
+Los Excel del repo pesan menos que ``PGN_PARALLEL_MB`` y se leen en serie.
+
+Uso::
+
+    python benchmarks/bench_parallel.py
+    python benchmarks/bench_parallel.py --rows 50000 --files 8 --sheets 4 --workers 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd  # noqa: E402
+
+from pgn import data  # noqa: E402
+from pgn.artifacts import artifacts  # noqa: E402
+from pgn.parallel import ALL_SHEETS, default_workers, expand, load_many  # noqa: E402
+from pgn.revisions import REVISION_FILES  # noqa: E402
+from pgn.synthetic import generate, iter_frames  # noqa: E402
+
+
+def multi_sheet(path: Path, rows: int, sheets: int) -> Path:
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for i in range(sheets):
+            frame = pd.concat(list(iter_frames(rows, seed=i)), ignore_index=True)
+            frame.to_excel(writer, sheet_name=f"Hoja{i + 1}", index=False)
+    return path
+
+
+def cold(tmp: Path, tag: str) -> None:
+    # cache Parquet nuevo (lo heredan los procesos hijos) y nada en memoria
+    os.environ["PGN_CACHE_DIR"] = str(tmp / f"cache_{tag}")
+    data.clear_cache()
+    artifacts.clear()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=lambda s: int(float(s)), default=10_000, help="filas por Excel/hoja sintética")
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--sheets", type=int, default=4)
+    parser.add_argument("--workers", nargs="+", type=int, default=sorted({2, default_workers()}))
+    args = parser.parse_args(argv)
+
+    print(f"núcleos: {os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        t0 = time.perf_counter()
+        cases = {
+            "repo (3 xlsx)": [ROOT / f for f in REVISION_FILES],
+            f"{args.files} xlsx × {args.rows:,}": [
+                generate(tmp / f"sint_{i}.xlsx", args.rows, seed=i) for i in range(args.files)
+            ],
+            f"1 xlsx, {args.sheets} hojas × {args.rows:,}": [
+                (multi_sheet(tmp / "hojas.xlsx", args.rows, args.sheets), ALL_SHEETS)
+            ],
+        }
+        print(f"datos generados en {time.perf_counter() - t0:.1f}s\n")
+
+        print(f"{'caso':<28} {'fuentes':>8} {'serie (s)':>10} {'procesos':>9} {'paralelo (s)':>13} {'speedup':>8}")
+        for name, sources in cases.items():
+            sources = expand(sources)
+            cold(tmp, f"{name}-serie")
+            t0 = time.perf_counter()
+            expected = [data.load_budget(p, sheet_name=s) for p, s in sources]
+            serial = time.perf_counter() - t0
+            for workers in args.workers:
+                cold(tmp, f"{name}-{workers}")
+                t0 = time.perf_counter()
+                frames = load_many(sources, workers=workers)
+                parallel = time.perf_counter() - t0
+                for a, b in zip(expected, frames):
+                    pd.testing.assert_frame_equal(a, b)
+                print(f"{name:<28} {len(sources):>8} {serial:>10.2f} {workers:>9} {parallel:>13.2f} "
+                      f"{serial / parallel:>7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
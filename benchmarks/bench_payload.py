@@ -0,0 +1,99 @@
+"""Tamaño y tiempo de decodificación del payload del dashboard embebido.
+
+Compara el modo ``records`` (JSON fila por fila, el original) con
+``columnar`` y ``columnar+gzip`` sobre el Excel real y copias escaladas
+(filas repetidas). La decodificación se mide en node (``JSON.parse`` +
+:data:`pgn.payload.JS_DECODER`) si está instalado; si no, sólo se reportan
+tamaños y el ``json.loads`` de Python.
+
+Uso::
+
+    python benchmarks/bench_payload.py
+    python benchmarks/bench_payload.py --scales 1 100 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from pgn.data import DEFAULT_WORKBOOK, load_budget  # noqa: E402
+from pgn.payload import JS_DECODER, MODES, build_payload, to_script_json  # noqa: E402
+
+_NODE_BENCH = JS_DECODER + r"""
+const fs = require("fs");
+const text = fs.readFileSync(process.argv[2], "utf8");
+const reps = Number(process.argv[3]);
+(async () => {
+  let best = Infinity;
+  for (let i = 0; i < reps; i++) {
+    const t0 = process.hrtime.bigint();
+    const ds = await loadPgnPayload(JSON.parse(text));
+    const ms = Number(process.hrtime.bigint() - t0) / 1e6;
+    if (!ds.records.length && ds.records.length !== 0) throw new Error("sin records");
+    best = Math.min(best, ms);
+  }
+  console.log(JSON.stringify({ ms: best }));
+})();
+"""
+
+
+def _node_decode_ms(text: str, reps: int, workdir: Path) -> float | None:
+    node = shutil.which("node")
+    if node is None:
+        return None
+    data = workdir / "payload.json"
+    script = workdir / "bench.js"
+    data.write_text(text, encoding="utf-8")
+    script.write_text(_NODE_BENCH, encoding="utf-8")
+    out = subprocess.run([node, str(script), str(data), str(reps)], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)["ms"]
+
+
+def _py_parse_ms(text: str, reps: int) -> float:
+    best = float("inf")
+    for _ in range(reps):
+        t0 = time.perf_counter()
+        json.loads(text)
+        best = min(best, (time.perf_counter() - t0) * 1000)
+    return best
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workbook", default=str(DEFAULT_WORKBOOK))
+    parser.add_argument("--scales", nargs="*", type=int, default=[1, 10, 100, 1000])
+    parser.add_argument("-n", "--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    base = load_budget(args.workbook)
+    print(f"{'filas':>9} {'modo':<14} {'bytes':>11} {'gzip (red)':>11} {'decode ms':>10} {'py parse ms':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            df = pd.concat([base] * scale, ignore_index=True) if scale > 1 else base
+            for mode in MODES:
+                text = to_script_json(build_payload(df, mode))
+                raw = text.encode("utf-8")
+                # lo que viaja si el servidor comprime la respuesta HTTP
+                wire = len(gzip.compress(raw)) if mode != "columnar+gzip" else len(raw)
+                node_ms = _node_decode_ms(text, args.repeat, Path(tmp))
+                py_ms = _py_parse_ms(text, args.repeat)
+                node_col = f"{node_ms:>10.2f}" if node_ms is not None else f"{'—':>10}"
+                print(f"{len(df):>9} {mode:<14} {len(raw):>11,} {wire:>11,} {node_col} {py_ms:>12.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
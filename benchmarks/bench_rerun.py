@@ -0,0 +1,83 @@
+"""Tiempo de servidor por rerun de cada app, con y sin cache del HTML.
+
+Cada app corre headless con ``streamlit.testing.v1.AppTest``: una primera
+corrida calienta los caches y después se miden ``--repeat`` reruns. Se
+repite todo en un proceso aparte con ``PGN_HTML_CACHE=0`` (el antes) y con el
+cache activo (el después).
+
+``--metrics`` agrega una corrida con ``PGN_METRICS=1`` (:mod:`pgn.metrics`)
+para ver cuánto cuesta la instrumentación encendida.
+
+Uso::
+
+    python benchmarks/bench_rerun.py
+    python benchmarks/bench_rerun.py presup_3.py -n 50
+    python benchmarks/bench_rerun.py --metrics
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_APPS = ["presup.py", "presup_2.py", "presup_3.py"]
+
+_SNIPPET = r"""
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+at.run()
+times = []
+for _ in range(int(sys.argv[2])):
+    t0 = time.perf_counter()
+    at.run()
+    times.append(time.perf_counter() - t0)
+print(json.dumps({"times": times, "errors": len(at.exception)}))
+"""
+
+
+def _measure(app: Path, repeat: int, html_cache: bool, metrics: bool = False) -> dict:
+    env = dict(os.environ, PYTHONPATH=str(ROOT), PGN_HTML_CACHE="1" if html_cache else "0",
+               PGN_METRICS="1" if metrics else "0")
+    out = subprocess.run(
+        [sys.executable, "-c", _SNIPPET, str(app), str(repeat)],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("apps", nargs="*", default=DEFAULT_APPS)
+    parser.add_argument("-n", "--repeat", type=int, default=20)
+    parser.add_argument("--metrics", action="store_true", help="medir también con PGN_METRICS=1")
+    args = parser.parse_args(argv)
+
+    extra = f" {'con métricas ms':>16}" if args.metrics else ""
+    print(f"{'app':<14} {'sin cache ms':>13} {'con cache ms':>13} {'mejora':>7}{extra}")
+    for name in args.apps:
+        app = ROOT / name
+        before = _measure(app, args.repeat, html_cache=False)
+        after = _measure(app, args.repeat, html_cache=True)
+        b = statistics.median(before["times"]) * 1000
+        a = statistics.median(after["times"]) * 1000
+        line = f"{name:<14} {b:>13.2f} {a:>13.2f} {b / a:>6.2f}x"
+        if args.metrics:
+            m = statistics.median(_measure(app, args.repeat, html_cache=True, metrics=True)["times"]) * 1000
+            line += f" {m:>16.2f}"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Comparación entre revisiones (:mod:`pgn.revisions`): merge por consulta vs alineación única.
+
+Sobre un dataset de :mod:`pgn.synthetic` se arman N revisiones (cada una
+cambia montos de una fracción de las filas y renombra algunas). Se compara:
+
+- ``merge``: lo que haría cada consulta sin estructura, un ``merge`` por
+  ``codigo`` de las dos revisiones y el ranking de cada una;
+- ``align``: :func:`pgn.revisions.align` una vez y :meth:`RevisionSet.compare`
+  por consulta (sin el cache de :mod:`pgn.artifacts`, que la deja en µs).
+
+Uso::
+
+    python benchmarks/bench_revisions.py
+    python benchmarks/bench_revisions.py --rows 1000 100000 --revisions 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from pgn.data import normalize  # noqa: E402
+from pgn.revisions import align  # noqa: E402
+from pgn.synthetic import iter_frames  # noqa: E402
+
+
+def revisions(base: pd.DataFrame, n: int, changed: float, seed: int = 0) -> list[pd.DataFrame]:
+    """``n`` revisiones sucesivas: cada una cambia montos 2026 de ``changed`` de las filas y renombra 1/10 de ellas."""
+    rng = np.random.default_rng(seed)
+    frames = [base]
+    for _ in range(n - 1):
+        df = frames[-1].copy()
+        rows = rng.choice(len(df), size=int(len(df) * changed), replace=False)
+        monto = df["monto_2026"].to_numpy(dtype="float64", copy=True)
+        monto[rows] *= rng.uniform(0.8, 1.2, size=len(rows))
+        df["monto_2026"] = monto.round()
+        item = df["item_2026"].astype(object)
+        item.iloc[rows[: len(rows) // 10]] = [f"{name} (REV)" for name in item.iloc[rows[: len(rows) // 10]]]
+        df["item_2026"] = item
+        frames.append(df)
+    return frames
+
+
+def naive(a: pd.DataFrame, b: pd.DataFrame) -> pd.DataFrame:
+    cols = ["codigo", "item_2026", "monto_2025", "monto_2026"]
+    left, right = a[cols].copy(), b[cols].copy()
+    for side in (left, right):
+        side["occ"] = side.groupby("codigo", sort=False).cumcount()
+        side["puesto"] = side["monto_2026"].rank(ascending=False, method="first")
+    m = left.merge(right, on=["codigo", "occ"], how="outer", suffixes=("_antes", "_despues"), indicator=True)
+    changed = (
+        (m["_merge"] != "both")
+        | (m["monto_2026_antes"] != m["monto_2026_despues"])
+        | (m["item_2026_antes"].astype(object) != m["item_2026_despues"].astype(object))
+    )
+    m = m[changed].assign(diferencia=lambda t: t["monto_2026_despues"].fillna(0) - t["monto_2026_antes"].fillna(0))
+    return m.sort_values("diferencia", key=np.abs, ascending=False)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", nargs="+", type=lambda s: int(float(s)), default=[1_000, 100_000])
+    parser.add_argument("--revisions", type=int, default=3)
+    parser.add_argument("--changed", type=float, default=0.02)
+    args = parser.parse_args(argv)
+
+    print(f"{'filas':>10} {'pares':>6} {'merge/par (ms)':>15} {'align (ms)':>11} {'compare/par (ms)':>17} {'cambios':>9}")
+    for n in args.rows:
+        base = pd.concat([normalize(c) for c in iter_frames(n)], ignore_index=True)
+        frames = revisions(base, args.revisions, args.changed)
+        labels = [f"v{i + 1}" for i in range(len(frames))]
+        pairs = list(itertools.combinations(range(len(frames)), 2))
+
+        t0 = time.perf_counter()
+        expected = [len(naive(frames[a], frames[b])) for a, b in pairs]
+        t_naive = (time.perf_counter() - t0) / len(pairs)
+
+        t0 = time.perf_counter()
+        revs = align(frames, labels)
+        t_align = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        got = [len(revs.compare(a, b)) for a, b in pairs]
+        t_compare = (time.perf_counter() - t0) / len(pairs)
+        assert got == expected, (got, expected)
+        print(f"{n:>10,} {len(pairs):>6} {t_naive * 1e3:>15.1f} {t_align * 1e3:>11.1f} "
+              f"{t_compare * 1e3:>17.1f} {sum(got):>9,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
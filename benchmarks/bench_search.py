@@ -0,0 +1,91 @@
+"""Búsqueda de organismos: índice de :mod:`pgn.search` vs filtrar las filas.
+
+- antes: lo que haría un filtro directo, ``str.contains`` sin acentos sobre
+  ``item_2025``/``item_2026``/``codigo`` en cada consulta (sin aproximada);
+- después: :meth:`pgn.search.SearchIndex.search` (se arma una vez por versión).
+
+Se reporta el tiempo de armado y tamaño del índice y la mediana por consulta.
+El dataset sale de :mod:`pgn.synthetic` (por defecto 10^3 y 10^5 filas) o de
+los archivos que se pasen.
+
+Uso::
+
+    python benchmarks/bench_search.py
+    python benchmarks/bench_search.py --rows 1000 100000 1000000
+    python benchmarks/bench_search.py presup_py_v3.xlsx
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from pgn.data import SCHEMA, load_budget, normalize  # noqa: E402
+from pgn.search import SEARCH_COLUMNS, build_index, normalize_name  # noqa: E402
+from pgn.synthetic import iter_frames  # noqa: E402
+
+QUERIES = ["MINISTERIO DE SALUD PÚBLICA", "salud pub", "minsterio salud", "12-08", "educacion", "m"]
+
+
+def _median_ms(fn, repeat: int) -> float:
+    fn()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1e3
+
+
+def scan(df: pd.DataFrame, query: str) -> np.ndarray:
+    q = normalize_name(query)
+    hit = np.zeros(len(df), dtype=bool)
+    for col in SEARCH_COLUMNS:
+        text = df[col].astype("string").fillna("")
+        norm = text.str.normalize("NFD").str.replace("[\u0300-\u036f]", "", regex=True).str.lower()
+        hit |= norm.str.contains(q, regex=False).to_numpy(dtype=bool)
+    return np.flatnonzero(hit)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sources", nargs="*", type=Path)
+    parser.add_argument("--rows", nargs="+", type=lambda s: int(float(s)), default=[1_000, 100_000])
+    parser.add_argument("-n", "--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if args.sources:
+        datasets = [(s.name, lambda s=s: load_budget(s)) for s in args.sources]
+    else:
+        def synthetic(rows):
+            df = pd.concat([normalize(c) for c in iter_frames(rows)], ignore_index=True)
+            return df.astype({c: "category" for c, dtype in SCHEMA.items() if dtype == "category"})
+        datasets = [(f"sintético {rows:,} filas", lambda rows=rows: synthetic(rows)) for rows in args.rows]
+
+    for name, load in datasets:
+        df = load()
+        t0 = time.perf_counter()
+        index = build_index([df[c] for c in SEARCH_COLUMNS])
+        built = time.perf_counter() - t0
+        print(f"\n{name}: {len(index.texts):,} textos distintos, índice {index.nbytes / 1e6:.1f} MB, armado {built * 1e3:,.0f} ms")
+        print(f"{'consulta':<30} {'filtro (ms)':>12} {'índice (ms)':>12} {'ratio':>8}  primer resultado")
+        for q in QUERIES:
+            before = _median_ms(lambda: scan(df, q), max(1, args.repeat // 10))
+            after = _median_ms(lambda: index.search(q, limit=20), args.repeat)
+            top = index.search(q, limit=1)
+            first = df["item_2026"].astype("string").iloc[top[0]] if len(top) else "—"
+            print(f"{q:<30} {before:>12.3f} {after:>12.3f} {before / after:>7.0f}x  {str(first)[:48]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+"""Arranque de las tres apps: del proceso nuevo a la primera corrida completa.
+
+Cada medición es un intérprete nuevo que corre la app headless con
+``streamlit.testing.v1.AppTest`` (como un worker recién levantado) y separa:
+
+- ``imports``: ``pandas``, ``openpyxl``, ``streamlit`` y ``pgn`` (en ese orden,
+  cada uno sin contar lo que ya importó el anterior);
+- ``load``: :func:`pgn.data.load_budget` (Excel o Parquet según ``--cache``);
+- ``transform``: tablas derivadas, rankings y payload del frontend;
+- ``serialize``: JSON del payload, archivos de :mod:`pgn.service`, HTML de la
+  página, ``st.dataframe`` y ``components.html``;
+- ``other``: el resto de la primera corrida (widgets, markdown, Streamlit).
+
+Las fases son tiempo exclusivo (si una llama a otra, no se cuenta dos veces).
+También se mide ``rerun`` (mediana de reruns con todo caliente).
+
+Además de los Excel del repo, ``--scale`` agrega copias de v3 con las filas
+repetidas N veces y ``--synthetic`` datasets de :mod:`pgn.synthetic` (nivel
+programa/proyecto/objeto, varios años). ``--json`` guarda los resultados; ``--compare`` muestra la
+relación contra un JSON anterior (por ejemplo, el de la release previa).
+
+Uso::
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --scale 10 100 -n 5 --json startup.json
+    python benchmarks/bench_startup.py --synthetic 1e4 1e5 -w presup_py_v3.xlsx
+    python benchmarks/bench_startup.py --compare startup_prev.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))  # pgn.synthetic (se importa recién al usarlo)
+DEFAULT_APPS = ["presup.py", "presup_2.py", "presup_3.py"]
+DEFAULT_WORKBOOKS = ["presup_py.xlsx", "presup_py_v2.xlsx", "presup_py_v3.xlsx"]
+PHASES = ("load", "transform", "serialize", "other")
+# Métricas que se comparan con --compare (segundos)
+COMPARE_KEYS = ("startup", "import", "first_run", "load", "transform", "serialize", "rerun")
+
+# Funciones que se envuelven en el proceso medido: (módulo, atributo, fase)
+_PROBES = [
+    ("pgn.data", "load_budget", "load"),
+    ("pgn.artifacts", "memoize", "transform"),
+    ("pgn.rankings", "build_rankings", "transform"),
+    ("pgn.payload", "build_payload", "transform"),
+    ("pgn.payload", "to_script_json", "serialize"),
+    ("pgn.service", "publish_tree", "serialize"),
+    ("pgn.html", "fill_template", "serialize"),
+    ("streamlit", "dataframe", "serialize"),
+    ("streamlit.components.v1", "html", "serialize"),
+]
+
+
+def _probe(app: str, spawned_at: float, reruns: int) -> dict:
+    # Corre dentro del proceso medido: nada pesado importado antes de esto.
+    imports = {}
+    for module in ("pandas", "openpyxl", "streamlit", "pgn"):
+        t0 = time.perf_counter()
+        __import__(module)
+        imports[module] = time.perf_counter() - t0
+
+    import importlib
+
+    from streamlit.testing.v1 import AppTest
+
+    phases = dict.fromkeys(PHASES, 0.0)
+    stack = []  # tiempo de hijos de cada span abierto, para medir tiempo exclusivo
+
+    def timed(fn, phase):
+        def wrapper(*args, **kwargs):
+            stack.append(0.0)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - t0
+                children = stack.pop()
+                phases[phase] += elapsed - children
+                if stack:
+                    stack[-1] += elapsed
+        return wrapper
+
+    def timed_memoize(fn):
+        # memoize(df, name, builder): sólo cuenta si de verdad construye
+        def wrapper(df, name, builder):
+            return fn(df, name, timed(builder, "transform"))
+        return wrapper
+
+    for module, attr, phase in _PROBES:
+        mod = importlib.import_module(module)
+        original = getattr(mod, attr)
+        setattr(mod, attr, timed_memoize(original) if attr == "memoize" else timed(original, phase))
+
+    at = AppTest.from_file(app, default_timeout=600)
+    t0 = time.perf_counter()
+    at.run()
+    first_run = time.perf_counter() - t0
+    startup = time.time() - spawned_at
+    errors = [e.message for e in at.exception] + [e.value for e in at.error]
+
+    phases["other"] = max(first_run - phases["load"] - phases["transform"] - phases["serialize"], 0.0)
+    rerun_times = []
+    for _ in range(reruns):
+        t1 = time.perf_counter()
+        at.run()
+        rerun_times.append(time.perf_counter() - t1)
+
+    from pgn import data as pgn_data
+
+    df = pgn_data.load_budget()
+    return {
+        "startup": startup,
+        "imports": imports,
+        "import": sum(imports.values()),
+        "first_run": first_run,
+        **phases,
+        "rerun": statistics.median(rerun_times) if rerun_times else None,
+        "rows": int(df.shape[0]),
+        "errors": errors,
+    }
+
+
+def _measure(app: Path, workbook: Path, cache_dir: Path, reruns: int) -> dict:
+    env = dict(
+        os.environ,
+        PYTHONPATH=str(ROOT),
+        PGN_WORKBOOK=str(workbook),
+        PGN_CACHE_DIR=str(cache_dir),
+        PGN_EXPORT_DIR=str(cache_dir / "exports"),
+    )
+    spawned_at = time.time()
+    out = subprocess.run(
+        [sys.executable, __file__, "--probe", str(app), repr(spawned_at), str(reruns)],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def scaled_copy(source: Path, factor: int, out_dir: Path) -> Path:
+    """Copia de ``source`` con las filas repetidas ``factor`` veces (mismo formato)."""
+    import pandas as pd
+
+    path = out_dir / f"{source.stem}_x{factor}.xlsx"
+    if not path.exists():
+        df = pd.read_excel(source, sheet_name="Sheet1", engine="openpyxl")
+        pd.concat([df] * factor, ignore_index=True).to_excel(path, sheet_name="Sheet1", index=False)
+    return path
+
+
+def synthetic_workbook(rows: int, out_dir: Path) -> Path:
+    from pgn.synthetic import generate
+
+    path = out_dir / f"pgn_synthetic_{rows}.xlsx"
+    return path if path.exists() else generate(path, rows)
+
+
+def _median_result(runs: list[dict]) -> dict:
+    result = {key: statistics.median(r[key] for r in runs) for key in COMPARE_KEYS + ("other",) if runs[0][key] is not None}
+    result["imports"] = {m: statistics.median(r["imports"][m] for r in runs) for m in runs[0]["imports"]}
+    result["rows"] = runs[0]["rows"]
+    result["errors"] = sorted({e for r in runs for e in r["errors"]})
+    return result
+
+
+def _metadata() -> dict:
+    from importlib import metadata
+
+    versions = {}
+    for package in ("streamlit", "pandas", "numpy", "openpyxl", "pyarrow"):
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "packages": versions,
+    }
+
+
+def _print_table(results: list[dict]) -> None:
+    print(
+        f"{'app':<12} {'workbook':<22} {'filas':>7} {'cache':>5} {'arranque':>9} {'import':>7} "
+        f"{'load':>7} {'transf':>7} {'serial':>7} {'otro':>7} {'rerun':>7}   (ms)"
+    )
+    for r in results:
+        ms = {k: (r[k] * 1000 if r.get(k) is not None else float("nan")) for k in COMPARE_KEYS + ("other",)}
+        print(
+            f"{r['app']:<12} {r['workbook']:<22} {r['rows']:>7} {r['cache']:>5} {ms['startup']:>9.0f} "
+            f"{ms['import']:>7.0f} {ms['load']:>7.1f} {ms['transform']:>7.1f} {ms['serialize']:>7.1f} "
+            f"{ms['other']:>7.1f} {ms['rerun']:>7.1f}"
+        )
+        for error in r["errors"]:
+            print(f"  ! {error}")
+
+
+def _print_compare(results: list[dict], baseline_path: Path) -> None:
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    old = {(r["app"], r["workbook"], r["cache"]): r for r in baseline["results"]}
+    print(f"\nvs {baseline_path} (commit {baseline['meta'].get('commit')}): actual/anterior, <1 es mejor")
+    print(f"{'app':<12} {'workbook':<22} {'cache':>5} " + " ".join(f"{k:>9}" for k in COMPARE_KEYS))
+    for r in results:
+        prev = old.get((r["app"], r["workbook"], r["cache"]))
+        if prev is None:
+            continue
+        ratios = [
+            f"{r[k] / prev[k]:>8.2f}x" if r.get(k) and prev.get(k) else f"{'-':>9}" for k in COMPARE_KEYS
+        ]
+        print(f"{r['app']:<12} {r['workbook']:<22} {r['cache']:>5} " + " ".join(ratios))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("apps", nargs="*", default=DEFAULT_APPS)
+    parser.add_argument("-w", "--workbooks", nargs="+", default=DEFAULT_WORKBOOKS)
+    parser.add_argument("--scale", nargs="*", type=int, default=[], help="copias de v3 con filas x N")
+    parser.add_argument("--synthetic", nargs="*", type=lambda s: int(float(s)), default=[],
+                        help="datasets sintéticos de N filas (pgn.synthetic, xlsx)")
+    parser.add_argument("--cache", choices=["cold", "warm", "both"], default="both",
+                        help="cold: sin Parquet (parsea el Excel); warm: Parquet ya generado")
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="procesos por combinación (se usa la mediana)")
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--json", type=Path, help="guardar resultados en este archivo")
+    parser.add_argument("--compare", type=Path, help="JSON de una corrida anterior")
+    args = parser.parse_args(argv)
+
+    caches = ["cold", "warm"] if args.cache == "both" else [args.cache]
+    results = []
+    with tempfile.TemporaryDirectory(prefix="pgn_bench_") as tmp:
+        tmp = Path(tmp)
+        workbooks = [ROOT / w for w in args.workbooks]
+        workbooks += [scaled_copy(ROOT / DEFAULT_WORKBOOKS[-1], f, tmp) for f in args.scale]
+        workbooks += [synthetic_workbook(rows, tmp) for rows in args.synthetic]
+        for workbook in workbooks:
+            for name in args.apps:
+                for cache in caches:
+                    runs = []
+                    if cache == "warm":  # una corrida sin medir genera el Parquet
+                        _measure(ROOT / name, workbook, tmp / f"cache_{workbook.stem}_warm", 0)
+                    for i in range(args.repeat):
+                        cache_dir = tmp / f"cache_{workbook.stem}_{cache}" / (str(i) if cache == "cold" else "")
+                        runs.append(_measure(ROOT / name, workbook, cache_dir, args.reruns))
+                    results.append({"app": name, "workbook": workbook.name, "cache": cache, **_median_result(runs)})
+
+    _print_table(results)
+    if args.json:
+        payload = {"meta": {**_metadata(), "repeat": args.repeat, "reruns": args.reruns}, "results": results}
+        args.json.write_text(json.dumps(payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"\n→ {args.json}")
+    if args.compare:
+        _print_compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "--probe":
+        print(json.dumps(_probe(sys.argv[2], float(sys.argv[3]), int(sys.argv[4]))))
+        sys.exit(0)
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Revisión nueva del Excel con el proceso andando: la paga un rerun vs :mod:`pgn.warmup`.
+
+Sobre un dataset de :mod:`pgn.synthetic` escrito como CSV se simula un
+"request" (lo que hace un rerun con los datos: :func:`pgn.data.load_budget`,
+rankings, cubo, índice de búsqueda y vínculos) y se reemplaza el archivo por
+una revisión con una fracción de los montos 2026 cambiados:
+
+- sin warmup: el primer request después del cambio lee y arma todo;
+- con warmup: un :class:`pgn.warmup.Watcher` prepara la versión nueva en su
+  hilo mientras se siguen haciendo requests cada 10 ms; se reporta el peor
+  request durante la transición, cuánto tardó en publicarse la versión nueva
+  y el primer request que la usa.
+
+Uso::
+
+    python benchmarks/bench_warmup.py
+    python benchmarks/bench_warmup.py --rows 10000 300000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from pgn import data  # noqa: E402
+from pgn.matching import resolve  # noqa: E402
+from pgn.rankings import get_rankings  # noqa: E402
+from pgn.rollups import get_cube  # noqa: E402
+from pgn.search import get_index  # noqa: E402
+from pgn.synthetic import iter_frames  # noqa: E402
+from pgn.warmup import Watcher  # noqa: E402
+
+
+def request(path: Path) -> str:
+    df = data.load_budget(path)
+    get_rankings(df), get_cube(df), get_index(df), resolve(df)
+    return df.attrs["version"]
+
+
+def write_revision(raw: pd.DataFrame, path: Path, fraction: float, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    out = raw.copy()
+    rows = rng.choice(len(out), size=max(1, int(len(out) * fraction)), replace=False)
+    monto = pd.to_numeric(out["Monto_2026"], errors="coerce").fillna(0).to_numpy(copy=True)
+    monto[rows] = (monto[rows] * rng.uniform(0.8, 1.2, len(rows))).round()
+    out["Monto_2026"] = monto.astype(np.int64)
+    tmp = path.with_name(path.name + ".tmp")
+    out.to_csv(tmp, index=False)
+    os.replace(tmp, path)  # como un checkout: el archivo cambia de una vez
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", nargs="+", type=lambda s: int(float(s)), default=[10_000, 100_000])
+    parser.add_argument("--changed", type=float, default=0.01)
+    args = parser.parse_args(argv)
+
+    print(f"{'filas':>10} {'sin warmup (s)':>15} {'peor request (ms)':>18} {'publicada en (s)':>17} "
+          f"{'1er request nueva (ms)':>23}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.rows:
+            raw = pd.concat(list(iter_frames(n)), ignore_index=True)
+
+            # sin warmup: el primer request después del cambio paga todo
+            path = Path(tmp) / f"cold_{n}.csv"
+            write_revision(raw, path, 0.0, 0)
+            request(path)
+            write_revision(raw, path, args.changed, 1)
+            t0 = time.perf_counter()
+            request(path)
+            cold = time.perf_counter() - t0
+
+            # con warmup: requests cada 10 ms mientras el hilo prepara la nueva
+            path = Path(tmp) / f"warm_{n}.csv"
+            write_revision(raw, path, 0.0, 0)
+            watcher = Watcher(interval=0.05)
+            watcher.watch(path)
+            old = request(path)
+            while watcher.status()[str(path.resolve())].version is None:
+                time.sleep(0.01)
+            write_revision(raw, path, args.changed, 1)
+            changed_at, worst = time.perf_counter(), 0.0
+            while True:
+                t0 = time.perf_counter()
+                version = request(path)
+                elapsed = time.perf_counter() - t0
+                if version != old:
+                    published = time.perf_counter() - changed_at
+                    break
+                worst = max(worst, elapsed)
+                time.sleep(0.01)
+            watcher.stop()
+            data.clear_cache()
+            print(f"{n:>10,} {cold:>15.2f} {worst * 1e3:>18.1f} {published:>17.2f} {elapsed * 1e3:>23.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
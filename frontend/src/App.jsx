@@ -278,32 +278,10 @@ function ClasificacionObjetoGasto() {
 // App
 // =========================
 export default function App() {
-  const records = Array.isArray(pgn?.records) ? pgn.records : [];
-
-  // Rankings
-  const top15Monto2026 = useMemo(() => {
-    return records
-      .map((r) => ({
-        codigo: r.codigo,
-        organismo: r.item_2026 || r.item_2025 || "",
-        monto_2026: Number(r.monto_2026 || 0)
-      }))
-      .sort((a, b) => b.monto_2026 - a.monto_2026)
-      .slice(0, 15);
-  }, [records]);
-
-  const top15VarPos = useMemo(() => {
-    return records
-      .map((r) => ({
-        codigo: r.codigo,
-        organismo: r.item_2026 || r.item_2025 || "",
-        monto_2026: Number(r.monto_2026 || 0),
-        variacion_pct: Number(r.variacion_pct)
-      }))
-      .filter((r) => Number.isFinite(r.variacion_pct) && r.variacion_pct > 0)
-      .sort((a, b) => b.variacion_pct - a.variacion_pct)
-      .slice(0, 15);
-  }, [records]);
+  // Rankings: filas ya ordenadas y recortadas en el build (python -m pgn.frontend)
+  const top15Monto2026 = (pgn?.top?.monto_2026 || []).slice(0, 15);
+  const top15VarPos = (pgn?.top?.var_pos || []).slice(0, 15);
+  const totalesPgn = pgn?.totals;
 
   // =========================
   // Selector: restringido SOLO a organismos con desglose cargado
@@ -455,6 +433,13 @@ export default function App() {
           Fuente: MEF | SITUFIN — Rankings desde Excel (→ JSON). Desgloses por
           objeto: carga incremental.
         </p>
+        {totalesPgn && (
+          <p className="small">
+            Total PGN 2026: {formatGs(totalesPgn.monto_2026)}
+            {totalesPgn.variacion_pct != null &&
+              ` (${totalesPgn.variacion_pct > 0 ? "+" : ""}${totalesPgn.variacion_pct.toFixed(1)}% vs 2025)`}
+          </p>
+        )}
       </div>
 
       {/* Rankings */}
@@ -0,0 +1,20 @@
+"""Capa de datos compartida del dashboard PGN Paraguay.
+
+Los tres entry points de Streamlit (``presup.py``, ``presup_2.py``,
+``presup_3.py``) y el export del frontend leen el Excel a través de este
+paquete.
+"""
+
+from .cache import read_excel_cached, workbook_fingerprint
+from .data import SCHEMA, dataset_version, load_budget, normalize, to_display, to_records
+
+__all__ = [
+    "SCHEMA",
+    "dataset_version",
+    "load_budget",
+    "normalize",
+    "read_excel_cached",
+    "to_display",
+    "to_records",
+    "workbook_fingerprint",
+]
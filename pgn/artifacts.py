@@ -0,0 +1,167 @@
+"""Cache de artefactos derivados (frames, bytes, índices) por versión del dataset.
+
+Todo lo que se calcula a partir del frame canónico (tablas preparadas,
+rankings, CSV, ...) se guarda acá bajo la clave ``(version, nombre)``. Así un
+rerun de Streamlit no recalcula nada más allá de cortar las tablas.
+
+- Memoria acotada: se estima el tamaño de cada artefacto y, si el total supera
+  ``PGN_ARTIFACT_CACHE_MB`` (256 MB por defecto), se descartan los menos
+  usados recientemente.
+- Invalidación explícita: cuando cambia el Excel, :func:`pgn.data.load_budget`
+  llama a :func:`evict_version` con la versión vieja.
+- Los listeners de :meth:`ArtifactCache.on_evict` (archivos en disco de una
+  versión) se llaman en los dos casos: con :func:`evict_version` y cuando el
+  LRU descarta la última entrada de una versión. Con ``keep`` se llaman
+  recién cuando hay ``keep`` versiones descartadas más nuevas: un iframe ya
+  abierto sigue pidiendo los JSON de la versión con la que se armó.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from .metrics import metrics
+
+DEFAULT_MAX_BYTES = int(float(os.environ.get("PGN_ARTIFACT_CACHE_MB", "256")) * 1024 * 1024)
+# Versiones descartadas cuyos archivos se conservan (static/data, exports)
+KEEP_FILES = int(os.environ.get("PGN_KEEP_VERSIONS", "2"))
+
+
+def estimate_nbytes(value: Any) -> int:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(estimate_nbytes(v) for v in value.values()) + sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_nbytes(v) for v in value) + sys.getsizeof(value)
+    nbytes = getattr(value, "nbytes", None)
+    return int(nbytes) if nbytes is not None else sys.getsizeof(value)
+
+
+class ArtifactCache:
+    """LRU acotado en bytes con claves ``(version, nombre)``."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._items: OrderedDict[tuple[str, str], tuple[Any, int]] = OrderedDict()
+        self._nbytes = 0
+        # (listener, keep, versiones descartadas todavía no notificadas)
+        self._listeners: list[tuple[Callable[[str], None], int, deque]] = []
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, version: str, name: str, default=None):
+        with self._lock:
+            item = self._items.get((version, name))
+            if item is None:
+                return default
+            self._items.move_to_end((version, name))
+            return item[0]
+
+    def put(self, version: str, name: str, value: Any) -> Any:
+        size = estimate_nbytes(value)
+        dropped_versions = set()
+        with self._lock:
+            old = self._items.pop((version, name), None)
+            if old is not None:
+                self._nbytes -= old[1]
+            self._items[(version, name)] = (value, size)
+            self._nbytes += size
+            for _, _, retired in self._listeners:  # la versión vuelve a usarse
+                if version in retired:
+                    retired.remove(version)
+            # nunca se descarta lo recién insertado, aunque solo supere el límite
+            while self._nbytes > self.max_bytes and len(self._items) > 1:
+                (dropped_version, _), (_, dropped) = self._items.popitem(last=False)
+                self._nbytes -= dropped
+                dropped_versions.add(dropped_version)
+            # versiones que se quedaron sin ninguna entrada
+            dropped_versions -= {v for v, _ in self._items}
+        self._notify(dropped_versions)
+        return value
+
+    def get_or_build(self, version: str | None, name: str, builder: Callable[[], Any]) -> Any:
+        """Devuelve el artefacto cacheado o lo construye con ``builder()``.
+
+        Sin versión (p. ej. un Excel subido) no se cachea.
+        """
+        if version is None:
+            return builder()
+        with self._lock:
+            item = self._items.get((version, name))
+            if item is not None:
+                self._items.move_to_end((version, name))
+                self.hits += 1
+            else:
+                self.misses += 1
+        # por tipo de artefacto: "html:presup_2:..." → "html", "presup.tables" → "presup.tables"
+        metrics.cache(name.split(":", 1)[0], item is not None)
+        if item is not None:
+            return item[0]
+        return self.put(version, name, builder())
+
+    def on_evict(self, listener: Callable[[str], None], keep: int = 0) -> None:
+        # listener(version) se llama al descartar una versión (p. ej. borrar
+        # archivos), o ``keep`` descartes después
+        self._listeners.append((listener, keep, deque()))
+
+    def evict_version(self, version: str) -> int:
+        with self._lock:
+            keys = [k for k in self._items if k[0] == version]
+            for k in keys:
+                self._nbytes -= self._items.pop(k)[1]
+        self._notify({version})
+        return len(keys)
+
+    def _notify(self, versions: set[str]) -> None:
+        calls = []
+        with self._lock:
+            for listener, keep, retired in self._listeners:
+                for version in versions:
+                    if version in retired:
+                        retired.remove(version)
+                    retired.append(version)
+                while len(retired) > keep:
+                    calls.append((listener, retired.popleft()))
+        # fuera del lock: los listeners borran archivos
+        for listener, version in calls:
+            listener(version)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._nbytes = 0
+
+
+# cache único del proceso
+artifacts = ArtifactCache()
+
+
+def memoize(df: pd.DataFrame, name: str, builder: Callable[[], Any]) -> Any:
+    # Atajo: artefacto derivado de ``df`` (usa ``df.attrs["version"]``)
+    return artifacts.get_or_build(df.attrs.get("version"), name, builder)
+
+
+def evict_version(version: str) -> int:
+    return artifacts.evict_version(version)
@@ -0,0 +1,337 @@
+"""JS de los dashboards embebidos: versiones fijas, copia local y build sin Babel.
+
+Modos (``PGN_ASSETS``):
+
+- ``local`` (por defecto si ``static/vendor`` tiene las versiones fijadas):
+  los archivos servidos por Streamlit desde ``static/``
+  (``server.enableStaticServing``). Los nombres llevan el hash del contenido,
+  así el browser puede cachearlos indefinidamente y revalidar por ETag.
+- ``cdn`` (por defecto si no): React/ReactDOM/Recharts desde unpkg, pero con
+  versión fija (antes ``recharts/umd`` sin versión) e ``integrity`` si ya se
+  corrió ``fetch``.
+- ``inline``: el JS va dentro del HTML del iframe (host sin red ni static
+  serving); el HTML ya queda cacheado por :mod:`pgn.html`.
+
+El JSX de ``presup_2.py`` vive en ``static/src/`` y se precompila con
+``build`` (esbuild), así el browser no descarga ni ejecuta Babel. Sin build,
+``presup_2.py`` sigue usando Babel desde el CDN.
+
+React, ReactDOM y prop-types están commiteados en ``static/vendor`` (con el
+lock, ``assets.lock.json``, que fija el hash de cada archivo). Lo que falte
+(Recharts, Babel, que no se pudieron commitear todavía) lo baja ``ensure`` una
+vez por proceso al arrancar, verificado contra el lock si ya tiene hash; sin
+red queda el CDN (``PGN_ASSETS_FETCH=0`` lo apaga). El workflow
+``.github/workflows/assets.yml`` corre ``fetch``/``build`` y abre un PR con los
+cambios de ``static/``; a mano, en una máquina con red::
+
+    python -m pgn.assets fetch     # baja y verifica las versiones fijadas
+    python -m pgn.assets ensure    # sólo lo que falta (lo que hace la app al arrancar)
+    python -m pgn.assets build     # compila static/src/*.jsx → static/build/
+    python -m pgn.assets status
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import functools
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import urllib.request
+from dataclasses import dataclass
+from pathlib import Path
+
+from .data import ROOT
+
+STATIC_DIR = ROOT / "static"
+VENDOR_DIR = STATIC_DIR / "vendor"
+BUILD_DIR = STATIC_DIR / "build"
+SRC_DIR = STATIC_DIR / "src"
+LOCK_FILE = VENDOR_DIR / "assets.lock.json"
+
+CDN = "https://unpkg.com"
+MODES = ("cdn", "local", "inline")
+ESBUILD = "esbuild@0.23.1"
+
+
+@dataclass(frozen=True)
+class VendorAsset:
+    package: str
+    version: str
+    path: str
+
+    @property
+    def url(self) -> str:
+        return f"{CDN}/{self.package}@{self.version}/{self.path}"
+
+
+# Orden de carga: cada uno usa los globales de los anteriores
+VENDOR = {
+    "react": VendorAsset("react", "18.3.1", "umd/react.production.min.js"),
+    "react-dom": VendorAsset("react-dom", "18.3.1", "umd/react-dom.production.min.js"),
+    "prop-types": VendorAsset("prop-types", "15.8.1", "prop-types.min.js"),
+    "recharts": VendorAsset("recharts", "2.12.7", "umd/Recharts.min.js"),
+    # sólo para presup_2 sin build
+    "babel": VendorAsset("@babel/standalone", "7.24.7", "babel.min.js"),
+}
+DASHBOARD_VENDOR = ("react", "react-dom", "prop-types", "recharts")
+
+
+class AssetsMissing(RuntimeError):
+    pass
+
+
+def local_ready(names=tuple(VENDOR)) -> bool:
+    """``static/vendor`` tiene ``names`` con las versiones fijadas (se corrió ``fetch``)."""
+    lock = read_lock()["vendor"]
+    for name in names:
+        entry = lock.get(name)
+        if not entry or entry.get("version") != VENDOR[name].version or not (VENDOR_DIR / entry["file"]).is_file():
+            return False
+    return True
+
+
+_bootstrap_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _bootstrap() -> bool:
+    # una vez por proceso (el primer rerun tras el deploy): completa static/vendor
+    if os.environ.get("PGN_ASSETS_FETCH", "1") == "0":
+        return False
+    with _bootstrap_lock:
+        for error in ensure():
+            print(f"pgn.assets: {error}", file=sys.stderr)
+        return local_ready()
+
+
+def assets_mode() -> str:
+    # sin PGN_ASSETS: local si ya están los archivos (o se completan al arrancar), si no el CDN
+    mode = os.environ.get("PGN_ASSETS") or ("local" if local_ready() or _bootstrap() else "cdn")
+    if mode not in MODES:
+        raise ValueError(f"PGN_ASSETS={mode!r} no válido (opciones: {MODES})")
+    return mode
+
+
+def _integrity(data: bytes) -> str:
+    return "sha384-" + base64.b64encode(hashlib.sha384(data).digest()).decode("ascii")
+
+
+def _lock_mtime() -> int:
+    try:
+        return LOCK_FILE.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+@functools.lru_cache(maxsize=4)
+def _read_lock(mtime_ns: int) -> dict:
+    if not mtime_ns:
+        return {"vendor": {}, "build": {}}
+    return json.loads(LOCK_FILE.read_text(encoding="utf-8"))
+
+
+def read_lock() -> dict:
+    return _read_lock(_lock_mtime())
+
+
+def _write_lock(lock: dict) -> None:
+    VENDOR_DIR.mkdir(parents=True, exist_ok=True)
+    LOCK_FILE.write_text(json.dumps(lock, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def static_url(base_url: str, rel: str) -> str:
+    # URL que sirve Streamlit (enableStaticServing) para static/<rel>
+    return "/" + "/".join(p for p in (base_url.strip("/"), "app/static", rel) if p)
+
+
+def _inline(path: Path) -> str:
+    # "</script" dentro del JS cerraría el tag
+    return "<script>" + path.read_text(encoding="utf-8").replace("</script", "<\\/script") + "</script>"
+
+
+def _tag(entry: dict | None, url: str | None, rel: str | None, mode: str, base_url: str) -> str:
+    if mode == "inline":
+        return _inline(STATIC_DIR / rel)
+    integrity = f' integrity="{entry["integrity"]}"' if entry else ""
+    src = static_url(base_url, rel) if mode == "local" else url
+    return f'<script crossorigin="anonymous" src="{src}"{integrity}></script>'
+
+
+@functools.lru_cache(maxsize=32)
+def _vendor_scripts(names: tuple[str, ...], mode: str, base_url: str, lock_mtime: int) -> str:
+    lock = _read_lock(lock_mtime)["vendor"]
+    tags = []
+    for name in names:
+        entry = lock.get(name)
+        if entry and entry.get("version") != VENDOR[name].version:
+            entry = None  # lock viejo: no usar su integrity ni su archivo
+        if mode != "cdn" and entry is None:
+            raise AssetsMissing(f"Falta {name}@{VENDOR[name].version} en static/vendor: correr `python -m pgn.assets fetch`.")
+        rel = f"vendor/{entry['file']}" if entry else None
+        tags.append(_tag(entry, VENDOR[name].url, rel, mode, base_url))
+    return "\n    ".join(tags)
+
+
+def vendor_scripts(names=DASHBOARD_VENDOR, mode: str | None = None, base_url: str = "") -> str:
+    """Tags ``<script>`` de las librerías ``names`` según el modo."""
+    return _vendor_scripts(tuple(names), mode or assets_mode(), base_url, _lock_mtime())
+
+
+def app_script(entry: str, mode: str | None = None, base_url: str = "") -> str:
+    """Tag del JS propio ``static/src/<entry>.jsx``: compilado si hay build, si no con Babel.
+
+    El build se inserta inline en ``cdn``/``inline`` (es chico) y por URL en ``local``.
+    """
+    mode = mode or assets_mode()
+    built = read_lock()["build"].get(entry)
+    source = SRC_DIR / f"{entry}.jsx"
+    if built and built["source_sha256"] == hashlib.sha256(source.read_bytes()).hexdigest():
+        rel = f"build/{built['file']}"
+        return _tag(built, None, rel, "local" if mode == "local" else "inline", base_url)
+    # sin build: Babel (del CDN o de static/vendor, según el modo) compila en el browser
+    jsx = source.read_text(encoding="utf-8").replace("</script", "<\\/script")
+    return vendor_scripts(["babel"], mode, base_url) + '\n    <script type="text/babel">\n' + jsx + "</script>"
+
+
+@dataclass(frozen=True)
+class Scripts:
+    mode: str
+    vendor: str
+    app: str
+    warning: str | None = None
+
+    @property
+    def key(self) -> str:
+        # para la clave del HTML cacheado: cambia si cambian los tags (fetch/build nuevo)
+        return self.mode + "-" + hashlib.sha1((self.vendor + self.app).encode("utf-8")).hexdigest()[:12]
+
+
+@functools.lru_cache(maxsize=16)
+def _resolve(entry, names, mode, base_url, lock_mtime, src_mtime) -> Scripts:
+    try:
+        return Scripts(mode, vendor_scripts(names, mode, base_url), app_script(entry, mode, base_url) if entry else "")
+    except AssetsMissing as e:
+        if mode == "cdn":
+            raise
+        fallback = _resolve(entry, names, "cdn", base_url, lock_mtime, src_mtime)
+        return Scripts("cdn", fallback.vendor, fallback.app, f"PGN_ASSETS={mode}: {e} Se usa el CDN.")
+
+
+def resolve(entry: str | None = None, names=DASHBOARD_VENDOR, base_url: str = "") -> Scripts:
+    """Tags para una página; si faltan archivos locales, vuelve a ``cdn`` con ``warning``."""
+    src_mtime = (SRC_DIR / f"{entry}.jsx").stat().st_mtime_ns if entry else 0
+    return _resolve(entry, tuple(names), assets_mode(), base_url, _lock_mtime(), src_mtime)
+
+
+def _store(name: str, data: bytes, lock: dict) -> None:
+    # guarda el archivo con hash en el nombre y su entrada en el lock (sin escribir el lock)
+    asset = VENDOR[name]
+    integrity = _integrity(data)
+    old = lock["vendor"].get(name)
+    if old and old["version"] == asset.version and old["integrity"] != integrity:
+        raise RuntimeError(f"{asset.url}: el contenido no coincide con el lock ({old['integrity']})")
+    stem = asset.package.replace("@", "").replace("/", "-")
+    filename = f"{stem}-{asset.version}.{hashlib.sha256(data).hexdigest()[:8]}.js"
+    (VENDOR_DIR / filename).write_bytes(data)
+    if old and old.get("file") not in (None, filename):
+        (VENDOR_DIR / old["file"]).unlink(missing_ok=True)
+    lock["vendor"][name] = {"version": asset.version, "url": asset.url, "file": filename, "integrity": integrity}
+    print(f"{name}@{asset.version}: {filename} ({len(data):,} bytes)")
+
+
+def fetch(names=tuple(VENDOR)) -> dict:
+    """Baja las versiones fijadas a ``static/vendor`` (si el lock ya tiene hash, lo verifica)."""
+    lock = read_lock()
+    VENDOR_DIR.mkdir(parents=True, exist_ok=True)
+    for name in names:
+        with urllib.request.urlopen(VENDOR[name].url, timeout=60) as resp:  # noqa: S310 - URL fija
+            _store(name, resp.read(), lock)
+    _write_lock(lock)
+    return lock
+
+
+def ensure() -> list[str]:
+    """Paso de deploy: baja sólo lo fijado que falte en ``static/vendor``.
+
+    Lo que ya está commiteado no se toca; lo bajado se verifica contra el lock
+    si tiene hash. Devuelve los errores (sin red queda lo que haya y el CDN).
+    """
+    errors = []
+    for name in VENDOR:
+        if local_ready((name,)):
+            continue
+        try:
+            fetch([name])
+        except (OSError, RuntimeError) as e:
+            errors.append(f"{name}@{VENDOR[name].version}: {e}")
+    return errors
+
+
+def build(entries=None) -> dict:
+    """Compila ``static/src/*.jsx`` con esbuild (minificado); sólo si cambió la fuente."""
+    lock = read_lock()
+    npx = shutil.which("npx")
+    BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    for source in sorted(SRC_DIR.glob("*.jsx")):
+        entry = source.stem
+        if entries and entry not in entries:
+            continue
+        digest = hashlib.sha256(source.read_bytes()).hexdigest()
+        old = lock["build"].get(entry)
+        if old and old["source_sha256"] == digest and (BUILD_DIR / old["file"]).is_file():
+            print(f"{entry}: sin cambios")
+            continue
+        if npx is None:
+            raise AssetsMissing("Se necesita node/npx para compilar el JSX.")
+        tmp = BUILD_DIR / f"{entry}.tmp.js"
+        subprocess.run(
+            [npx, "--yes", ESBUILD, str(source), "--loader:.jsx=jsx", "--minify",
+             "--target=es2018", "--format=iife", f"--outfile={tmp}"],
+            check=True,
+        )
+        data = tmp.read_bytes()
+        filename = f"{entry}.{hashlib.sha256(data).hexdigest()[:8]}.min.js"
+        os.replace(tmp, BUILD_DIR / filename)
+        if old and old.get("file") != filename:
+            (BUILD_DIR / old["file"]).unlink(missing_ok=True)
+        lock["build"][entry] = {"source_sha256": digest, "file": filename, "integrity": _integrity(data)}
+        print(f"{entry}: {filename} ({len(data):,} bytes)")
+    _write_lock(lock)
+    return lock
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Assets JS de los dashboards embebidos.")
+    parser.add_argument("command", choices=["fetch", "ensure", "build", "status"])
+    args = parser.parse_args(argv)
+
+    if args.command == "fetch":
+        fetch()
+    elif args.command == "ensure":
+        errors = ensure()
+        for error in errors:
+            print(error, file=sys.stderr)
+        return 1 if errors else 0
+    elif args.command == "build":
+        build()
+    else:
+        lock = read_lock()
+        for name, asset in VENDOR.items():
+            entry = lock["vendor"].get(name)
+            ok = entry and entry["version"] == asset.version and (VENDOR_DIR / entry["file"]).is_file()
+            print(f"{name:<11} {asset.version:<8} {'ok ' + entry['file'] if ok else 'falta (fetch)'}")
+        for source in sorted(SRC_DIR.glob("*.jsx")):
+            built = lock["build"].get(source.stem)
+            fresh = built and built["source_sha256"] == hashlib.sha256(source.read_bytes()).hexdigest()
+            print(f"{source.stem:<20} {'ok ' + built['file'] if fresh else 'sin build al día (build)'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""Cache columnar (Parquet) de los Excel del PGN.
+
+Parsear el xlsx con openpyxl es, lejos, lo más lento de un arranque en frío.
+La primera lectura convierte la hoja a Parquet dentro de ``.pgn_cache/`` (al
+lado del Excel) y las siguientes leen ese archivo. El cache se invalida sólo
+si cambia el Excel: primero se compara tamaño/mtime y, si difieren, el hash
+del contenido (un ``git checkout`` cambia el mtime pero no los bytes).
+
+Si ``pyarrow`` no está instalado, o el directorio no es escribible, se lee el
+Excel directamente como antes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from .metrics import metrics
+
+try:
+    import pyarrow  # noqa: F401
+except ImportError:  # pragma: no cover - depende del entorno
+    HAS_PYARROW = False
+else:
+    HAS_PYARROW = True
+
+CACHE_DIRNAME = ".pgn_cache"
+DEFAULT_SHEET = "Sheet1"
+_HASH_CHUNK = 1 << 20
+
+
+def _cache_dir(path: Path) -> Path:
+    # PGN_CACHE_DIR permite mover el cache fuera del repo (p. ej. /tmp en Cloud)
+    override = os.environ.get("PGN_CACHE_DIR")
+    return Path(override) if override else path.parent / CACHE_DIRNAME
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def workbook_fingerprint(path, with_hash: bool = True) -> dict:
+    """Identidad del Excel: tamaño, mtime y (opcional) sha256 del contenido."""
+    path = Path(path)
+    st = path.stat()
+    fp = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if with_hash:
+        fp["sha256"] = _sha256(path)
+    return fp
+
+
+def _manifest_path(path: Path, sheet_name: str) -> Path:
+    return _cache_dir(path) / f"{path.name}.{sheet_name}.json"
+
+
+def _read_manifest(manifest: Path) -> dict | None:
+    try:
+        return json.loads(manifest.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic(target: Path, data: bytes) -> None:
+    tmp = target.with_name(target.name + f".tmp{os.getpid()}")
+    tmp.write_bytes(data)
+    os.replace(tmp, target)
+
+
+def _lookup(path: Path, sheet_name: str) -> tuple[Path | None, dict, dict | None]:
+    # Devuelve (parquet válido o None, fingerprint actual, manifest previo)
+    manifest_file = _manifest_path(path, sheet_name)
+    manifest = _read_manifest(manifest_file)
+    fp = workbook_fingerprint(path, with_hash=False)
+
+    if manifest is None:
+        return None, fp, None
+
+    parquet = manifest_file.parent / manifest.get("parquet", "")
+    if not parquet.is_file():
+        return None, fp, manifest
+
+    if manifest.get("size") == fp["size"] and manifest.get("mtime_ns") == fp["mtime_ns"]:
+        fp["sha256"] = manifest.get("sha256")
+        return parquet, fp, manifest
+
+    # mtime distinto: confirmar por contenido antes de re-parsear
+    fp["sha256"] = _sha256(path)
+    if fp["sha256"] == manifest.get("sha256"):
+        manifest.update(size=fp["size"], mtime_ns=fp["mtime_ns"])
+        try:
+            _write_atomic(manifest_file, json.dumps(manifest).encode("utf-8"))
+        except OSError:
+            pass
+        return parquet, fp, manifest
+
+    return None, fp, manifest
+
+
+def is_cached(path, key: str = DEFAULT_SHEET) -> bool:
+    """¿Hay un Parquet al día de ``path`` bajo ``key``? (sin leerlo ni parsear el Excel)."""
+    try:
+        return _lookup(Path(path), key)[0] is not None
+    except OSError:
+        return False
+
+
+def _store(path: Path, key: str, fp: dict, old_manifest: dict | None, write: Callable[[Path], None]) -> Path:
+    """Escribe el Parquet de ``path`` con ``write(tmp)`` y actualiza el manifest."""
+    if "sha256" not in fp or fp["sha256"] is None:
+        fp["sha256"] = _sha256(path)
+
+    manifest_file = _manifest_path(path, key)
+    parquet_name = f"{path.name}.{key}.{fp['sha256'][:16]}.parquet"
+    manifest_file.parent.mkdir(parents=True, exist_ok=True)
+    parquet = manifest_file.parent / parquet_name
+    tmp = parquet.with_name(parquet.name + f".tmp{os.getpid()}")
+    try:
+        write(tmp)
+        os.replace(tmp, parquet)
+    finally:
+        tmp.unlink(missing_ok=True)
+    manifest = {
+        "source": path.name,
+        "sheet": key,
+        "size": fp["size"],
+        "mtime_ns": fp["mtime_ns"],
+        "sha256": fp["sha256"],
+        "parquet": parquet_name,
+    }
+    _write_atomic(manifest_file, json.dumps(manifest).encode("utf-8"))
+
+    # borrar la versión anterior del Parquet si quedó huérfana
+    if old_manifest and old_manifest.get("parquet") not in (None, parquet_name):
+        try:
+            (manifest_file.parent / old_manifest["parquet"]).unlink()
+        except OSError:
+            pass
+    return parquet
+
+
+def _build(path: Path, sheet_name: str, fp: dict, old_manifest: dict | None) -> pd.DataFrame:
+    df = pd.read_excel(path, sheet_name=sheet_name, engine="openpyxl")
+    try:
+        _store(path, sheet_name, fp, old_manifest, lambda tmp: df.to_parquet(tmp, index=False))
+    except (OSError, ValueError, TypeError, ImportError):
+        # cache best-effort: si no se puede escribir/serializar, seguimos sin él
+        pass
+    return df
+
+
+def cached_parquet(path, key: str, write: Callable[[Path], None]) -> Path:
+    """Parquet derivado de ``path`` bajo ``key``; ``write(tmp)`` se llama sólo si cambió la fuente.
+
+    Mismo manifest/invalidación que :func:`read_excel_cached`, para derivados
+    que no pasan por ``pd.read_excel`` (ver :mod:`pgn.ingest`).
+    """
+    path = Path(path)
+    try:
+        parquet, fp, manifest = _lookup(path, key)
+    except OSError:
+        parquet, fp, manifest = None, workbook_fingerprint(path, with_hash=False), None
+    if parquet is not None:
+        return parquet
+    return _store(path, key, fp, manifest, write)
+
+
+def read_excel_cached(path, sheet_name: str = DEFAULT_SHEET) -> pd.DataFrame:
+    """Equivalente a ``pd.read_excel(path, sheet_name)`` usando el cache Parquet.
+
+    El DataFrame devuelto es idéntico al de ``pd.read_excel`` (incluida la
+    columna ``Unnamed: 0`` si existe); la limpieza queda a cargo del caller.
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"No se encontró el Excel en: {path}")
+    if not HAS_PYARROW:
+        return pd.read_excel(path, sheet_name=sheet_name, engine="openpyxl")
+
+    try:
+        parquet, fp, manifest = _lookup(path, sheet_name)
+    except OSError:
+        parquet, fp, manifest = None, workbook_fingerprint(path, with_hash=False), None
+
+    if parquet is not None:
+        try:
+            df = pd.read_parquet(parquet)
+            metrics.cache("parquet", True)
+            return df
+        except (OSError, ValueError):
+            pass  # Parquet corrupto: se reconstruye abajo
+
+    metrics.cache("parquet", False)
+    return _build(path, sheet_name, fp, manifest)
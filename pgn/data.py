@@ -0,0 +1,353 @@
+"""Carga única del PGN: un loader, un esquema canónico y un cache de proceso.
+
+Antes cada app (``presup.py``, ``presup_2.py``, ``presup_3.py``) parseaba el
+Excel y guardaba su propia copia en ``st.cache_data``. Ahora todas piden el
+frame a :func:`load_budget`, que lo parsea una sola vez por versión del Excel
+y lo comparte entre todas las sesiones y apps del proceso.
+
+El frame compartido es de sólo lectura: quien necesite modificarlo debe
+trabajar sobre una copia.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .artifacts import evict_version
+from .cache import DEFAULT_SHEET, HAS_PYARROW, read_excel_cached, workbook_fingerprint
+from .metrics import metrics
+
+ROOT = Path(__file__).resolve().parent.parent
+# PGN_WORKBOOK cambia el Excel de las tres apps (benchmarks, otros años)
+DEFAULT_WORKBOOK = Path(os.environ.get("PGN_WORKBOOK") or ROOT / "presup_py_v3.xlsx")
+
+# Columnas del Excel → nombres canónicos (los que usa el frontend)
+RENAME_MAP = {
+    "Sección": "seccion",
+    "Categoría": "categoria",
+    "Código": "codigo",
+    "Item_2025": "item_2025",
+    "Monto_2025": "monto_2025",
+    "Item_2026": "item_2026",
+    "Monto_2026": "monto_2026",
+    "Variación %": "variacion_pct",
+}
+DISPLAY_MAP = {v: k for k, v in RENAME_MAP.items()}
+
+# Esquema canónico (orden y dtypes fijos). Los textos se repiten fila a fila
+# (secciones, categorías, ítems por objeto de gasto): como categóricas se
+# guardan una vez y cada fila es un código entero. Los montos quedan en
+# guaraníes (int64); los millones se calculan recién al mostrar.
+SCHEMA = {
+    "seccion": "category",
+    "categoria": "category",
+    "codigo": "string",
+    "item_2025": "category",
+    "monto_2025": "int64",
+    "item_2026": "category",
+    "monto_2026": "int64",
+    "variacion_pct": "float64",
+}
+AMOUNT_COLUMNS = ["monto_2025", "monto_2026"]
+# Claves enteras derivadas de ``codigo`` ("11-01" → nivel 11, entidad 1; -1 si no se puede leer)
+CODE_KEYS = {"nivel": "int16", "entidad": "int16"}
+# Columnas del frame en memoria: esquema + claves (los payloads exportan sólo SCHEMA)
+FRAME_DTYPES = {**SCHEMA, **CODE_KEYS}
+
+# _lock protege sólo los diccionarios; el parseo de cada (ruta, hoja) corre
+# fuera, con su propio lock (_loading): una lectura en frío no frena a las
+# sesiones que piden otra ruta ni los aciertos de cache
+_lock = threading.Lock()
+_frames: dict[tuple[str, str], tuple[str, pd.DataFrame]] = {}
+_loading: dict[tuple[str, str], threading.Lock] = {}
+_versions: dict[str, tuple[tuple[int, int], str]] = {}
+# pgn.warmup: ruta → versión publicada (las sesiones no miran el archivo) y
+# frames de una versión nueva que se está preparando en su hilo
+_pinned: dict[str, str] = {}
+_staged: dict[tuple[str, str], tuple[str, pd.DataFrame]] = {}
+_local = threading.local()
+
+
+def normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """Lleva la hoja cruda del Excel al esquema canónico.
+
+    Las columnas del esquema que falten en el Excel se agregan vacías y se
+    informan en ``df.attrs["missing_columns"]`` (con el nombre del Excel).
+    """
+    df = df.loc[:, ~df.columns.astype(str).str.startswith("Unnamed")]
+    df = df.rename(columns={k: v for k, v in RENAME_MAP.items() if k in df.columns})
+    missing = [c for c in SCHEMA if c not in df.columns]
+
+    out = pd.DataFrame(index=pd.RangeIndex(len(df)))
+    for col, dtype in SCHEMA.items():
+        s = df[col].reset_index(drop=True) if col in df.columns else pd.Series(index=out.index, dtype="object")
+        if col in AMOUNT_COLUMNS:
+            s = pd.to_numeric(s, errors="coerce").fillna(0).astype(dtype)
+        elif dtype == "float64":
+            s = pd.to_numeric(s, errors="coerce").astype(dtype)
+        else:
+            s = s.astype(dtype)
+        out[col] = s
+
+    out["nivel"], out["entidad"] = parse_codigo(out["codigo"])
+
+    out.attrs["missing_columns"] = [DISPLAY_MAP[c] for c in missing]
+    return out
+
+
+def parse_codigo(codigo: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """``"NN-EE[-...]"`` → (nivel, entidad) como int16; -1 donde no hay código válido."""
+    # se parsea cada código distinto una sola vez (se repiten por objeto de gasto)
+    codes, uniques = pd.factorize(codigo)
+    parts = pd.Series(uniques, dtype="string").str.extract(r"^\s*(\d{1,4})\D+(\d{1,4})", expand=True)
+    keys = []
+    for i, (name, dtype) in enumerate(CODE_KEYS.items()):
+        lookup = np.append(pd.to_numeric(parts[i], errors="coerce").fillna(-1).to_numpy(dtype), -1).astype(dtype)
+        keys.append(pd.Series(lookup[codes], index=codigo.index, name=name))  # código -1 (NA) → último
+    return keys[0], keys[1]
+
+
+def entity_code(nivel: int, entidad: int) -> str:
+    """``"NN-EE"`` de la entidad (``"s/c"`` si el código no se pudo parsear)."""
+    return f"{nivel}-{entidad:02d}" if nivel >= 0 else "s/c"
+
+
+def row_keys(*frames: pd.DataFrame) -> list[np.ndarray]:
+    """Clave int64 de cada fila: ``codigo`` y, si un código se repite, número de aparición.
+
+    Es la misma en todos los ``frames``: así se emparejan filas entre revisiones
+    (:mod:`pgn.delta`, :mod:`pgn.revisions`).
+    """
+    codigo = pd.concat([f["codigo"] for f in frames], ignore_index=True).astype("string").fillna("")
+    codes, _ = pd.factorize(codigo)
+    bounds = np.cumsum([0, *(len(f) for f in frames)])
+    parts = [codes[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+    occ = [pd.Series(c).groupby(c, sort=False).cumcount().to_numpy() for c in parts]
+    width = max(int(o.max(initial=0)) for o in occ) + 1
+    return [c.astype(np.int64) * width + o for c, o in zip(parts, occ)]
+
+
+def memory_report(df: pd.DataFrame) -> pd.DataFrame:
+    """Bytes por columna (incluye el contenido de los strings) y dtype."""
+    usage = df.memory_usage(index=False, deep=True)
+    return pd.DataFrame({"dtype": df.dtypes.astype(str), "bytes": usage}).rename_axis("columna")
+
+
+def dataset_version(path=DEFAULT_WORKBOOK, sheet_name: str = DEFAULT_SHEET) -> str:
+    """Versión de la hoja ``sheet_name`` del Excel que corresponde usar (ver :func:`file_version`).
+
+    Si :mod:`pgn.warmup` sigue la ruta es la versión publicada, aunque el
+    archivo ya haya cambiado; en el hilo que prepara la nueva (:func:`staging`),
+    la nueva. Cada hoja tiene su versión (ver :func:`sheet_version`): todo lo
+    que se cachea por versión es de una sola hoja.
+    """
+    path = Path(path).resolve()
+    version = _staging_version(path) or _pinned.get(str(path)) or file_version(path)
+    return sheet_version(version, sheet_name)
+
+
+def sheet_version(version: str, sheet_name: str = DEFAULT_SHEET) -> str:
+    """Versión de una hoja a partir de la del archivo.
+
+    La hoja por defecto conserva la del archivo; las demás llevan un sufijo
+    con el hash del nombre (la versión termina en rutas de ``static/data`` y
+    de los exports: nada de espacios ni ``:``).
+    """
+    if sheet_name == DEFAULT_SHEET:
+        return version
+    return f"{version}.{hashlib.sha1(sheet_name.encode('utf-8')).hexdigest()[:8]}"
+
+
+def file_version(path=DEFAULT_WORKBOOK) -> str:
+    """Identificador de la versión del archivo (prefijo del sha256 del contenido).
+
+    El hash se recalcula sólo cuando cambia tamaño/mtime.
+    """
+    path = Path(path).resolve()
+    if not path.exists():
+        raise FileNotFoundError(f"No se encontró el Excel en: {path}")
+    fp = workbook_fingerprint(path, with_hash=False)
+    key = (fp["size"], fp["mtime_ns"])
+    with _lock:
+        known = _versions.get(str(path))
+        if known and known[0] == key:
+            return known[1]
+    version = workbook_fingerprint(path)["sha256"][:16]
+    with _lock:
+        _versions[str(path)] = (key, version)
+    return version
+
+
+def _read_source(path: Path, sheet_name: str) -> pd.DataFrame:
+    # Excel grande o CSV/Parquet: ingesta por bloques (pgn.ingest), sin la hoja entera en memoria
+    from . import ingest
+
+    if HAS_PYARROW and ingest.should_stream(path):
+        return ingest.load_streaming(path, sheet_name)
+    if path.suffix.lower() == ".csv":
+        return normalize(pd.read_csv(path, encoding="utf-8-sig"))
+    return normalize(read_excel_cached(path, sheet_name=sheet_name))
+
+
+def load_budget(path=DEFAULT_WORKBOOK, sheet_name: str = DEFAULT_SHEET) -> pd.DataFrame:
+    """Frame canónico del Excel, compartido por todo el proceso.
+
+    Se vuelve a parsear sólo si cambia el contenido del Excel; la versión
+    anterior y sus artefactos derivados (:mod:`pgn.artifacts`) se descartan en
+    ese momento. Con :mod:`pgn.warmup` andando eso pasa en su hilo y las
+    sesiones reciben la versión publicada (:func:`promote`).
+    """
+    path = Path(path).resolve()
+    if not path.exists():
+        raise FileNotFoundError(f"No se encontró el Excel en: {path}")
+
+    version = dataset_version(path, sheet_name)
+    key = (str(path), sheet_name)
+    if _staging_version(path) is not None:
+        return _load_staged(path, sheet_name, version)
+    with _lock:
+        hit = _frames.get(key)
+        if hit and hit[0] == version:
+            metrics.cache("frames", True)
+            return hit[1]
+        guard = _loading.setdefault(key, threading.Lock())
+
+    # una sola lectura por (ruta, hoja): las sesiones que piden la misma
+    # esperan acá; las demás rutas siguen sin esperar
+    with guard:
+        with _lock:
+            hit = _frames.get(key)
+        metrics.cache("frames", bool(hit) and hit[0] == version)
+        if hit and hit[0] == version:
+            return hit[1]
+
+        df = _read_source(path, sheet_name)
+        df.attrs["version"] = version
+        df.attrs["source"] = path.name
+        # el Excel cambió: lo derivado de la versión nueva se actualiza desde
+        # la anterior (pgn.delta) antes de publicarla
+        if hit:
+            from .delta import apply_revision
+
+            apply_revision(hit[1], df)
+        with _lock:
+            _frames[key] = (version, df)
+
+    # y después se descartan los derivados viejos
+    if hit and hit[0] != version:
+        evict_version(hit[0])
+    return df
+
+
+def _staging_version(path: Path) -> str | None:
+    staging = getattr(_local, "staging", None)
+    return staging.get(str(path)) if staging else None
+
+
+def _load_staged(path: Path, sheet_name: str, version: str) -> pd.DataFrame:
+    # Versión nueva en el hilo de pgn.warmup: se lee sin tomar _lock y queda
+    # aparte hasta promote(); las sesiones siguen con la publicada.
+    key = (str(path), sheet_name)
+    with _lock:
+        current = _frames.get(key)
+        staged = _staged.get(key)
+    for hit in (staged, current):
+        if hit and hit[0] == version:
+            return hit[1]
+    if current is None:
+        # nada publicado todavía (arranque): lectura normal, así una sesión
+        # que llega a la vez espera este parseo en vez de repetirlo
+        with _local_staging(None):
+            return load_budget(path, sheet_name)
+
+    df = _read_source(path, sheet_name)
+    df.attrs["version"] = version
+    df.attrs["source"] = path.name
+    from .delta import apply_revision
+
+    apply_revision(current[1], df)
+    with _lock:
+        _staged[key] = (version, df)
+    return df
+
+
+@contextmanager
+def _local_staging(staging: dict[str, str] | None):
+    previous = getattr(_local, "staging", None)
+    _local.staging = staging
+    try:
+        yield
+    finally:
+        _local.staging = previous
+
+
+@contextmanager
+def staging(path, version: str):
+    """Dentro del bloque y en este hilo, ``path`` se lee en ``version`` sin publicarla.
+
+    :func:`load_budget` y todo lo que se cachea por :func:`dataset_version`
+    (serie, desglose por objeto, artefactos) se arma para la versión nueva;
+    el resto de las sesiones no la ve hasta :func:`promote`.
+    """
+    path = Path(path).resolve()
+    with _local_staging({**(getattr(_local, "staging", None) or {}), str(path): version}):
+        yield
+
+
+def promote(path, version: str) -> str | None:
+    """Publica ``version`` (del archivo) de ``path`` para todas las sesiones; devuelve la anterior.
+
+    El cambio de frame y de versión es uno solo bajo el lock, para todas las
+    hojas de la ruta. Desde ahí :func:`dataset_version` devuelve ``version``
+    sin mirar el archivo (hasta :func:`release`) y los derivados de las
+    versiones que nadie usa se descartan.
+    """
+    p = str(Path(path).resolve())
+    with _lock:
+        previous = _pinned.get(p)
+        _pinned[p] = version
+        retired = {previous} if previous else set()
+        for key in [k for k in _frames if k[0] == p]:
+            if _frames[key][0] != sheet_version(version, key[1]):
+                retired.add(_frames.pop(key)[0])
+        for key in [k for k in _staged if k[0] == p]:
+            staged_version, df = _staged.pop(key)
+            if staged_version == sheet_version(version, key[1]):
+                _frames[key] = (staged_version, df)
+        retired -= {v for v, _ in _frames.values()} | set(_pinned.values())
+    for old in retired:
+        evict_version(old)
+    return previous
+
+
+def release(path) -> None:
+    """Deja de fijar la versión de ``path``: :func:`dataset_version` vuelve a mirar el archivo."""
+    with _lock:
+        _pinned.pop(str(Path(path).resolve()), None)
+
+
+def clear_cache() -> None:
+    with _lock:
+        for version, _ in _frames.values():
+            evict_version(version)
+        _frames.clear()
+        _versions.clear()
+        _pinned.clear()
+        _staged.clear()
+
+
+def to_records(df: pd.DataFrame) -> list[dict]:
+    # Formato de registros que consumen los dashboards embebidos (NaN → "")
+    return df.astype(object).fillna("").to_dict(orient="records")
+
+
+def to_display(df: pd.DataFrame) -> pd.DataFrame:
+    # Nombres originales del Excel (los que muestra presup.py)
+    return df.rename(columns=DISPLAY_MAP)
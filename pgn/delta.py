@@ -0,0 +1,297 @@
+"""Revisión nueva del Excel: diff contra la versión en memoria y derivados incrementales.
+
+Cada revisión del proyecto de ley (``presup_py.xlsx`` → ``_v2`` → ``_v3``)
+cambia pocos montos; hasta ahora cada una recalculaba todo lo derivado.
+Cuando :func:`pgn.data.load_budget` encuentra que el Excel de una ruta cambió
+y la versión anterior está en memoria, llama a :func:`apply_revision`:
+
+1. :func:`diff_frames` empareja las filas por ``codigo`` (si un código se
+   repite, por orden de aparición) y compara las columnas del esquema: filas
+   modificadas, nuevas y eliminadas, en O(n) con hashes y códigos de
+   categoría (sin pasar a strings).
+2. Se actualizan los artefactos de la versión anterior en vez de
+   reconstruirlos:
+
+   - rankings (:mod:`pgn.rankings`): se sacan las filas modificadas de cada
+     orden y se reinsertan con ``searchsorted`` (mismo resultado que el sort
+     estable);
+   - cubo (:mod:`pgn.rollups`): a cada hoja se le suma la diferencia de sus
+     filas y se rearman los niveles de arriba desde las hojas;
+   - índice de búsqueda y vínculo entre años (:mod:`pgn.search`,
+     :mod:`pgn.matching`): si no cambió ningún nombre ni código, valen tal cual.
+
+   Lo incremental aplica cuando las filas son las mismas en el mismo orden
+   (lo normal entre revisiones: cambian montos). Si hay filas nuevas,
+   eliminadas o reordenadas, o cambia la jerarquía de alguna, esos artefactos
+   se construyen de cero la primera vez que se piden, como antes.
+3. Reporte de cambios por organismo (:attr:`Revision.report`): montos 2026
+   antes y después de cada entidad que se movió, guardado como artefacto
+   ``delta`` de la versión nueva (:func:`get_revision`).
+
+La carga en sí no es incremental: el Excel nuevo se lee y normaliza entero
+(es otro archivo y un ``.xlsx`` no se puede leer por filas sueltas; el Parquet
+de :mod:`pgn.cache` es por contenido) y el diff se hace después, sobre los dos
+frames. Lo que se ahorra es reconstruir rankings, cubo, búsqueda y vínculos.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+import pandas as pd
+
+from .artifacts import artifacts
+from .data import SCHEMA, entity_code, row_keys
+from .metrics import metrics
+from .rankings import RANKINGS, RankingIndex
+from .rollups import LEVELS, RollupCube, assemble, fill_missing, get_cube
+
+# columnas que no cambian la jerarquía ni los nombres: sólo montos
+AMOUNT_ONLY = {"monto_2025", "monto_2026", "variacion_pct"}
+TEXT_COLUMNS = ("codigo", "item_2025", "item_2026")
+# con más filas cambiadas que esta fracción, reordenar de cero es igual de rápido
+MAX_INCREMENTAL = 0.25
+
+
+@dataclass(frozen=True)
+class FrameDelta:
+    old_version: str | None
+    new_version: str | None
+    old_pos: np.ndarray  # filas emparejadas (mismo código y número de aparición)
+    new_pos: np.ndarray
+    changed: np.ndarray  # bool por par: alguna columna del esquema distinta
+    added: np.ndarray  # filas de la versión nueva sin pareja
+    removed: np.ndarray  # filas de la versión anterior sin pareja
+    columns: dict[str, int]  # columna → pares en los que cambió
+
+    @property
+    def nbytes(self) -> int:
+        return int(sum(a.nbytes for a in (self.old_pos, self.new_pos, self.changed, self.added, self.removed)))
+
+    @property
+    def n_changed(self) -> int:
+        return int(self.changed.sum())
+
+    def is_empty(self) -> bool:
+        return not self.n_changed and not len(self.added) and not len(self.removed)
+
+    def same_layout(self) -> bool:
+        """Mismas filas en el mismo orden (las posiciones de fila valen en las dos versiones)."""
+        return not len(self.added) and not len(self.removed) and bool(np.array_equal(self.old_pos, self.new_pos))
+
+    def amounts_only(self) -> bool:
+        """Sólo cambiaron montos: jerarquía, códigos y nombres iguales."""
+        return self.same_layout() and all(n == 0 or c in AMOUNT_ONLY for c, n in self.columns.items())
+
+    def changed_rows(self) -> tuple[np.ndarray, np.ndarray]:
+        """(posiciones en la versión anterior, en la nueva) de las filas modificadas."""
+        return self.old_pos[self.changed], self.new_pos[self.changed]
+
+
+@dataclass(frozen=True)
+class Revision:
+    delta: FrameDelta
+    report: pd.DataFrame  # un organismo por fila, del que más se movió al que menos
+    incremental: dict[str, bool] = field(default_factory=dict)  # artefacto → actualizado sin reconstruir
+
+    @property
+    def nbytes(self) -> int:
+        return self.delta.nbytes + int(self.report.memory_usage(deep=True).sum())
+
+    def summary(self) -> dict:
+        d = self.delta
+        moved = self.report["diferencia"]
+        return {
+            "filas_modificadas": d.n_changed,
+            "filas_nuevas": len(d.added),
+            "filas_eliminadas": len(d.removed),
+            "organismos": len(self.report),
+            "diferencia_2026": int(moved.sum()),
+        }
+
+
+def _same(old: pd.Series, new: pd.Series) -> np.ndarray:
+    # igualdad elemento a elemento de dos columnas ya alineadas (NA == NA)
+    if isinstance(new.dtype, pd.CategoricalDtype) and isinstance(old.dtype, pd.CategoricalDtype):
+        # códigos de la versión anterior traducidos a las categorías de la nueva;
+        # una categoría que no existe en la nueva (-2) nunca es igual
+        lookup = new.cat.categories.get_indexer(old.cat.categories)
+        lookup = np.append(np.where(lookup < 0, -2, lookup), -1)  # código -1 (NA) → -1
+        return lookup[old.cat.codes.to_numpy()] == new.cat.codes.to_numpy()
+    a, b = old.to_numpy(), new.to_numpy()
+    if a.dtype.kind == "f" or b.dtype.kind == "f":
+        a, b = a.astype("float64"), b.astype("float64")
+        return (a == b) | (np.isnan(a) & np.isnan(b))
+    return pd.Series(a).eq(pd.Series(b)).to_numpy(dtype=bool, na_value=False) | (pd.isna(a) & pd.isna(b))
+
+
+def diff_frames(old: pd.DataFrame, new: pd.DataFrame) -> FrameDelta:
+    """Filas modificadas, nuevas y eliminadas de ``new`` respecto de ``old`` (clave: ``codigo``)."""
+    if len(old) == len(new) and old["codigo"].reset_index(drop=True).equals(new["codigo"].reset_index(drop=True)):
+        found = np.arange(len(new))  # mismos códigos en el mismo orden: fila i con fila i
+    else:
+        old_keys, new_keys = row_keys(old, new)
+        found = pd.Index(old_keys).get_indexer(new_keys)
+
+    new_pos = np.flatnonzero(found >= 0)
+    old_pos = found[new_pos]
+    removed = np.ones(len(old), dtype=bool)
+    removed[old_pos] = False
+
+    identity = len(old_pos) == len(old) == len(new) and bool((old_pos == new_pos).all())
+    changed = np.zeros(len(new_pos), dtype=bool)
+    columns = {}
+    for col in SCHEMA:
+        if col == "codigo" or col not in old.columns or col not in new.columns:
+            continue
+        a, b = (old[col], new[col]) if identity else (old[col].iloc[old_pos], new[col].iloc[new_pos])
+        diff = ~_same(a.reset_index(drop=True), b.reset_index(drop=True))
+        columns[col] = int(diff.sum())
+        changed |= diff
+    return FrameDelta(
+        old_version=old.attrs.get("version"),
+        new_version=new.attrs.get("version"),
+        old_pos=old_pos.astype(np.intp),
+        new_pos=new_pos.astype(np.intp),
+        changed=changed,
+        added=np.flatnonzero(found < 0).astype(np.intp),
+        removed=np.flatnonzero(removed).astype(np.intp),
+        columns=columns,
+    )
+
+
+def update_rankings(index: RankingIndex, new: pd.DataFrame, delta: FrameDelta) -> RankingIndex | None:
+    """Rankings de ``new`` reinsertando sólo las filas modificadas; ``None`` si no aplica."""
+    if not delta.same_layout() or delta.n_changed > MAX_INCREMENTAL * max(len(new), 1):
+        return None
+    _, rows = delta.changed_rows()
+    orders = {}
+    for name, (col, descending, sign) in RANKINGS.items():
+        values = new[col].to_numpy(dtype="float64", na_value=np.nan)
+        key = -values if descending else values
+        keep = index.orders[name]
+        keep = keep[~np.isin(keep, rows)]
+        cand = rows[~np.isnan(values[rows])]
+        if sign == "pos":
+            cand = cand[values[cand] > 0]
+        elif sign == "neg":
+            cand = cand[values[cand] < 0]
+        cand = cand[np.lexsort((cand, key[cand]))]  # por valor y, en empates, por fila (sort estable)
+        kept = key[keep]
+        lo = np.searchsorted(kept, key[cand], side="left")
+        hi = np.searchsorted(kept, key[cand], side="right")
+        # dentro de un empate, antes de las filas conservadas con posición mayor
+        at = lo.copy()
+        for i in np.flatnonzero(hi > lo):
+            at[i] += np.searchsorted(keep[lo[i]:hi[i]], cand[i])
+        orders[name] = np.insert(keep, at, cand)
+    return RankingIndex(version=new.attrs.get("version"), orders=orders)
+
+
+def _leaf_paths(df: pd.DataFrame, rows: np.ndarray) -> pd.DataFrame:
+    part = df[["seccion", "categoria", "nivel", "entidad"]].iloc[rows]
+    return pd.DataFrame({
+        "seccion": fill_missing(part["seccion"], "seccion"),
+        "categoria": fill_missing(part["categoria"], "categoria"),
+        "entidad": [entity_code(n, e) for n, e in zip(part["nivel"], part["entidad"])],
+    })
+
+
+def update_cube(cube: RollupCube, old: pd.DataFrame, new: pd.DataFrame, delta: FrameDelta) -> RollupCube | None:
+    """Cubo de ``new`` sumando a cada hoja la diferencia de sus filas; ``None`` si no aplica."""
+    if not delta.amounts_only():
+        return None
+    old_rows, new_rows = delta.changed_rows()
+    moved = _leaf_paths(new, new_rows).assign(
+        monto_2025=new["monto_2025"].to_numpy()[new_rows] - old["monto_2025"].to_numpy()[old_rows],
+        monto_2026=new["monto_2026"].to_numpy()[new_rows] - old["monto_2026"].to_numpy()[old_rows],
+    )
+    moved = moved.groupby(list(LEVELS), sort=False, dropna=False)[["monto_2025", "monto_2026"]].sum()
+    leaves = cube.leaves()
+    at = pd.MultiIndex.from_frame(leaves[list(LEVELS)]).get_indexer(moved.index)
+    if (at < 0).any():
+        return None
+    for col in ("monto_2025", "monto_2026"):
+        values = leaves[col].to_numpy(copy=True)
+        np.add.at(values, at, moved[col].to_numpy())
+        leaves[col] = values
+    return assemble(leaves, new.attrs.get("version"))
+
+
+def change_report(old_cube: RollupCube, new_cube: RollupCube) -> pd.DataFrame:
+    """Organismos (entidades) cuyo monto 2026 o nombre cambió, que aparecieron o que desaparecieron."""
+    keys = list(LEVELS)
+    before = old_cube.leaves()[[*keys, "nombre", "monto_2026", "items"]]
+    after = new_cube.leaves()[[*keys, "nombre", "monto_2026", "items"]]
+    both = before.merge(after, on=keys, how="outer", suffixes=("_antes", ""))
+    antes = both["monto_2026_antes"].fillna(0).astype("int64")
+    despues = both["monto_2026"].fillna(0).astype("int64")
+    estado = np.select(
+        [both["items_antes"].isna(), both["items"].isna(), antes != despues, both["nombre_antes"] != both["nombre"]],
+        ["nuevo", "eliminado", "modificado", "renombrado"],
+        default="",
+    )
+    report = pd.DataFrame({
+        **{k: both[k] for k in keys},
+        "nombre": both["nombre"].fillna(both["nombre_antes"]),
+        "nombre_antes": both["nombre_antes"],
+        "monto_2026_antes": antes,
+        "monto_2026_despues": despues,
+        "diferencia": despues - antes,
+        "variacion_pct": np.where(antes > 0, (despues / antes.where(antes > 0) - 1.0) * 100.0, np.nan),
+        "estado": estado,
+    })
+    report = report[report["estado"] != ""]
+    order = np.lexsort((report["nombre"].astype(str).to_numpy(), -report["diferencia"].abs().to_numpy()))
+    return report.iloc[order].reset_index(drop=True)
+
+
+def apply_revision(old: pd.DataFrame, new: pd.DataFrame) -> Revision:
+    """Diff de ``new`` contra ``old`` y artefactos de ``new`` derivados de los de ``old``.
+
+    Guarda en :mod:`pgn.artifacts`, bajo la versión de ``new``, lo que se pudo
+    actualizar (rankings, cubo, búsqueda, vínculo entre años) y la
+    :class:`Revision` (artefacto ``delta``).
+    """
+    old_v, new_v = old.attrs.get("version"), new.attrs.get("version")
+    with metrics.span("delta.diff"):
+        delta = diff_frames(old, new)
+    done = {}
+
+    with metrics.span("delta.rankings"):
+        previous = artifacts.get(old_v, "rankings") if old_v else None
+        rankings = update_rankings(previous, new, delta) if previous is not None else None
+        done["rankings"] = rankings is not None
+        if rankings is not None and new_v:
+            artifacts.put(new_v, "rankings", rankings)
+
+    with metrics.span("delta.rollups"):
+        old_cube = get_cube(old)
+        new_cube = update_cube(old_cube, old, new, delta)
+        done["rollups"] = new_cube is not None
+        new_cube = new_cube if new_cube is not None else get_cube(new)
+        if new_v:
+            artifacts.put(new_v, "rollups", new_cube)
+
+    # búsqueda y vínculo entre años dependen sólo de nombres, códigos y posiciones
+    texts_same = delta.same_layout() and all(delta.columns.get(c, 0) == 0 for c in TEXT_COLUMNS)
+    for name in ("search", f"matching:{old_v}:2025:2026"):
+        value = artifacts.get(old_v, name) if old_v and texts_same else None
+        if value is not None and new_v:
+            if name.startswith("matching:"):
+                name, value = f"matching:{new_v}:2025:2026", replace(value, left_version=new_v, right_version=new_v)
+            artifacts.put(new_v, name, value)
+        done[name.split(":", 1)[0]] = value is not None
+
+    with metrics.span("delta.report"):
+        revision = Revision(delta=delta, report=change_report(old_cube, new_cube), incremental=done)
+    if new_v:
+        artifacts.put(new_v, "delta", revision)
+    return revision
+
+
+def get_revision(df: pd.DataFrame) -> Revision | None:
+    """Cambios de ``df`` respecto de la versión que reemplazó en este proceso (si hubo recarga)."""
+    version = df.attrs.get("version")
+    return artifacts.get(version, "delta") if version else None
@@ -0,0 +1,177 @@
+"""Exportaciones CSV / XLSX / Parquet, generadas bajo demanda y cacheadas.
+
+Cada export se arma la primera vez que alguien lo pide (no en cada rerun),
+se escribe por bloques de filas a un archivo en disco y queda registrado en
+:mod:`pgn.artifacts` por versión del dataset.
+
+Los archivos de una versión quedan en ``static/data/<versión>/exports/``:
+una vez generado, :meth:`ExportFile.url` da la URL con la que Streamlit lo
+sirve desde el disco por partes (``enableStaticServing``), sin pasar por
+``st.download_button``, que guarda en memoria todo lo que descarga. Sin
+versión (un Excel subido) o con ``PGN_EXPORT_DIR`` quedan fuera de
+``static/`` y sólo se descargan por el botón. Se borran cuando
+:mod:`pgn.artifacts` descarta la versión. Los headers de cache (ETag,
+Last-Modified) los pone el static serving de Streamlit.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+import pandas as pd
+
+from .artifacts import KEEP_FILES, artifacts
+from .assets import STATIC_DIR, static_url
+from .cache import HAS_PYARROW
+
+CHUNK_ROWS = 50_000
+# Streamlit no sirve por static/ archivos más grandes (server.MAX_APP_STATIC_FILE_SIZE)
+MAX_STATIC_BYTES = 200 * 1024 * 1024
+
+FORMATS = {
+    "csv": {"ext": "csv", "mime": "text/csv"},
+    "xlsx": {"ext": "xlsx", "mime": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"},
+}
+if HAS_PYARROW:
+    FORMATS["parquet"] = {"ext": "parquet", "mime": "application/vnd.apache.parquet"}
+
+
+def export_dir(version: str | None) -> Path:
+    if version is None:  # datos subidos: nunca bajo static/
+        return Path(tempfile.gettempdir()) / "pgn_exports" / "sin-version"
+    base = os.environ.get("PGN_EXPORT_DIR")
+    return Path(base) / version if base else STATIC_DIR / "data" / version / "exports"
+
+
+@dataclass(frozen=True)
+class ExportFile:
+    table: str
+    fmt: str
+    version: str | None
+    path: Path
+    size: int
+
+    @property
+    def mime(self) -> str:
+        return FORMATS[self.fmt]["mime"]
+
+    def open(self):
+        return open(self.path, "rb")
+
+    def read_bytes(self) -> bytes:
+        return self.path.read_bytes()
+
+    def url(self, base_url: str = "") -> str | None:
+        """URL de ``static/`` que sirve el archivo por partes; ``None`` si no está ahí."""
+        try:
+            rel = self.path.resolve().relative_to(STATIC_DIR.resolve())
+        except ValueError:
+            return None
+        if self.size > MAX_STATIC_BYTES or not self.path.is_file():
+            return None
+        return static_url(base_url, rel.as_posix())
+
+
+def _chunks(df: pd.DataFrame, rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    for start in range(0, max(len(df), 1), rows):
+        yield df.iloc[start:start + rows]
+
+
+def _write_csv(chunks: Iterable[pd.DataFrame], path: Path) -> None:
+    # utf-8-sig: BOM una sola vez al principio (Excel lo necesita para los acentos)
+    with open(path, "w", encoding="utf-8-sig", newline="") as fh:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(fh, index=False, header=(i == 0))
+
+
+def _write_xlsx(chunks: Iterable[pd.DataFrame], path: Path) -> None:
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    for i, chunk in enumerate(chunks):
+        if i == 0:
+            ws.append([str(c) for c in chunk.columns])
+        for row in chunk.astype(object).itertuples(index=False, name=None):
+            ws.append([None if pd.isna(v) else v for v in row])
+    wb.save(path)
+
+
+def _write_parquet(chunks: Iterable[pd.DataFrame], path: Path) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in chunks:
+            if writer is None:
+                schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(path, schema)
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+_WRITERS = {"csv": _write_csv, "xlsx": _write_xlsx, "parquet": _write_parquet}
+
+
+def write_chunks(fmt: str, chunks: Iterable[pd.DataFrame], path) -> None:
+    """Escribe bloques de filas (mismas columnas) a ``path`` sin juntarlos en memoria."""
+    _WRITERS[fmt](chunks, Path(path))
+
+
+def _build(version: str | None, table: str, fmt: str, frame: pd.DataFrame) -> ExportFile:
+    folder = export_dir(version)
+    folder.mkdir(parents=True, exist_ok=True)
+    target = folder / f"{table}.{FORMATS[fmt]['ext']}"
+    tmp = target.with_name(target.name + f".tmp{os.getpid()}")
+    _WRITERS[fmt](_chunks(frame), tmp)
+    os.replace(tmp, target)
+    return ExportFile(
+        table=table,
+        fmt=fmt,
+        version=version,
+        path=target,
+        size=target.stat().st_size,
+    )
+
+
+def get_export(version: str | None, table: str, fmt: str, build_frame: Callable[[], pd.DataFrame]) -> ExportFile:
+    """Export de ``table`` en ``fmt``; ``build_frame`` se llama sólo si no está cacheado."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato de export no soportado: {fmt!r} (disponibles: {sorted(FORMATS)})")
+    hit = cached_export(version, table, fmt)
+    if hit is not None:
+        return hit
+    name = f"export:{table}:{fmt}"
+    exp = _build(version, table, fmt, build_frame())
+    if version is not None:
+        artifacts.put(version, name, exp)
+    return exp
+
+
+def cached_export(version: str | None, table: str, fmt: str) -> ExportFile | None:
+    """Export ya generado (y todavía en disco), sin generarlo."""
+    hit = artifacts.get(version, f"export:{table}:{fmt}") if version is not None else None
+    return hit if hit is not None and hit.path.is_file() else None
+
+
+def lazy_export(version: str | None, table: str, fmt: str, build_frame: Callable[[], pd.DataFrame]) -> Callable[[], bytes]:
+    # Para ``st.download_button(data=...)``: se genera recién al hacer click.
+    # Los reruns siguientes lo sirven por URL (ExportFile.url).
+    return lambda: get_export(version, table, fmt, build_frame).read_bytes()
+
+
+def _drop_files(version: str) -> None:
+    shutil.rmtree(export_dir(version), ignore_errors=True)
+
+
+# se conservan las últimas KEEP_FILES versiones descartadas: las páginas ya
+# abiertas siguen pidiendo sus archivos
+artifacts.on_evict(_drop_files, keep=KEEP_FILES)
@@ -0,0 +1,218 @@
+"""Build de los datos del frontend (``frontend/src/data/*.json``) desde los Excel.
+
+Uso::
+
+    python -m pgn.frontend                       # presup_py_v3.xlsx → pgn.json (+ objetos si hay)
+    python -m pgn.frontend otro.xlsx --objetos extracto_situfin.parquet
+    python -m pgn.frontend --check               # sale con 1 si algo está desactualizado (CI)
+    python -m pgn.frontend --force
+
+Salidas (JSON minificados; Vite los mete enteros en el bundle):
+
+- ``pgn.json``: lo que muestra el dashboard, ya agregado: el Top-:data:`TOP_N`
+  de cada ranking de :mod:`pgn.rankings` (filas listas para la tabla) y los
+  totales del PGN. Antes llevaba todas las filas, con los montos en Gs y en
+  millones.
+- ``organismos_por_objeto.json``: desglose por objeto de :mod:`pgn.objects`,
+  sólo si la fuente de ``--objetos`` trae columna ``Objeto``; si no, se
+  conserva el archivo que está en el repo (el Excel del PGN no trae ese detalle).
+
+El build es incremental y determinista: ``manifest.json`` (al lado, no lo
+importa el frontend) guarda por salida el hash de las entradas, de los
+parámetros y de este módulo (el que define la forma de los JSON), más el
+sha256 y el tamaño de lo escrito. Si nada cambió no se lee ningún Excel; las
+mismas entradas dan siempre los mismos bytes (sin fechas ni rutas absolutas).
+Un cambio en otro módulo de ``pgn`` que altere los valores (orden de los
+rankings, vínculos, ...) se regenera con ``--force``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import math
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from .cache import DEFAULT_SHEET
+from .data import DEFAULT_WORKBOOK, ROOT, dataset_version, load_budget
+from .matching import resolve
+from .objects import ORGANISMOS_JSON, ObjectCube
+from .rankings import RANKINGS, get_rankings
+from .series import OBJECT_COLUMN, load_series
+
+DATA_DIR = ROOT / "frontend" / "src" / "data"
+PGN_JSON = DATA_DIR / "pgn.json"
+MANIFEST = DATA_DIR / "manifest.json"
+TOP_N = 15
+# módulos que definen la forma de las salidas: si cambian, se regenera
+GENERATOR_MODULES = ("frontend.py",)
+
+
+def _clean(v):
+    # NaN/NA → null; numpy → tipos nativos de Python
+    if v is None or v is pd.NA:
+        return None
+    if isinstance(v, float) and math.isnan(v):
+        return None
+    return v.item() if hasattr(v, "item") else v
+
+
+def _minify(doc) -> bytes:
+    return json.dumps(doc, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _rel(path: Path) -> str:
+    # rutas relativas al repo en el manifest: el mismo build da el mismo manifest en cualquier máquina
+    path = Path(path).resolve()
+    return path.relative_to(ROOT).as_posix() if path.is_relative_to(ROOT) else path.name
+
+
+def generator_hash() -> str:
+    here = Path(__file__).resolve().parent
+    digest = hashlib.sha256()
+    for name in GENERATOR_MODULES:
+        digest.update(name.encode() + b"\0" + (here / name).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def build_pgn_json(df: pd.DataFrame, source: str, sheet_name: str = DEFAULT_SHEET, top_n: int = TOP_N) -> dict:
+    rankings = get_rankings(df)
+    top = {}
+    for name in RANKINGS:
+        rows = df.iloc[rankings.top(name, top_n)]
+        organismo = rows["item_2026"].astype("string").fillna(rows["item_2025"].astype("string")).fillna("")
+        top[name] = [
+            {"codigo": _clean(c), "organismo": o, "monto_2026": int(m), "variacion_pct": _clean(round(v, 2))}
+            for c, o, m, v in zip(rows["codigo"], organismo, rows["monto_2026"], rows["variacion_pct"])
+        ]
+    total_2025, total_2026 = int(df["monto_2025"].sum()), int(df["monto_2026"].sum())
+    return {
+        "dataset": f"PGN Paraguay 2025-2026 ({source})",
+        "sheet": sheet_name,
+        "row_count": len(df),
+        "totals": {
+            "monto_2025": total_2025,
+            "monto_2026": total_2026,
+            "variacion_pct": round((total_2026 / total_2025 - 1) * 100, 2) if total_2025 else None,
+            "items_nuevos": len(resolve(df).unmatched_right()),  # sin pareja en 2025 (pgn.matching)
+        },
+        # filas ya ordenadas (ver pgn.rankings): el frontend no ordena ni filtra
+        "top_n": top_n,
+        "top": top,
+    }
+
+
+def build_objects_json(cube: ObjectCube, source: str) -> dict:
+    """``organismos_por_objeto.json`` desde el cubo (un organismo por nombre, el primero)."""
+    orgs = {}
+    for pos in range(len(cube.entities)):
+        s = cube.slice(pos)
+        orgs.setdefault(s["nombre"], {"codigo": s["codigo"], "nivel": s["nivel"], "totales": s["totales"], "pgn": s["pgn"]})
+    return {
+        "meta": {
+            "currency": "PYG",
+            "units": "nominal_guaranies",
+            "objects": [str(o) for o in cube.objects],
+            "source": source,
+            "notes": "Generado por pgn.frontend. Totales = suma de los objetos.",
+        },
+        "organismos": orgs,
+    }
+
+
+def _outputs(workbook: Path, objetos: Path, sheet: str, top_n: int) -> dict:
+    """Salida → (clave de entradas, builder). La clave se calcula sin leer los Excel."""
+    gen = generator_hash()
+    pgn_key = {"generator": gen, "inputs": {_rel(workbook): dataset_version(workbook)}, "params": {"sheet": sheet, "top_n": top_n}}
+    obj_key = {"generator": gen, "inputs": {_rel(objetos): dataset_version(objetos)}, "params": {"sheet": sheet}}
+
+    def pgn_doc():
+        return build_pgn_json(load_budget(workbook, sheet_name=sheet), workbook.name, sheet, top_n)
+
+    def objects_doc():
+        series = load_series(objetos, sheet)
+        if OBJECT_COLUMN not in series.keys.columns:
+            return None  # sin columna Objeto: queda el JSON del repo
+        return build_objects_json(ObjectCube.from_series(series), objetos.name)
+
+    return {PGN_JSON: (pgn_key, pgn_doc), ORGANISMOS_JSON: (obj_key, objects_doc)}
+
+
+def _fresh(entry: dict | None, key: dict, path: Path) -> bool:
+    if not entry or {k: entry.get(k) for k in key} != key:
+        return False
+    return path.is_file() and _sha256(path.read_bytes()) == entry.get("sha256")
+
+
+def _size(n: int | None) -> str:
+    return "—" if n is None else f"{n / 1024:,.1f} KB"
+
+
+def build(workbook=DEFAULT_WORKBOOK, objetos=None, sheet: str = DEFAULT_SHEET, top_n: int = TOP_N,
+          force: bool = False, check: bool = False) -> list[dict]:
+    """Regenera las salidas desactualizadas; devuelve una fila por salida (para el reporte).
+
+    Con ``check`` no escribe nada: sólo informa qué se regeneraría.
+    """
+    workbook = Path(workbook).resolve()
+    objetos = Path(objetos).resolve() if objetos else workbook
+    manifest = json.loads(MANIFEST.read_text(encoding="utf-8")) if MANIFEST.is_file() else {}
+    entries = dict(manifest.get("outputs", {}))
+    report = []
+    for path, (key, builder) in _outputs(workbook, objetos, sheet, top_n).items():
+        name = path.name
+        entry = entries.get(name)
+        before = path.stat().st_size if path.is_file() else None
+        if not force and _fresh(entry, key, path):
+            report.append({"output": name, "status": "al día", "before": before, **entry})
+            continue
+        if check:
+            report.append({"output": name, "status": "desactualizado", "before": before})
+            continue
+        doc = builder()
+        if doc is None:
+            data = path.read_bytes() if path.is_file() else b""
+            entries[name] = {**key, "kept": True, "sha256": _sha256(data), "bytes": before}
+            report.append({"output": name, "status": "sin fuente (se conserva)", "before": before, **entries[name]})
+            continue
+        data = _minify(doc)
+        if not (path.is_file() and path.read_bytes() == data):  # no tocar el mtime si no cambió (HMR de Vite)
+            path.write_bytes(data)
+        entries[name] = {**key, "sha256": _sha256(data), "bytes": len(data), "gzip_bytes": len(gzip.compress(data, mtime=0))}
+        report.append({"output": name, "status": "generado", "before": before, **entries[name]})
+    if not check:
+        new = {"outputs": dict(sorted(entries.items()))}
+        if new != manifest:
+            MANIFEST.write_text(json.dumps(new, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Genera los JSON del frontend (frontend/src/data) desde los Excel.")
+    parser.add_argument("workbook", nargs="?", default=str(DEFAULT_WORKBOOK))
+    parser.add_argument("--objetos", help="fuente con columna Objeto para organismos_por_objeto.json (default: workbook)")
+    parser.add_argument("--sheet", default=DEFAULT_SHEET)
+    parser.add_argument("--top", type=int, default=TOP_N, help="filas por ranking en pgn.json")
+    parser.add_argument("--force", action="store_true", help="regenerar aunque las entradas no hayan cambiado")
+    parser.add_argument("--check", action="store_true", help="no escribir; salir con 1 si algo está desactualizado")
+    args = parser.parse_args(argv)
+
+    report = build(args.workbook, args.objetos, args.sheet, args.top, force=args.force, check=args.check)
+    print(f"{'salida':<28} {'estado':<26} {'antes':>10} {'ahora':>10} {'gzip':>10}")
+    for row in report:
+        print(f"{row['output']:<28} {row['status']:<26} {_size(row['before']):>10} "
+              f"{_size(row.get('bytes')):>10} {_size(row.get('gzip_bytes')):>10}")
+    return 1 if args.check and any(r["status"] == "desactualizado" for r in report) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""HTML final de los dashboards embebidos, armado una vez por versión del dataset.
+
+``presup_2.py``/``presup_3.py`` rearmaban en cada rerun un template de
+~20 KB más el JSON del dataset. :func:`render_page` hace los reemplazos en
+una sola pasada y guarda el resultado en :mod:`pgn.artifacts`; mientras el
+Excel no cambie, Streamlit recibe exactamente el mismo string y el iframe no
+se vuelve a montar.
+
+:func:`dashboard_page` arma la página de uno de esos dashboards (vistas de
+:mod:`pgn.service`, desglose de :mod:`pgn.objects`, scripts de
+:mod:`pgn.assets`) y :func:`register_page` la deja registrada una sola vez en
+:mod:`pgn.warmup`, así una revisión nueva del Excel llega con el HTML armado.
+
+``PGN_HTML_CACHE=0`` desactiva el cache (útil para medir el antes/después).
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from . import objects, service, warmup
+from .artifacts import artifacts
+from .assets import Scripts
+from .metrics import metrics
+from .payload import JS_DECODER, to_script_json
+from .search import JS_SEARCH
+
+PLACEHOLDER = re.compile(r"__PGN_[A-Z_]+__")
+
+
+def cache_enabled() -> bool:
+    return os.environ.get("PGN_HTML_CACHE", "1") != "0"
+
+
+@dataclass(frozen=True)
+class RenderedPage:
+    html: str
+    digest: str  # hash de template + datos: cambia sólo si cambia el contenido
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.html.encode("utf-8"))
+
+
+def fill_template(template: str, values: dict[str, str]) -> str:
+    # Una pasada; lo insertado no se vuelve a escanear (los datos pueden contener "__PGN_...")
+    return PLACEHOLDER.sub(lambda m: values.get(m.group(0), m.group(0)), template)
+
+
+def _digest(template: str, values: dict[str, str]) -> str:
+    h = hashlib.sha256(template.encode("utf-8"))
+    for key in sorted(values):
+        h.update(b"\0" + key.encode("utf-8") + b"\0" + values[key].encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def render_page(
+    name: str,
+    template: str,
+    version: str | None,
+    values: Callable[[], dict[str, str]],
+) -> RenderedPage:
+    """Página ``name`` para ``version``; ``values()`` se evalúa sólo si no está cacheada.
+
+    ``__PGN_DIGEST__`` en el template se reemplaza por el hash del contenido.
+    """
+    def build() -> RenderedPage:
+        vals = values()
+        digest = _digest(template, vals)
+        return RenderedPage(html=fill_template(template, {**vals, "__PGN_DIGEST__": digest}), digest=digest)
+
+    return artifacts.get_or_build(version if cache_enabled() else None, _page_key(name, template), build)
+
+
+def _page_key(name: str, template: str) -> str:
+    return "html:" + name + ":" + hashlib.sha1(template.encode("utf-8")).hexdigest()[:12]
+
+
+def dashboard_page(
+    df: pd.DataFrame,
+    app: str,
+    template: str,
+    scripts: Scripts,
+    path,
+    mode: str = "columnar",
+    base_url: str = "",
+    values: tuple[tuple[str, str], ...] = (),
+) -> RenderedPage:
+    """HTML de ``app`` para la versión de ``df`` (``presup_2``/``presup_3``).
+
+    Publica las vistas y el desglose por objeto de ``path`` en ``static/data``
+    y llena ``template`` con el bootstrap y los scripts. ``values`` agrega
+    placeholders propios de la app y entra en la clave del HTML cacheado.
+    Un rerun con la página ya armada es un lookup: no publica ni lee nada.
+    """
+    # El desglose por objeto es de la misma versión (columna Objeto) o del
+    # JSON del frontend, que sólo cambia con un deploy: no entra en la clave.
+    name = ":".join([app, mode, *(v for _, v in values), scripts.key])
+    version = df.attrs["version"]
+    if cache_enabled() and version is not None:
+        hit = artifacts.get(version, _page_key(name, template))
+        if hit is not None:
+            metrics.cache("html", True)
+            return hit
+
+    with metrics.span("objects"):
+        objetos = objects.load_objects(path)
+        objetos_base = objects.publish(objetos, base_url=base_url)
+    with metrics.span("service.publish"):
+        service.publish(df, mode)
+
+    def page_values() -> dict:
+        # sólo corre si el HTML de esta versión no está cacheado
+        with metrics.span("bootstrap"):
+            boot = service.bootstrap(df, mode, base_url, objetos=objetos.to_payload(objetos_base))
+        with metrics.span("json.dumps"):
+            data_json = to_script_json(boot)
+        return {
+            "__PGN_DATA_JSON__": data_json,
+            "__PGN_DECODER_JS__": JS_DECODER,
+            "__PGN_SEARCH_JS__": JS_SEARCH,
+            "__PGN_OBJETOS_JS__": objects.JS_LOADER,
+            "__PGN_CLIENT_JS__": service.JS_CLIENT,
+            "__PGN_VENDOR_SCRIPTS__": scripts.vendor,
+            "__PGN_APP_SCRIPT__": scripts.app,
+            **dict(values),
+        }
+
+    with metrics.span("render_page"):
+        return render_page(name, template, version, page_values)
+
+
+_pages_lock = threading.Lock()
+_pages: dict[str, tuple[tuple, Callable[[pd.DataFrame], RenderedPage]]] = {}
+
+
+def register_page(
+    app: str,
+    template: str,
+    scripts: Scripts,
+    path,
+    mode: str = "columnar",
+    base_url: str = "",
+    values: dict[str, str] | None = None,
+) -> Callable[[pd.DataFrame], RenderedPage]:
+    """``build(df)`` con la página de ``app`` (:func:`dashboard_page`), registrado en :mod:`pgn.warmup`.
+
+    Se llama en cada rerun; se vuelve a registrar sólo si cambian los
+    parámetros (por ejemplo, scripts nuevos después de ``pgn.assets build``).
+    """
+    params = (template, scripts, str(Path(path).resolve()), mode, base_url or "", tuple(sorted((values or {}).items())))
+    with _pages_lock:
+        current = _pages.get(app)
+        if current is not None and current[0] == params:
+            return current[1]
+        build = functools.partial(
+            dashboard_page,
+            app=app,
+            template=template,
+            scripts=scripts,
+            path=path,
+            mode=mode,
+            base_url=base_url or "",
+            values=params[-1],
+        )
+        _pages[app] = (params, build)
+    warmup.register(f"{app}.page", build, path)
+    return build
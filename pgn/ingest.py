@@ -0,0 +1,245 @@
+"""Ingesta por bloques: xlsx/CSV/Parquet → Parquet canónico con memoria acotada.
+
+``pd.read_excel`` arma toda la hoja en memoria (celdas de openpyxl + frame de
+objetos) antes de que :func:`pgn.data.normalize` la lleve al esquema. Para los
+extractos de ejecución de SITUFIN (millones de filas) eso no escala. Acá la
+hoja se lee de a ``chunk_rows`` filas (openpyxl en modo ``read_only``,
+``pd.read_csv(chunksize=...)`` o ``iter_batches`` de Parquet), cada bloque se
+normaliza y se agrega al Parquet de salida, y los totales se van acumulando
+en :class:`RunningTotals` mientras llegan los bloques.
+
+:func:`pgn.data.load_budget` usa este camino para fuentes CSV/Parquet y para
+Excel de más de ``PGN_STREAM_MB`` (32 MB por defecto); el Parquet canónico
+queda cacheado como el de :mod:`pgn.cache` (se invalida si cambia la fuente).
+
+Benchmark de memoria: ``python benchmarks/bench_ingest.py``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+
+from .cache import DEFAULT_SHEET, cached_parquet
+from .data import AMOUNT_COLUMNS, DISPLAY_MAP, FRAME_DTYPES, SCHEMA, normalize
+
+CHUNK_ROWS = 50_000
+TOP_K = 15
+STREAM_SUFFIXES = {".csv", ".parquet"}
+_META_KEY = b"pgn.ingest"
+
+
+def stream_threshold() -> int:
+    return int(float(os.environ.get("PGN_STREAM_MB", "32")) * 1024 * 1024)
+
+
+def should_stream(path) -> bool:
+    """CSV/Parquet siempre; Excel sólo si es grande."""
+    path = Path(path)
+    return path.suffix.lower() in STREAM_SUFFIXES or path.stat().st_size >= stream_threshold()
+
+
+def _iter_xlsx(path: Path, sheet_name: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb[sheet_name].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        # mismos nombres que pd.read_excel para encabezados vacíos
+        columns = [f"Unnamed: {i}" if h is None else str(h) for i, h in enumerate(header)]
+        block = []
+        for row in rows:
+            if all(v is None for v in row):
+                continue
+            block.append(row)
+            if len(block) == chunk_rows:
+                yield pd.DataFrame.from_records(block, columns=columns)
+                block = []
+        if block:
+            yield pd.DataFrame.from_records(block, columns=columns)
+    finally:
+        wb.close()
+
+
+def _iter_csv(path: Path, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    # utf-8-sig: los CSV exportados para Excel traen BOM
+    yield from pd.read_csv(path, chunksize=chunk_rows, encoding="utf-8-sig")
+
+
+def _iter_parquet(path: Path, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    import pyarrow.parquet as pq
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+        yield batch.to_pandas()
+
+
+def iter_raw_chunks(path, sheet_name: str = DEFAULT_SHEET, chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Bloques crudos de la fuente (columnas como en el Excel)."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return _iter_csv(path, chunk_rows)
+    if suffix == ".parquet":
+        return _iter_parquet(path, chunk_rows)
+    return _iter_xlsx(path, sheet_name, chunk_rows)
+
+
+def raw_columns(path, sheet_name: str = DEFAULT_SHEET) -> list[str]:
+    """Encabezados de la fuente sin leer las filas."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return [str(c) for c in pd.read_csv(path, nrows=0, encoding="utf-8-sig").columns]
+    if suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        return list(pq.read_schema(path).names)
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        header = next(wb[sheet_name].iter_rows(max_row=1, values_only=True), ())
+    finally:
+        wb.close()
+    return [f"Unnamed: {i}" if h is None else str(h) for i, h in enumerate(header)]
+
+
+def iter_chunks(path, sheet_name: str = DEFAULT_SHEET, chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Bloques ya normalizados al esquema canónico (ver :func:`pgn.data.normalize`)."""
+    for chunk in iter_raw_chunks(path, sheet_name, chunk_rows):
+        yield normalize(chunk)
+
+
+class RunningTotals:
+    """Agregados que se actualizan bloque a bloque (no necesitan el frame entero)."""
+
+    def __init__(self, top_k: int = TOP_K):
+        self.top_k = top_k
+        self.rows = 0
+        self.new_items = 0
+        self.totals = dict.fromkeys(AMOUNT_COLUMNS, 0)
+        self.by_seccion: pd.DataFrame | None = None
+        self.by_categoria: pd.DataFrame | None = None
+        self.top: pd.DataFrame | None = None
+
+    @staticmethod
+    def _add(acc: pd.DataFrame | None, part: pd.DataFrame) -> pd.DataFrame:
+        return part if acc is None else acc.add(part, fill_value=0)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        self.rows += len(chunk)
+        self.new_items += int(chunk["item_2025"].isna().sum())
+        for col in AMOUNT_COLUMNS:
+            self.totals[col] += int(chunk[col].sum())
+        amounts = chunk[AMOUNT_COLUMNS].assign(filas=1)
+        # claves como texto: las categorías de cada bloque no coinciden entre sí
+        self.by_seccion = self._add(self.by_seccion, amounts.groupby(chunk["seccion"].astype("string"), dropna=False).sum())
+        self.by_categoria = self._add(self.by_categoria, amounts.groupby(chunk["categoria"].astype("string"), dropna=False).sum())
+        # top-k parcial: basta con los k mejores de cada bloque
+        cand = chunk.nlargest(self.top_k, "monto_2026")[["codigo", "item_2026", "monto_2026"]]
+        self.top = cand if self.top is None else pd.concat([self.top, cand]).nlargest(self.top_k, "monto_2026")
+
+    @staticmethod
+    def _group_records(df: pd.DataFrame | None) -> list[dict]:
+        if df is None:
+            return []
+        out = df.astype("int64").sort_values("monto_2026", ascending=False)
+        return [{"nombre": str(k), **{c: int(v) for c, v in row.items()}} for k, row in out.iterrows()]
+
+    def result(self) -> dict:
+        top = [] if self.top is None else [
+            {"codigo": str(r.codigo), "item_2026": str(r.item_2026), "monto_2026": int(r.monto_2026)}
+            for r in self.top.itertuples(index=False)
+        ]
+        return {
+            "rows": self.rows,
+            "new_items": self.new_items,
+            "totals": self.totals,
+            "by_seccion": self._group_records(self.by_seccion),
+            "by_categoria": self._group_records(self.by_categoria),
+            "top_monto_2026": top,
+        }
+
+
+@dataclass(frozen=True)
+class IngestResult:
+    path: Path
+    rows: int
+    chunks: int
+    missing_columns: list
+    summary: dict
+
+
+def _arrow_schema():
+    import pyarrow as pa
+
+    types = {
+        "string": pa.string(),
+        "category": pa.dictionary(pa.int32(), pa.string()),
+        "int16": pa.int16(),
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+    }
+    return pa.schema([(col, types[dtype]) for col, dtype in FRAME_DTYPES.items()])
+
+
+def ingest(source, out, sheet_name: str = DEFAULT_SHEET, chunk_rows: int = CHUNK_ROWS) -> IngestResult:
+    """Convierte ``source`` a un Parquet canónico en ``out``, bloque a bloque.
+
+    El resumen de :class:`RunningTotals` y las columnas faltantes quedan en la
+    metadata del Parquet (ver :func:`read_summary`).
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema()
+    totals = RunningTotals()
+    missing = None
+    chunks = 0
+    with pq.ParquetWriter(out, schema) as writer:
+        for chunk in iter_chunks(source, sheet_name, chunk_rows):
+            if missing is None:
+                missing = chunk.attrs["missing_columns"]
+            totals.update(chunk)
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            chunks += 1
+        summary = totals.result()
+        # sin filas: no hubo encabezado que revisar, se informa todo como faltante
+        meta = {"missing_columns": missing if missing is not None else [DISPLAY_MAP[c] for c in SCHEMA], "summary": summary}
+        writer.add_key_value_metadata({_META_KEY: json.dumps(meta, ensure_ascii=False)})
+    return IngestResult(Path(out), totals.rows, chunks, meta["missing_columns"], summary)
+
+
+def _read_meta(parquet) -> dict:
+    import pyarrow.parquet as pq
+
+    raw = (pq.read_metadata(parquet).metadata or {}).get(_META_KEY)
+    return json.loads(raw) if raw else {"missing_columns": [], "summary": {}}
+
+
+def read_summary(parquet) -> dict:
+    """Agregados calculados durante la ingesta (sin leer las filas)."""
+    return _read_meta(parquet)["summary"]
+
+
+def canonical_parquet(path, sheet_name: str = DEFAULT_SHEET) -> Path:
+    """Parquet canónico de ``path``, cacheado en ``.pgn_cache/`` (ver :mod:`pgn.cache`)."""
+    return cached_parquet(path, f"{sheet_name}.canonical", lambda tmp: ingest(path, tmp, sheet_name))
+
+
+def load_streaming(path, sheet_name: str = DEFAULT_SHEET) -> pd.DataFrame:
+    """Mismo frame que ``normalize(pd.read_excel(path))``, sin cargar la hoja entera."""
+    import pyarrow.parquet as pq
+
+    parquet = canonical_parquet(path, sheet_name)
+    df = pq.read_table(parquet).to_pandas().astype(FRAME_DTYPES)
+    df.attrs["missing_columns"] = _read_meta(parquet)["missing_columns"]
+    return df
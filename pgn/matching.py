@@ -0,0 +1,218 @@
+"""Vínculo de organismos entre años: renombrados y recodificados.
+
+En el Excel cada fila trae ``Item_2025`` e ``Item_2026``; si un organismo
+cambió de código o de nombre aparece como una fila que "desaparece" (sin
+2026) más una "nueva" (``Item_2025`` vacío → "Item inexistente"). Acá cada año
+se toma por separado (los ítems vigentes ese año: código, nombre, monto) y se
+vinculan en tres pasadas, cada una sólo sobre lo que quedó sin pareja:
+
+1. mismo ``codigo`` (si un código se repite, por orden de aparición);
+2. mismo nombre normalizado (:func:`pgn.search.normalize_name`);
+3. similitud de trigramas entre nombres distintos (Jaccard ≥
+   :data:`MIN_SIMILARITY`), comparando sólo candidatos (blocking): pares que
+   comparten una palabra poco frecuente (las que están en más de
+   :data:`MAX_BLOCK` nombres, como "ministerio", no arman bloque) más los
+   :data:`WINDOW` vecinos de cada nombre en orden alfabético, del derecho y al
+   revés (typos al final y al principio). La cantidad de pares crece lineal
+   con los nombres, no cuadrática.
+
+El resultado (:class:`EntityMatch`) se guarda por par de versiones de dataset
+en :mod:`pgn.artifacts` (:func:`match_versions`); :func:`resolve` es el caso
+de un solo Excel (2025 → 2026) que usan las apps. En ``presup.py`` alimenta
+sólo "Organismos que aparecen en 2026" y :func:`linked_table`; la
+``variacion_pct`` del frame (tabla completa, :mod:`pgn.rankings`) sigue siendo
+la del Excel por fila.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .artifacts import artifacts
+from .search import _trigrams, normalize_name
+
+MIN_SIMILARITY = 0.6
+MAX_BLOCK = 50  # ítems por lado en un bloque; más que eso la palabra no discrimina
+MIN_TOKEN = 3  # palabras más cortas ("de", "la") no arman bloque
+WINDOW = 5  # vecinos por lado en el orden alfabético (y en el de los nombres al revés)
+METHODS = ("codigo", "nombre", "similitud")
+
+
+def side(df: pd.DataFrame, year: int) -> pd.DataFrame:
+    """Ítems vigentes en ``year``: posición de fila, código, nombre normalizado y monto."""
+    item = df[f"item_{year}"]
+    item = item if isinstance(item.dtype, pd.CategoricalDtype) else item.astype("category")
+    codes = item.cat.codes.to_numpy()
+    pos = np.flatnonzero(codes >= 0)
+    # se normalizan los nombres distintos, no fila por fila
+    names = np.array([normalize_name(c) for c in item.cat.categories], dtype=object)
+    return pd.DataFrame({
+        "pos": pos,
+        "codigo": df["codigo"].iloc[pos].astype("string").fillna("").to_numpy(),
+        "nombre": names[codes[pos]],
+        "monto": df[f"monto_{year}"].iloc[pos].to_numpy(dtype=np.int64),
+    })
+
+
+@dataclass(frozen=True)
+class EntityMatch:
+    left_version: str | None
+    right_version: str | None
+    pairs: pd.DataFrame  # left, right (posiciones de fila), metodo, score
+    left: np.ndarray  # posiciones de los ítems del lado izquierdo (año anterior)
+    right: np.ndarray  # ídem lado derecho
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.pairs.memory_usage(deep=True).sum() + self.left.nbytes + self.right.nbytes)
+
+    def unmatched_left(self) -> np.ndarray:
+        """Ítems del año anterior sin pareja (discontinuados)."""
+        return np.setdiff1d(self.left, self.pairs["left"].to_numpy())
+
+    def unmatched_right(self) -> np.ndarray:
+        """Ítems del año nuevo sin pareja (nuevos de verdad)."""
+        return np.setdiff1d(self.right, self.pairs["right"].to_numpy())
+
+    def relinked(self) -> pd.DataFrame:
+        """Pares que el Excel no trae en la misma fila (sólo tiene sentido con un mismo frame)."""
+        return self.pairs[self.pairs["left"] != self.pairs["right"]]
+
+
+def _exact(left: pd.DataFrame, right: pd.DataFrame, key: str) -> pd.DataFrame:
+    # claves repetidas: la k-ésima aparición de un lado con la k-ésima del otro
+    lk = left.assign(_n=left.groupby(key, sort=False).cumcount())
+    rk = right.assign(_n=right.groupby(key, sort=False).cumcount())
+    lk, rk = lk[lk[key] != ""], rk[rk[key] != ""]
+    m = lk[[key, "_n", "pos"]].merge(rk[[key, "_n", "pos"]], on=[key, "_n"], suffixes=("_l", "_r"))
+    return pd.DataFrame({"left": m["pos_l"].to_numpy(), "right": m["pos_r"].to_numpy(), "score": 1.0})
+
+
+def _word_blocks(left: np.ndarray, right: np.ndarray) -> pd.DataFrame:
+    # pares de nombres que comparten una palabra poco frecuente
+    def words(names):
+        w = pd.Series(names).str.split().explode().dropna()
+        w = w[w.str.len() >= MIN_TOKEN]
+        w = pd.DataFrame({"word": w.to_numpy(), "row": w.index.to_numpy()}).drop_duplicates()
+        return w[w.groupby("word")["row"].transform("size") <= MAX_BLOCK]
+
+    return words(left).merge(words(right), on="word", suffixes=("_l", "_r"))[["row_l", "row_r"]]
+
+
+def _neighbours(left: np.ndarray, right: np.ndarray, key) -> pd.DataFrame:
+    # sorted neighbourhood: se ordenan los dos lados juntos y se compara cada
+    # nombre con los WINDOW siguientes; con la clave al revés se cubren
+    # diferencias al principio del nombre
+    keys = [key(n) for n in left] + [key(n) for n in right]
+    order = np.argsort(np.array(keys, dtype=object), kind="stable")
+    is_left = order < len(left)
+    parts = []
+    for d in range(1, WINDOW + 1):
+        a, b = order[:-d], order[d:]
+        la, lb = is_left[:-d], is_left[d:]
+        cross = la != lb
+        l = np.where(la, a, b)[cross]
+        r = np.where(la, b, a)[cross] - len(left)
+        parts.append(pd.DataFrame({"row_l": l, "row_r": r}))
+    return pd.concat(parts, ignore_index=True)
+
+
+def _similar(left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
+    # se comparan nombres distintos (no filas); después cada nombre nuevo toma el
+    # del año anterior que le tocó y las filas se emparejan como en _exact
+    ln, rn = left["nombre"].unique(), right["nombre"].unique()
+    ln, rn = ln[ln != ""], rn[rn != ""]
+    if not len(ln) or not len(rn):
+        return pd.DataFrame({"left": [], "right": [], "score": []})
+    cand = pd.concat([
+        _word_blocks(ln, rn),
+        _neighbours(ln, rn, lambda n: n),
+        _neighbours(ln, rn, lambda n: n[::-1]),
+    ], ignore_index=True).drop_duplicates()
+
+    lg = [_trigrams(n) for n in ln]
+    rg = [_trigrams(n) for n in rn]
+    scores = np.array([len(lg[i] & rg[j]) / len(lg[i] | rg[j]) for i, j in zip(cand["row_l"], cand["row_r"])])
+    cand = cand.assign(score=scores)
+    cand = cand[cand["score"] >= MIN_SIMILARITY].sort_values(["score", "row_l", "row_r"], ascending=[False, True, True])
+
+    # 1:1, el par más parecido primero
+    used_l, used_r, mapped = set(), set(), {}
+    for i, j, s in zip(cand["row_l"], cand["row_r"], cand["score"]):
+        if i not in used_l and j not in used_r:
+            used_l.add(i)
+            used_r.add(j)
+            mapped[rn[j]] = (ln[i], s)
+    if not mapped:
+        return pd.DataFrame({"left": [], "right": [], "score": []})
+    right = right[right["nombre"].isin(mapped)]
+    target = right["nombre"].map(lambda n: mapped[n][0])
+    found = _exact(left, right.assign(nombre=target), "nombre")
+    by_right = dict(zip(right["pos"], right["nombre"].map(lambda n: mapped[n][1])))
+    return found.assign(score=found["right"].map(by_right))
+
+
+def match_sides(left: pd.DataFrame, right: pd.DataFrame, left_version=None, right_version=None) -> EntityMatch:
+    """Vincula los ítems de ``left`` (año anterior) con los de ``right`` (ver :func:`side`)."""
+    parts = []
+    rest_l, rest_r = left, right
+    for method in METHODS:
+        if rest_l.empty or rest_r.empty:
+            break
+        found = _similar(rest_l, rest_r) if method == "similitud" else _exact(rest_l, rest_r, method)
+        parts.append(found.assign(metodo=method))
+        rest_l = rest_l[~rest_l["pos"].isin(found["left"])]
+        rest_r = rest_r[~rest_r["pos"].isin(found["right"])]
+    pairs = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=["left", "right", "score", "metodo"])
+    pairs = pairs.astype({"left": np.int64, "right": np.int64, "score": float})
+    pairs["metodo"] = pd.Categorical(pairs["metodo"], categories=METHODS)
+    return EntityMatch(
+        left_version=left_version,
+        right_version=right_version,
+        pairs=pairs[["left", "right", "metodo", "score"]].sort_values("right", ignore_index=True),
+        left=left["pos"].to_numpy(dtype=np.int64),
+        right=right["pos"].to_numpy(dtype=np.int64),
+    )
+
+
+def match_versions(left_df: pd.DataFrame, right_df: pd.DataFrame, left_year: int = 2025,
+                   right_year: int = 2026) -> EntityMatch:
+    """``left_year`` de ``left_df`` contra ``right_year`` de ``right_df``, cacheado por par de versiones.
+
+    Se guarda bajo la versión de ``right_df``: si esa versión sale del cache, el vínculo también.
+    """
+    lv, rv = left_df.attrs.get("version"), right_df.attrs.get("version")
+    return artifacts.get_or_build(
+        rv,
+        f"matching:{lv}:{left_year}:{right_year}",
+        lambda: match_sides(side(left_df, left_year), side(right_df, right_year), lv, rv),
+    )
+
+
+def resolve(df: pd.DataFrame) -> EntityMatch:
+    """2025 → 2026 dentro de un mismo Excel."""
+    return match_versions(df, df, 2025, 2026)
+
+
+def linked_table(df: pd.DataFrame, match: EntityMatch) -> pd.DataFrame:
+    """Una fila por par vinculado en otra fila o con otro código, con la variación entre los montos vinculados."""
+    pairs = match.relinked()
+    left, right = pairs["left"].to_numpy(), pairs["right"].to_numpy()
+    m25 = df["monto_2025"].to_numpy()[left]
+    m26 = df["monto_2026"].to_numpy()[right]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var = np.where(m25 > 0, (m26 / m25 - 1.0) * 100.0, np.nan)
+    return pd.DataFrame({
+        "codigo_2025": df["codigo"].to_numpy()[left],
+        "item_2025": df["item_2025"].to_numpy()[left],
+        "monto_2025": m25,
+        "codigo_2026": df["codigo"].to_numpy()[right],
+        "item_2026": df["item_2026"].to_numpy()[right],
+        "monto_2026": m26,
+        "variacion_pct": var,
+        "metodo": pairs["metodo"].to_numpy(),
+        "score": pairs["score"].to_numpy(),
+    })
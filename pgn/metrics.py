@@ -0,0 +1,349 @@
+"""Instrumentación liviana: tiempo por etapa de cada rerun y aciertos de los caches.
+
+Las apps marcan sus etapas con :meth:`Metrics.span` (o :meth:`Metrics.timed`
+como decorador) entre :meth:`Metrics.begin_run` y :meth:`Metrics.end_run`;
+los caches (:mod:`pgn.artifacts`, frames de :mod:`pgn.data`, Parquet de
+:mod:`pgn.cache`) reportan cada consulta con :meth:`Metrics.cache`.
+
+- ``PGN_METRICS=0`` (default): todo es no-op. ``span`` devuelve siempre el
+  mismo context manager vacío y ``cache``/``count`` salen en el primer ``if``.
+- ``PGN_METRICS=1``: se registra cada rerun (spans con su anidamiento y los
+  aciertos/fallos de cache de ese rerun) en un historial de
+  ``PGN_METRICS_HISTORY`` corridas (100), más acumulados del proceso.
+- ``PGN_METRICS=panel``: además, panel "Tiempos" en la barra lateral
+  (:func:`render_panel`), con el último rerun, p50/p95 por etapa, tasa de
+  aciertos por cache y descarga JSON/Prometheus.
+- ``PGN_METRICS_DUMP=/ruta/metrics.prom`` (o ``.json``): se reescribe al
+  terminar cada rerun; el ``.prom`` sirve para el textfile collector de
+  node_exporter.
+
+El estado del rerun en curso es por thread (Streamlit corre cada sesión en
+el suyo); los acumulados son del proceso. Las apps llaman a ``end_run`` en un
+``finally``, así un rerun cortado por ``st.stop()`` (o por una excepción)
+también se cierra y se registra.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from functools import wraps
+from pathlib import Path
+
+import numpy as np
+
+MODE = os.environ.get("PGN_METRICS", "0").strip().lower()
+HISTORY = int(os.environ.get("PGN_METRICS_HISTORY", "100"))
+DUMP_PATH = os.environ.get("PGN_METRICS_DUMP") or None
+QUANTILES = (0.5, 0.95)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("metrics", "name", "t0", "depth", "slot")
+
+    def __init__(self, metrics: Metrics, name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        state = self.metrics._local
+        self.depth = state.depth
+        state.depth += 1
+        # el lugar en el rerun se reserva al entrar: los spans quedan en orden de inicio
+        self.slot = None
+        if state.run is not None:
+            self.slot = len(state.run.spans)
+            state.run.spans.append((self.name, self.depth, 0.0))
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.t0
+        state = self.metrics._local
+        state.depth -= 1
+        if self.slot is not None and state.run is not None and self.slot < len(state.run.spans):
+            state.run.spans[self.slot] = (self.name, self.depth, elapsed)
+        self.metrics._aggregate(state.run.app if state.run is not None else "-", self.name, elapsed)
+        return False
+
+
+@dataclass
+class Run:
+    app: str
+    started: float  # epoch
+    seconds: float = 0.0
+    spans: list[tuple[str, int, float]] = field(default_factory=list)  # nombre, profundidad, segundos
+    caches: dict[str, list[int]] = field(default_factory=dict)  # cache → [aciertos, fallos]
+    counters: dict[str, int] = field(default_factory=dict)
+
+
+class _ThreadState(threading.local):
+    def __init__(self):
+        self.run: Run | None = None
+        self.t0 = 0.0
+        self.depth = 0
+
+
+class Metrics:
+    """Registro de spans, contadores y caches; un único objeto por proceso (:data:`metrics`)."""
+
+    def __init__(self, enabled: bool = MODE not in ("", "0", "off"), history: int = HISTORY,
+                 dump_path: str | None = DUMP_PATH):
+        self.enabled = enabled
+        self.dump_path = dump_path
+        self._local = _ThreadState()
+        self._lock = threading.Lock()
+        self.runs: deque[Run] = deque(maxlen=history)
+        self.spans: dict[tuple[str, str], list[float]] = {}  # (app, span) → [cantidad, suma, máximo]
+        self.caches: dict[str, list[int]] = {}
+        self.counters: dict[str, int] = {}
+
+    # --- registro ---------------------------------------------------------
+    def span(self, name: str):
+        """Context manager que mide ``name`` (anidable)."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def timed(self, name: str | None = None):
+        """Decorador: cada llamada es un span (``name`` por defecto: el de la función)."""
+        def decorate(fn):
+            label = name or fn.__name__
+
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Span(self, label):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def count(self, name: str, n: int = 1) -> None:
+        if not self.enabled:
+            return
+        run = self._local.run
+        if run is not None:
+            run.counters[name] = run.counters.get(name, 0) + n
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def cache(self, name: str, hit: bool) -> None:
+        """Una consulta al cache ``name``: acierto o fallo."""
+        if not self.enabled:
+            return
+        i = 0 if hit else 1
+        run = self._local.run
+        if run is not None:
+            run.caches.setdefault(name, [0, 0])[i] += 1
+        with self._lock:
+            self.caches.setdefault(name, [0, 0])[i] += 1
+
+    def _aggregate(self, app: str, name: str, seconds: float) -> None:
+        with self._lock:
+            agg = self.spans.setdefault((app, name), [0, 0.0, 0.0])
+            agg[0] += 1
+            agg[1] += seconds
+            agg[2] = max(agg[2], seconds)
+
+    # --- reruns -----------------------------------------------------------
+    def begin_run(self, app: str) -> None:
+        """Inicio de un rerun de ``app`` (primera línea del script, después de ``set_page_config``)."""
+        if not self.enabled:
+            return
+        state = self._local
+        state.run = Run(app=app, started=time.time())
+        state.depth = 0
+        state.t0 = time.perf_counter()
+
+    def end_run(self) -> Run | None:
+        """Cierra el rerun en curso, lo agrega al historial y reescribe ``PGN_METRICS_DUMP``."""
+        if not self.enabled:
+            return None
+        state = self._local
+        run, state.run = state.run, None
+        if run is None:
+            return None
+        run.seconds = time.perf_counter() - state.t0
+        with self._lock:
+            self.runs.append(run)
+        self._aggregate(run.app, "rerun", run.seconds)
+        if self.dump_path:
+            self.dump(self.dump_path)
+        return run
+
+    def last_run(self, app: str | None = None) -> Run | None:
+        with self._lock:
+            for run in reversed(self.runs):
+                if app is None or run.app == app:
+                    return run
+        return None
+
+    def reset(self) -> None:
+        with self._lock:
+            self.runs.clear()
+            self.spans.clear()
+            self.caches.clear()
+            self.counters.clear()
+
+    # --- exportación ------------------------------------------------------
+    def quantiles(self) -> dict[tuple[str, str], dict[float, float]]:
+        """p50/p95 por (app, span) sobre el historial (``rerun`` = el rerun completo)."""
+        with self._lock:
+            runs = list(self.runs)
+        samples: dict[tuple[str, str], list[float]] = {}
+        for run in runs:
+            samples.setdefault((run.app, "rerun"), []).append(run.seconds)
+            per_run: dict[str, float] = {}
+            for name, _, seconds in run.spans:
+                per_run[name] = per_run.get(name, 0.0) + seconds
+            for name, seconds in per_run.items():
+                samples.setdefault((run.app, name), []).append(seconds)
+        return {k: dict(zip(QUANTILES, np.quantile(v, QUANTILES).tolist())) for k, v in samples.items()}
+
+    def snapshot(self) -> dict:
+        """Todo lo registrado, serializable a JSON."""
+        from .artifacts import artifacts
+
+        quantiles = self.quantiles()
+        with self._lock:
+            spans = [
+                {"app": app, "span": name, "count": int(c), "sum_s": s, "max_s": m,
+                 **{f"p{int(q * 100)}_s": quantiles.get((app, name), {}).get(q) for q in QUANTILES}}
+                for (app, name), (c, s, m) in sorted(self.spans.items())
+            ]
+            caches = {
+                name: {"hits": h, "misses": m, "hit_rate": h / (h + m) if h + m else None}
+                for name, (h, m) in sorted(self.caches.items())
+            }
+            counters = dict(sorted(self.counters.items()))
+            last = asdict(self.runs[-1]) if self.runs else None
+        return {
+            "enabled": self.enabled,
+            "pid": os.getpid(),
+            "runs": len(self.runs),
+            "spans": spans,
+            "caches": caches,
+            "counters": counters,
+            "artifacts": {"bytes": artifacts.nbytes, "max_bytes": artifacts.max_bytes, "items": len(artifacts)},
+            "last_run": last,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Formato de texto de Prometheus (exposition format 0.0.4)."""
+        snap = self.snapshot()
+
+        def esc(v: str) -> str:
+            return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        lines = [
+            "# HELP pgn_span_seconds Tiempo por etapa de los reruns (p50/p95 sobre el historial).",
+            "# TYPE pgn_span_seconds summary",
+        ]
+        for s in snap["spans"]:
+            labels = f'app="{esc(s["app"])}",span="{esc(s["span"])}"'
+            for q in QUANTILES:
+                value = s[f"p{int(q * 100)}_s"]
+                if value is not None:
+                    lines.append(f'pgn_span_seconds{{{labels},quantile="{q}"}} {value:.6g}')
+            lines.append(f"pgn_span_seconds_sum{{{labels}}} {s['sum_s']:.6g}")
+            lines.append(f"pgn_span_seconds_count{{{labels}}} {s['count']}")
+        lines += ["# HELP pgn_cache_requests_total Consultas a cada cache.", "# TYPE pgn_cache_requests_total counter"]
+        for name, c in snap["caches"].items():
+            lines.append(f'pgn_cache_requests_total{{cache="{esc(name)}",result="hit"}} {c["hits"]}')
+            lines.append(f'pgn_cache_requests_total{{cache="{esc(name)}",result="miss"}} {c["misses"]}')
+        if snap["counters"]:
+            lines += ["# HELP pgn_events_total Contadores de la app.", "# TYPE pgn_events_total counter"]
+            for name, n in snap["counters"].items():
+                lines.append(f'pgn_events_total{{name="{esc(name)}"}} {n}')
+        lines += [
+            "# HELP pgn_artifact_cache_bytes Bytes estimados en pgn.artifacts.",
+            "# TYPE pgn_artifact_cache_bytes gauge",
+            f"pgn_artifact_cache_bytes {snap['artifacts']['bytes']}",
+            "# HELP pgn_artifact_cache_items Artefactos en pgn.artifacts.",
+            "# TYPE pgn_artifact_cache_items gauge",
+            f"pgn_artifact_cache_items {snap['artifacts']['items']}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path) -> Path:
+        """Escribe JSON (``.json``) o Prometheus (cualquier otra extensión), reemplazando el archivo entero."""
+        path = Path(path)
+        text = self.to_json() if path.suffix.lower() == ".json" else self.to_prometheus()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)  # el collector nunca lee un archivo a medio escribir
+        return path
+
+
+# registro único del proceso
+metrics = Metrics()
+
+
+def panel_enabled() -> bool:
+    return metrics.enabled and MODE == "panel"
+
+
+def render_panel(app: str) -> None:
+    """Panel "Tiempos" en la barra lateral (sólo con ``PGN_METRICS=panel``)."""
+    if not panel_enabled():
+        return
+    import pandas as pd
+    import streamlit as st
+
+    run = metrics.last_run(app)
+    quantiles = metrics.quantiles()
+    snap = metrics.snapshot()
+    with st.sidebar.expander("Tiempos (PGN_METRICS)", expanded=False):
+        if run is None:
+            st.caption("Todavía no hay reruns registrados.")
+            return
+        st.caption(f"Último rerun: {run.seconds * 1e3:,.1f} ms · {len(metrics.runs)} en el historial")
+        st.dataframe(
+            pd.DataFrame({
+                "etapa": ["\u2003" * depth + name for name, depth, _ in run.spans],
+                "ms": [s * 1e3 for _, _, s in run.spans],
+                "p50 ms": [quantiles.get((app, name), {}).get(0.5, np.nan) * 1e3 for name, _, _ in run.spans],
+                "p95 ms": [quantiles.get((app, name), {}).get(0.95, np.nan) * 1e3 for name, _, _ in run.spans],
+            }),
+            hide_index=True,
+            column_config={c: st.column_config.NumberColumn(format="%.2f") for c in ("ms", "p50 ms", "p95 ms")},
+            key="pgn_metrics_spans",
+        )
+        if snap["caches"]:
+            st.dataframe(
+                pd.DataFrame([
+                    {"cache": name, "aciertos": c["hits"], "fallos": c["misses"], "tasa": c["hit_rate"]}
+                    for name, c in snap["caches"].items()
+                ]),
+                hide_index=True,
+                column_config={"tasa": st.column_config.NumberColumn(format="%.2f")},
+                key="pgn_metrics_caches",
+            )
+        st.caption(f"pgn.artifacts: {snap['artifacts']['items']} artefactos, {snap['artifacts']['bytes'] / 1e6:,.1f} MB")
+        cols = st.columns(2)
+        cols[0].download_button("JSON", data=metrics.to_json(), file_name="pgn_metrics.json",
+                                mime="application/json", key="pgn_metrics_json", on_click="ignore")
+        cols[1].download_button("Prometheus", data=metrics.to_prometheus(), file_name="pgn_metrics.prom",
+                                mime="text/plain", key="pgn_metrics_prom", on_click="ignore")
@@ -0,0 +1,264 @@
+"""Desglose por objeto de gasto (100–900): organismo × objeto × año.
+
+El desglose se guarda como un array denso ``values[organismo, objeto, año]``
+(int64) más un índice ``nombre/código → fila``; elegir un organismo es un
+lookup en un dict y un slice del array, sin filtrar filas.
+
+Fuentes:
+
+- un dataset con columna ``Objeto`` (extractos de SITUFIN, :mod:`pgn.synthetic`):
+  se suma desde la serie multianual (:func:`pgn.series.load_series`), agrupando
+  por la entidad que sale de ``Código`` (``nivel``/``entidad``);
+- si no, ``frontend/src/data/organismos_por_objeto.json`` (el Excel del PGN
+  viene a nivel entidad, sin objeto).
+
+Los dashboards embebidos reciben sólo el índice (nombres, códigos) y el
+desglose del organismo inicial; el resto se publica como un JSON por
+organismo en ``static/data/<versión>/objetos/`` (:func:`publish`) y el iframe
+lo pide al seleccionarlo (ver :mod:`pgn.service`).
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .artifacts import artifacts
+from .assets import STATIC_DIR, static_url
+from .cache import DEFAULT_SHEET
+from .data import DEFAULT_WORKBOOK, ROOT, dataset_version, entity_code
+from .search import build_index, normalize_name
+from .series import OBJECT_COLUMN, load_series
+from .service import publish_tree
+
+ORGANISMOS_JSON = ROOT / "frontend" / "src" / "data" / "organismos_por_objeto.json"
+OBJECT_NAMES = {
+    100: "Servicios Personales",
+    200: "Servicios No Personales",
+    300: "Bienes de Consumo e Insumos",
+    400: "Bienes de Cambio",
+    500: "Inversión Física",
+    600: "Inversión Financiera",
+    700: "Servicio de Deuda Pública",
+    800: "Transferencias",
+    900: "Otros Gastos",
+}
+DEFAULT_ENTITY = "Ministerio de Educación y Ciencias"
+
+
+@dataclass(frozen=True)
+class ObjectCube:
+    version: str | None
+    entities: pd.DataFrame  # una fila por organismo: nombre, codigo, nivel
+    objects: np.ndarray  # códigos de objeto ordenados (100, 200, ...)
+    years: np.ndarray  # años ordenados
+    values: np.ndarray  # (organismos, objetos, años) int64
+    index: dict[str, int]  # nombre normalizado / código → fila
+    control: dict[int, dict[str, int]]  # totales de control por fila (si la fuente los trae)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.entities.memory_usage(deep=True).sum() + self.values.nbytes)
+
+    def position(self, key) -> int:
+        """Fila del organismo ``key`` (nombre, con o sin acentos, o código)."""
+        if isinstance(key, (int, np.integer)):
+            if not 0 <= key < len(self.entities):
+                raise KeyError(f"Fila fuera de rango: {key}")
+            return int(key)
+        pos = self.index.get(str(key))
+        if pos is None:
+            pos = self.index.get(normalize_name(key))
+        if pos is None:
+            raise KeyError(f"Organismo sin desglose por objeto: {key!r}")
+        return pos
+
+    def breakdown(self, key) -> pd.DataFrame:
+        """Objetos × años del organismo ``key``."""
+        return pd.DataFrame(
+            self.values[self.position(key)],
+            index=pd.Index(self.objects, name="objeto"),
+            columns=pd.Index(self.years, name="anio"),
+        )
+
+    def slice(self, key) -> dict:
+        """Desglose de un organismo en el formato de ``organismos_por_objeto.json``."""
+        pos = self.position(key)
+        row = self.entities.iloc[pos]
+        block = self.values[pos]
+        pgn = {str(y): {str(o): int(v) for o, v in zip(self.objects, block[:, j])} for j, y in enumerate(self.years)}
+        totals = self.control.get(pos) or {str(y): int(block[:, j].sum()) for j, y in enumerate(self.years)}
+        return {"nombre": row["nombre"], "codigo": row["codigo"], "nivel": row["nivel"], "pgn": pgn, "totales": totals}
+
+    def default_position(self) -> int:
+        pos = self.index.get(normalize_name(DEFAULT_ENTITY))
+        if pos is None:  # el de mayor gasto en el último año
+            pos = int(self.values[:, :, -1].sum(axis=1).argmax()) if len(self.entities) else 0
+        return pos
+
+    def search_index(self):
+        """Índice de búsqueda sobre nombre y código de los organismos (:mod:`pgn.search`)."""
+        return artifacts.get_or_build(
+            self.version, "objects:search", lambda: build_index([self.entities["nombre"], self.entities["codigo"]])
+        )
+
+    def to_payload(self, base: str | None = None) -> dict:
+        """Índice para el iframe + el desglose del organismo inicial (el resto, ``base + <fila>.json``)."""
+        first = self.default_position()
+        return {
+            "years": self.years.tolist(),
+            "objects": {str(o): OBJECT_NAMES.get(int(o), f"Objeto {o}") for o in self.objects},
+            "entities": self.entities[["nombre", "codigo", "nivel"]].to_dict("records"),
+            "search": self.search_index().to_payload(),
+            "selected": first,
+            "slice": self.slice(first) if len(self.entities) else None,
+            "base": base,
+        }
+
+    @classmethod
+    def _build(cls, version, entities: pd.DataFrame, objects, years, values, control=None) -> "ObjectCube":
+        entities = entities.reset_index(drop=True)
+        index = {}
+        for pos, (nombre, codigo) in enumerate(zip(entities["nombre"], entities["codigo"])):
+            index.setdefault(str(codigo), pos)
+            index.setdefault(normalize_name(nombre), pos)
+        return cls(
+            version=version,
+            entities=entities,
+            objects=np.asarray(objects, dtype=np.int64),
+            years=np.asarray(years, dtype=np.int64),
+            values=values,
+            index=index,
+            control=control or {},
+        )
+
+    @classmethod
+    def from_series(cls, series, version: str | None = None) -> "ObjectCube":
+        """Suma la serie (una fila por ítem y objeto) por organismo × objeto, todos los años."""
+        keys = series.keys
+        objeto = pd.to_numeric(keys[OBJECT_COLUMN].astype("string"), errors="coerce").to_numpy()
+        valid = ~np.isnan(objeto)
+        ent_key = keys["nivel"].to_numpy(np.int32) * 10_000 + keys["entidad"].to_numpy(np.int32)
+        ent, _ = pd.factorize(ent_key[valid])
+        objects, obj = np.unique(objeto[valid].astype(np.int64), return_inverse=True)
+        n_ent, n_obj, n_year = int(ent.max()) + 1 if len(ent) else 0, len(objects), len(series.years)
+
+        # suma por celda (organismo, objeto) ordenando una vez: reduceat en int64, sin pérdida
+        cell = ent.astype(np.int64) * n_obj + obj
+        order = np.argsort(cell, kind="stable")
+        cell_sorted = cell[order]
+        starts = np.flatnonzero(np.r_[True, cell_sorted[1:] != cell_sorted[:-1]]) if len(cell) else np.empty(0, np.intp)
+        values = np.zeros((n_ent * n_obj, n_year), dtype=np.int64)
+        if len(starts):
+            values[cell_sorted[starts]] = np.add.reduceat(series.amounts[valid][order], starts, axis=0)
+
+        # atributos: los de la primera fila de cada organismo
+        first = np.flatnonzero(valid)[np.unique(ent, return_index=True)[1]]
+        attrs = keys.iloc[first]
+        names = attrs["item"].astype("string").str.split(" / ", n=1).str[0]
+        codes = [entity_code(n, e) for n, e in zip(attrs["nivel"], attrs["entidad"])]
+        entities = pd.DataFrame({
+            "nombre": names.fillna(pd.Series(codes, index=names.index)).tolist(),
+            "codigo": codes,
+            "nivel": attrs["categoria"].astype("string").fillna("").tolist(),
+        })
+        return cls._build(version, entities, objects, series.years, values.reshape(n_ent, n_obj, n_year))
+
+    @classmethod
+    def from_json(cls, doc: dict, version: str | None = None) -> "ObjectCube":
+        """Desde ``organismos_por_objeto.json`` (``{"meta": ..., "organismos": {nombre: ...}}``)."""
+        orgs = doc.get("organismos", {})
+        objects = sorted({int(o) for o in doc.get("meta", {}).get("objects", [])}
+                         | {int(o) for org in orgs.values() for y in org.get("pgn", {}).values() for o in y})
+        years = sorted({int(y) for org in orgs.values() for y in org.get("pgn", {})})
+        obj_pos = {o: i for i, o in enumerate(objects)}
+        year_pos = {y: j for j, y in enumerate(years)}
+        values = np.zeros((len(orgs), len(objects), len(years)), dtype=np.int64)
+        control = {}
+        for i, org in enumerate(orgs.values()):
+            for year, by_obj in org.get("pgn", {}).items():
+                for o, monto in by_obj.items():
+                    values[i, obj_pos[int(o)], year_pos[int(year)]] = int(monto or 0)
+            if org.get("totales"):
+                control[i] = {str(y): int(v) for y, v in org["totales"].items()}
+        entities = pd.DataFrame({
+            "nombre": list(orgs),
+            "codigo": [str(org.get("codigo", "")) for org in orgs.values()],
+            "nivel": [str(org.get("nivel", "")) for org in orgs.values()],
+        })
+        return cls._build(version, entities, objects, years, values, control)
+
+
+def load_objects(path=DEFAULT_WORKBOOK, sheet_name: str = DEFAULT_SHEET) -> ObjectCube:
+    """Desglose por objeto de ``path`` (o del JSON del frontend si la hoja no trae ``Objeto``)."""
+    path = Path(path).resolve()
+    series = load_series(path, sheet_name)
+    if OBJECT_COLUMN in series.keys.columns:
+        version = dataset_version(path, sheet_name)
+        return artifacts.get_or_build(version, f"objects:{sheet_name}", lambda: ObjectCube.from_series(series, version))
+    version = dataset_version(ORGANISMOS_JSON)
+    return artifacts.get_or_build(
+        version,
+        "objects:json",
+        lambda: ObjectCube.from_json(json.loads(ORGANISMOS_JSON.read_text(encoding="utf-8")), version),
+    )
+
+
+def publish(cube: ObjectCube, base_url: str = "") -> str | None:
+    """Publica un JSON por organismo en ``static/data/<versión>/objetos/``; devuelve la URL base.
+
+    Sin versión no se publica (ver :func:`pgn.service.publish_tree`).
+    """
+    if cube.version is None:
+        return None
+    rel = f"data/{cube.version}/objetos"
+
+    def write() -> str:
+        # una vez por versión: los reruns siguientes no miran el disco
+        publish_tree(rel, {f"{pos}.json": cube.slice(pos) for pos in range(len(cube.entities))})
+        return rel
+
+    artifacts.get_or_build(cube.version, "objects.publish", write)
+    return static_url(base_url, rel) + "/"
+
+
+# Store JS del desglose (sin dependencias): el slice inicial viene en el payload,
+# los demás se piden a ``base + <fila>.json`` una vez y quedan en memoria.
+JS_LOADER = r"""
+function createObjetosStore(p) {
+  p = p || {};
+  const cache = new Map();
+  if (p.slice) cache.set(p.selected, Promise.resolve(p.slice));
+  return {
+    entities: p.entities || [],
+    index: p.search || null,  // índice de búsqueda (createSearchIndex, pgn.search)
+    objects: p.objects || {},
+    selected: p.selected || 0,
+    initial: p.slice || null,
+    get: function (pos) {
+      if (!cache.has(pos)) {
+        if (!p.base) return Promise.reject(new Error("desglose no publicado (static serving)"));
+        const req = fetch(p.base + pos + ".json").then(function (r) {
+          if (!r.ok) throw new Error("HTTP " + r.status);
+          return r.json();
+        });
+        req.catch(function () { cache.delete(pos); });
+        cache.set(pos, req);
+      }
+      return cache.get(pos);
+    },
+  };
+}
+
+// Forma que usan los dashboards: montos 2025/2026 por objeto + totales de control
+function objetosEntityData(slice) {
+  if (!slice) return undefined;
+  const pgn = slice.pgn || {};
+  const totales = slice.totales || {};
+  return { nombre: slice.nombre, codigo: slice.codigo, nivel: slice.nivel, pgn2025: pgn["2025"] || {}, pgn2026: pgn["2026"] || {}, total2025: totales["2025"], total2026: totales["2026"] };
+}
+"""
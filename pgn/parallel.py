@@ -0,0 +1,188 @@
+"""Carga en paralelo de varios Excel y hojas (pool de procesos).
+
+:func:`pgn.data.load_budget` lee una hoja de un archivo; cargar las tres
+revisiones (:mod:`pgn.revisions`), o workbooks por año / por objeto, eran N
+parseos de openpyxl seguidos en un solo núcleo (openpyxl es Python puro: los
+threads no ayudan por el GIL).
+
+:func:`prefetch` reparte las fuentes ``(ruta, hoja)`` que todavía no tienen
+Parquet al día en un pool de ``PGN_WORKERS`` procesos (default: núcleos
+disponibles). Cada proceso parsea su hoja y deja el Parquet en
+``.pgn_cache/`` (:mod:`pgn.cache`, o el canónico de :mod:`pgn.ingest` para
+fuentes grandes/CSV); al proceso principal no vuelve ningún frame, sólo
+tiempos. Después :func:`load_many` lee esos Parquet con
+:func:`pgn.data.load_budget` (milisegundos), así cada frame queda en el
+cache de proceso como si se hubiera cargado en serie.
+
+- :func:`load_combined` concatena varias fuentes en un frame canónico
+  (categorías unidas, versión derivada de las de cada parte).
+- Hoja ``"*"``: todas las hojas del archivo.
+- No se arma el pool con una sola fuente pendiente, con ``PGN_WORKERS=1`` ni
+  si lo pendiente pesa menos de ``PGN_PARALLEL_MB`` (2 MB): arrancar cada
+  proceso cuesta ~1 s (importar pandas), más que parsear los Excel del repo.
+
+Speedup contra la carga en serie: ``python benchmarks/bench_parallel.py``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from . import ingest
+from .artifacts import artifacts
+from .cache import DEFAULT_SHEET, HAS_PYARROW, is_cached, read_excel_cached
+from .data import FRAME_DTYPES, load_budget
+from .metrics import metrics
+
+ALL_SHEETS = "*"
+
+
+def default_workers() -> int:
+    return max(1, int(os.environ.get("PGN_WORKERS") or os.cpu_count() or 1))
+
+
+def parallel_threshold() -> int:
+    # por debajo de esto (bytes pendientes de parsear) arrancar procesos cuesta más que leer en serie
+    return int(float(os.environ.get("PGN_PARALLEL_MB", "2")) * 1024 * 1024)
+
+
+def sheet_names(path) -> list[str]:
+    """Hojas de un Excel (sin leer las celdas); CSV/Parquet tienen una sola."""
+    path = Path(path)
+    if path.suffix.lower() in ingest.STREAM_SUFFIXES:
+        return [DEFAULT_SHEET]
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True)
+    try:
+        return list(wb.sheetnames)
+    finally:
+        wb.close()
+
+
+def expand(sources: Iterable) -> list[tuple[Path, str]]:
+    """``ruta`` o ``(ruta, hoja)`` → lista de ``(ruta, hoja)``; la hoja ``"*"`` se abre en todas."""
+    out = []
+    for source in sources:
+        path, sheet = (source, DEFAULT_SHEET) if isinstance(source, (str, Path)) else source
+        path = Path(path).resolve()
+        if not path.exists():
+            raise FileNotFoundError(f"No se encontró el Excel en: {path}")
+        sheets = sheet_names(path) if sheet == ALL_SHEETS else [sheet]
+        out += [(path, s) for s in sheets]
+    return list(dict.fromkeys(out))
+
+
+def _cache_key(path: Path, sheet_name: str) -> str:
+    # la misma clave con la que pgn.data va a buscar el Parquet
+    return f"{sheet_name}.canonical" if ingest.should_stream(path) else sheet_name
+
+
+def _parse(path: str, sheet_name: str) -> float:
+    # Corre en el proceso hijo: deja el Parquet en .pgn_cache/ y devuelve sólo el tiempo
+    t0 = time.perf_counter()
+    p = Path(path)
+    if ingest.should_stream(p):
+        ingest.canonical_parquet(p, sheet_name)
+    else:
+        read_excel_cached(p, sheet_name)
+    return time.perf_counter() - t0
+
+
+@dataclass
+class PrefetchReport:
+    workers: int = 0  # procesos usados (0 = no hizo falta el pool)
+    seconds: float = 0.0
+    parsed: dict[str, float] = field(default_factory=dict)  # "archivo:hoja" → segundos en su proceso
+    errors: dict[str, str] = field(default_factory=dict)  # se reintentan en serie al cargar
+
+    @property
+    def cpu_seconds(self) -> float:
+        return sum(self.parsed.values())
+
+
+def prefetch(sources: Iterable, workers: int | None = None) -> PrefetchReport:
+    """Parsea en paralelo las fuentes sin Parquet al día; no devuelve frames (ver :func:`load_many`)."""
+    report = PrefetchReport()
+    if not HAS_PYARROW:  # sin Parquet intermedio no hay cómo pasar el resultado barato
+        return report
+    pending = [(p, s) for p, s in expand(sources) if not is_cached(p, _cache_key(p, s))]
+    workers = min(workers or default_workers(), len(pending))
+    if workers < 2 or sum(p.stat().st_size for p in {p for p, _ in pending}) < parallel_threshold():
+        return report
+
+    report.workers = workers
+    t0 = time.perf_counter()
+    with metrics.span("parallel.prefetch"):
+        # spawn: el proceso de Streamlit tiene threads, fork podría heredar locks tomados
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            futures = {pool.submit(_parse, str(p), s): f"{p.name}:{s}" for p, s in pending}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    report.parsed[name] = future.result()
+                except Exception as e:
+                    report.errors[name] = f"{type(e).__name__}: {e}"
+    report.seconds = time.perf_counter() - t0
+    metrics.count("parallel.parsed", len(report.parsed))
+    return report
+
+
+def load_many(sources: Iterable, workers: int | None = None) -> list[pd.DataFrame]:
+    """Frames canónicos de ``sources`` (ver :func:`expand`), parseando en paralelo lo que falte."""
+    sources = expand(sources)
+    prefetch(sources, workers)
+    return [load_budget(p, sheet_name=s) for p, s in sources]
+
+
+def concat(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """Concatena frames canónicos sin perder las categóricas (unión de categorías)."""
+    if not frames:
+        return pd.DataFrame({c: pd.Series(dtype=t) for c, t in FRAME_DTYPES.items()})
+    out = {}
+    for col, dtype in FRAME_DTYPES.items():
+        parts = [f[col] for f in frames]
+        if dtype == "category":
+            out[col] = pd.Series(union_categoricals(parts))
+        else:
+            out[col] = pd.concat(parts, ignore_index=True).astype(dtype)
+    return pd.DataFrame(out)
+
+
+def load_combined(sources: Iterable, workers: int | None = None) -> pd.DataFrame:
+    """Un frame canónico con las filas de todas las fuentes (por ejemplo, un workbook por año).
+
+    Cacheado por la combinación de versiones; ``attrs["sources"]`` dice de
+    dónde salió cada tramo de filas.
+    """
+    sources = expand(sources)
+    frames = load_many(sources, workers)
+    parts = [
+        {"source": p.name, "sheet": s, "version": f.attrs.get("version"), "rows": len(f)}
+        for (p, s), f in zip(sources, frames)
+    ]
+    version = None
+    if all(part["version"] for part in parts):
+        raw = "|".join(f"{part['source']}:{part['sheet']}:{part['version']}" for part in parts)
+        version = hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+    def build() -> pd.DataFrame:
+        df = concat(frames)
+        df.attrs["version"] = version
+        df.attrs["source"] = "+".join(dict.fromkeys(part["source"] for part in parts))
+        df.attrs["sources"] = parts
+        df.attrs["missing_columns"] = sorted({c for f in frames for c in f.attrs.get("missing_columns", [])})
+        return df
+
+    return artifacts.get_or_build(version, "combined", build)
@@ -0,0 +1,109 @@
+"""Payload compacto para los dashboards React embebidos.
+
+El modo ``records`` (el original) repite cada nombre de columna en cada fila
+y convierte los NaN en ``""``. El modo ``columnar`` manda una lista por
+columna, con ``seccion``/``categoria`` codificadas por diccionario y los
+montos como enteros; ``columnar+gzip`` además comprime el JSON (gzip +
+base64) para páginas grandes.
+
+Del lado del browser, :data:`JS_DECODER` reconstruye ``records`` con la
+misma forma que el modo original, así el resto del dashboard no cambia.
+
+Los montos viajan como números JSON: en JS son exactos hasta 2**53 (≈ 9e15 Gs),
+muy por encima de cualquier rubro del PGN.
+"""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import json
+
+import pandas as pd
+
+from .data import SCHEMA, to_records
+
+COLUMNAR_FORMAT = "pgn-columnar/1"
+DICT_COLUMNS = ("seccion", "categoria")
+MODES = ("records", "columnar", "columnar+gzip")
+
+
+def _values(s: pd.Series) -> list:
+    # nativos de Python, NaN/NA → None
+    return s.astype(object).where(s.notna(), None).tolist()
+
+
+def encode_columns(df: pd.DataFrame) -> dict:
+    columns = {}
+    for col in df.columns:
+        s = df[col]
+        if col in DICT_COLUMNS:
+            codes, uniques = pd.factorize(s, use_na_sentinel=True)
+            columns[col] = {"dict": [str(u) for u in uniques], "codes": codes.tolist()}
+        else:
+            columns[col] = {"values": _values(s)}
+    return {"format": COLUMNAR_FORMAT, "n": int(len(df)), "columns": columns}
+
+
+def build_payload(df: pd.DataFrame, mode: str = "columnar", **extra) -> dict:
+    """Payload del dashboard; ``extra`` (rankings, meta, ...) se agrega tal cual."""
+    if mode not in MODES:
+        raise ValueError(f"Modo de payload desconocido: {mode!r} (disponibles: {MODES})")
+    df = df[[c for c in SCHEMA if c in df.columns]]  # las claves internas (nivel, entidad) no viajan
+    if mode == "records":
+        return {"records": to_records(df), **extra}
+
+    body = encode_columns(df)
+    if mode == "columnar":
+        return {**body, **extra}
+
+    raw = json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    packed = base64.b64encode(gzip.compress(raw, mtime=0)).decode("ascii")
+    return {"format": COLUMNAR_FORMAT, "encoding": "gzip+base64", "data": packed, **extra}
+
+
+def to_script_json(payload: dict) -> str:
+    # JSON para incrustar en <script>: compacto y sin "</" (cerraría el tag)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+
+
+# Decoder JS (sin dependencias). decodePgnPayload es síncrono para
+# records/columnar; loadPgnPayload (async) soporta además gzip+base64.
+JS_DECODER = r"""
+function decodePgnColumns(p) {
+  if (!p || p.format !== "pgn-columnar/1" || !p.columns) return p;
+  const names = Object.keys(p.columns);
+  const arrays = names.map(function (k) {
+    const c = p.columns[k];
+    return c.dict ? c.codes.map(function (i) { return i < 0 ? null : c.dict[i]; }) : c.values;
+  });
+  const records = new Array(p.n);
+  for (let i = 0; i < p.n; i++) {
+    const r = {};
+    for (let j = 0; j < names.length; j++) {
+      const v = arrays[j][i];
+      r[names[j]] = v === null ? "" : v;  // misma forma que el modo records
+    }
+    records[i] = r;
+  }
+  const out = Object.assign({}, p, { records: records });
+  delete out.columns;
+  return out;
+}
+
+function decodePgnPayload(p) {
+  if (p && p.encoding === "gzip+base64") throw new Error("payload comprimido: usar loadPgnPayload");
+  return decodePgnColumns(p);
+}
+
+async function loadPgnPayload(p) {
+  if (!p || p.encoding !== "gzip+base64") return decodePgnColumns(p);
+  const bin = Uint8Array.from(atob(p.data), function (ch) { return ch.charCodeAt(0); });
+  const stream = new Blob([bin]).stream().pipeThrough(new DecompressionStream("gzip"));
+  const body = JSON.parse(await new Response(stream).text());
+  const rest = Object.assign({}, p);
+  delete rest.data;
+  delete rest.encoding;
+  return decodePgnColumns(Object.assign(rest, body));
+}
+"""
@@ -0,0 +1,83 @@
+"""Índice de rankings precalculado por versión del dataset.
+
+En vez de ordenar todo el frame en cada rerun (o todo ``records`` en el
+browser), se guardan una vez las posiciones de fila ya ordenadas para cada
+ranking; un Top-N es entonces ``order[:n]``.
+
+Rankings disponibles (ver :data:`RANKINGS`):
+
+- ``monto_2026``: mayor monto 2026 primero.
+- ``var_pos``: variación % positiva, de mayor a menor.
+- ``var_neg``: variación % negativa, de menor (más negativa) a mayor.
+
+Los empates se resuelven por orden de fila, igual que un sort estable.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .artifacts import memoize
+
+# nombre → (columna, descendente, filtro)
+RANKINGS = {
+    "monto_2026": ("monto_2026", True, None),
+    "var_pos": ("variacion_pct", True, "pos"),
+    "var_neg": ("variacion_pct", False, "neg"),
+}
+
+
+@dataclass(frozen=True)
+class RankingIndex:
+    version: str | None
+    orders: dict[str, np.ndarray]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(order.nbytes for order in self.orders.values())
+
+    def top(self, name: str, n: int | None = None) -> np.ndarray:
+        """Posiciones de fila (para ``iloc``) del Top-``n`` del ranking ``name``."""
+        return self.orders[name][:n]
+
+    def to_payload(self) -> dict[str, list[int]]:
+        # Formato que consume el JS: índices dentro de ``records``
+        return {name: order.tolist() for name, order in self.orders.items()}
+
+
+def order_positions(values: np.ndarray, descending: bool, limit: int | None = None) -> np.ndarray:
+    """Posiciones de ``values`` ordenadas (estable); sólo las primeras ``limit`` si se pide.
+
+    Con ``limit`` se usa ``np.partition`` para quedarse con los candidatos en
+    O(n) y se ordenan sólo ésos (semántica de ``nlargest(keep="first")``).
+    """
+    key = -values if descending else values
+    if limit is None or limit >= len(key):
+        return np.argsort(key, kind="stable")
+    if limit <= 0:
+        return np.empty(0, dtype=np.intp)
+    kth = np.partition(key, limit - 1)[limit - 1]
+    cand = np.flatnonzero(key <= kth)
+    return cand[np.argsort(key[cand], kind="stable")][:limit]
+
+
+def build_rankings(df: pd.DataFrame, limit: int | None = None) -> RankingIndex:
+    orders = {}
+    for name, (col, descending, sign) in RANKINGS.items():
+        values = df[col].to_numpy(dtype="float64", na_value=np.nan)
+        if sign is None:
+            pos = np.flatnonzero(~np.isnan(values))
+        elif sign == "pos":
+            pos = np.flatnonzero(values > 0)
+        else:
+            pos = np.flatnonzero(values < 0)
+        orders[name] = pos[order_positions(values[pos], descending, limit)]
+    return RankingIndex(version=df.attrs.get("version"), orders=orders)
+
+
+def get_rankings(df: pd.DataFrame) -> RankingIndex:
+    """Índice del frame canónico, construido una vez por versión del dataset."""
+    return memoize(df, "rankings", lambda: build_rankings(df))
@@ -0,0 +1,189 @@
+"""Comparación entre revisiones del Excel (``presup_py.xlsx`` → ``_v2`` → ``_v3``).
+
+Las N revisiones se alinean una sola vez en un :class:`RevisionSet`: una fila
+por clave (``codigo`` y, si un código se repite, número de aparición) y una
+columna por revisión, con la posición de fila en cada una (-1 si no está),
+montos, puesto en el ranking de monto 2026 y nombre (código en
+:attr:`RevisionSet.names`). Armarlo es un ``factorize`` sobre los códigos de
+todas las revisiones; los frames salen de :func:`pgn.data.load_budget`, que
+ya los tiene en memoria (o en el Parquet de :mod:`pgn.cache`; los que falten
+se parsean en paralelo, :mod:`pgn.parallel`).
+
+"¿Qué cambió entre v2 y v3?" (:meth:`RevisionSet.compare`) son operaciones
+vectorizadas sobre dos columnas de esas matrices: diferencias por fila,
+cambios de puesto, filas nuevas, eliminadas y renombradas. Cada comparación se
+guarda en :mod:`pgn.artifacts` por par de versiones (:func:`compare`).
+
+``PGN_REVISIONS`` (rutas separadas por ``os.pathsep``) reemplaza la lista de
+revisiones del repo (:data:`REVISION_FILES`).
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .artifacts import artifacts
+from .data import DEFAULT_WORKBOOK, ROOT, row_keys
+from .parallel import load_many
+from .rankings import get_rankings
+
+# de la más vieja a la más nueva
+REVISION_FILES = ("presup_py.xlsx", "presup_py_v2.xlsx", "presup_py_v3.xlsx")
+STATES = ("nuevo", "eliminado", "modificado", "renombrado", "sin cambios")
+
+
+def available(default=DEFAULT_WORKBOOK) -> dict[str, Path]:
+    """Revisiones disponibles (nombre → ruta), de la más vieja a la más nueva.
+
+    El Excel de las apps (``PGN_WORKBOOK``) se agrega al final si no es una de ellas.
+    """
+    env = os.environ.get("PGN_REVISIONS")
+    paths = [Path(p) for p in env.split(os.pathsep) if p] if env else [ROOT / f for f in REVISION_FILES]
+    paths = [p.resolve() for p in paths if p.exists()]
+    default = Path(default).resolve()
+    if default.exists() and default not in paths:
+        paths.append(default)
+    return {p.stem: p for p in paths}
+
+
+@dataclass(frozen=True)
+class RevisionSet:
+    labels: list[str]
+    versions: list[str | None]
+    codigo: np.ndarray  # (K,) código de cada clave
+    rows: np.ndarray  # (K, N) posición de fila en cada revisión; -1 = no está
+    monto_2025: np.ndarray  # (K, N) float, NaN donde no está
+    monto_2026: np.ndarray
+    rank_2026: np.ndarray  # (K, N) puesto en el ranking de monto 2026 (1 = mayor); 0 = no está
+    item: np.ndarray  # (K, N) código en ``names``; -1 = no está
+    names: np.ndarray  # nombres distintos (Item_2026, o Item_2025 si no hay)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.rows, self.monto_2025, self.monto_2026, self.rank_2026, self.item)
+        return int(sum(a.nbytes for a in arrays) + sum(len(str(n)) for n in self.names) + len(self.codigo) * 8)
+
+    def __len__(self) -> int:
+        return len(self.codigo)
+
+    def index(self, label) -> int:
+        return label if isinstance(label, int) else self.labels.index(label)
+
+    def compare(self, a, b) -> pd.DataFrame:
+        """Una fila por clave que cambió de ``a`` a ``b``, de la que más se movió a la que menos.
+
+        Columnas: código, nombre (y el anterior si cambió), montos 2026 en las
+        dos revisiones, diferencia, variación %, puestos en el ranking y
+        ``estado`` (:data:`STATES`, salvo "sin cambios").
+        """
+        a, b = self.index(a), self.index(b)
+        in_a, in_b = self.rows[:, a] >= 0, self.rows[:, b] >= 0
+        m_a, m_b = self.monto_2026[:, a], self.monto_2026[:, b]
+        amounts = (m_a != m_b) | (self.monto_2025[:, a] != self.monto_2025[:, b])
+        renamed = self.item[:, a] != self.item[:, b]
+        estado = np.select(
+            [in_b & ~in_a, in_a & ~in_b, in_a & in_b & amounts, in_a & in_b & renamed],
+            list(STATES[:4]),
+            default=STATES[4],
+        )
+        keep = np.flatnonzero(estado != STATES[4])
+        before = np.nan_to_num(m_a[keep])
+        after = np.nan_to_num(m_b[keep])
+        diff = after - before
+        item_a, item_b = self.item[keep, a], self.item[keep, b]
+        names = np.append(self.names, None)  # código -1 → None
+        rank_a, rank_b = self.rank_2026[keep, a], self.rank_2026[keep, b]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct = np.where(before > 0, (after / before - 1.0) * 100.0, np.nan)
+        table = pd.DataFrame({
+            "codigo": self.codigo[keep],
+            "item": names[np.where(item_b >= 0, item_b, item_a)],
+            "item_antes": np.where(renamed[keep] & (item_a >= 0) & (item_b >= 0), names[item_a], None),
+            "monto_2026_antes": before.astype(np.int64),
+            "monto_2026_despues": after.astype(np.int64),
+            "diferencia": diff.astype(np.int64),
+            "variacion_pct": pct,
+            "puesto_antes": rank_a,
+            "puesto_despues": rank_b,
+            # positivo = subió en el ranking; 0 si falta en alguna de las dos
+            "cambio_puesto": np.where((rank_a > 0) & (rank_b > 0), rank_a - rank_b, 0),
+            "estado": pd.Categorical(estado[keep], categories=STATES),
+        })
+        order = np.lexsort((keep, -np.abs(diff)))
+        return table.iloc[order].reset_index(drop=True)
+
+
+def align(frames: list[pd.DataFrame], labels: list[str]) -> RevisionSet:
+    """Alinea las revisiones por ``codigo`` (y número de aparición) en un :class:`RevisionSet`."""
+    n = len(frames)
+    sizes = [len(f) for f in frames]
+    bounds = np.cumsum([0, *sizes])
+    key_ids, keys = pd.factorize(np.concatenate(row_keys(*frames)))  # orden: primera aparición
+    k = len(keys)
+    codigo = pd.concat([f["codigo"] for f in frames], ignore_index=True).astype("string").fillna("")
+    first = np.unique(key_ids, return_index=True)[1]  # primera fila de cada clave
+
+    names_all = pd.concat(
+        [f["item_2026"].astype("string").fillna(f["item_2025"].astype("string")) for f in frames], ignore_index=True
+    )
+    name_ids, names = pd.factorize(names_all)  # NA → -1
+
+    rows = np.full((k, n), -1, dtype=np.intp)
+    item = np.full((k, n), -1, dtype=np.int32)
+    m25 = np.full((k, n), np.nan)
+    m26 = np.full((k, n), np.nan)
+    rank = np.zeros((k, n), dtype=np.int32)
+    for r, (f, lo, hi) in enumerate(zip(frames, bounds[:-1], bounds[1:])):
+        at = key_ids[lo:hi]
+        rows[at, r] = np.arange(len(f))
+        item[at, r] = name_ids[lo:hi]
+        m25[at, r] = f["monto_2025"].to_numpy(dtype="float64")
+        m26[at, r] = f["monto_2026"].to_numpy(dtype="float64")
+        order = get_rankings(f).orders["monto_2026"]
+        puesto = np.zeros(len(f), dtype=np.int32)
+        puesto[order] = np.arange(1, len(order) + 1)
+        rank[at, r] = puesto
+    return RevisionSet(
+        labels=list(labels),
+        versions=[f.attrs.get("version") for f in frames],
+        codigo=codigo.to_numpy(dtype=object)[first],
+        rows=rows,
+        monto_2025=m25,
+        monto_2026=m26,
+        rank_2026=rank,
+        item=item,
+        names=np.asarray(names, dtype=object),
+    )
+
+
+def load_revisions(revisions: dict[str, Path] | None = None) -> RevisionSet:
+    """Revisiones alineadas, cacheadas por la combinación de versiones (ver :func:`available`)."""
+    revisions = available() if revisions is None else revisions
+    frames = load_many(revisions.values())  # las que no tengan Parquet se parsean en paralelo
+    versions = [f.attrs.get("version") for f in frames]
+    cacheable = all(versions)
+    key = "revisions:" + ":".join(f"{label}={v}" for label, v in zip(revisions, versions))
+    return artifacts.get_or_build(
+        versions[-1] if cacheable and versions else None, key, lambda: align(frames, list(revisions))
+    )
+
+
+def compare(revs: RevisionSet, a, b) -> pd.DataFrame:
+    """:meth:`RevisionSet.compare` cacheado por par de versiones (bajo la versión de ``b``)."""
+    ia, ib = revs.index(a), revs.index(b)
+    va, vb = revs.versions[ia], revs.versions[ib]
+    return artifacts.get_or_build(vb if va and vb else None, f"revdiff:{va}", lambda: revs.compare(ia, ib))
+
+
+def summary(table: pd.DataFrame) -> dict:
+    """Conteos por estado y diferencia total de monto 2026 de una comparación."""
+    counts = table["estado"].value_counts()
+    return {
+        **{state: int(counts.get(state, 0)) for state in STATES[:4]},
+        "diferencia_2026": int(table["diferencia"].sum()),
+    }
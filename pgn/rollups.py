@@ -0,0 +1,138 @@
+"""Cubo de totales por la jerarquía institucional: Sección → Categoría → Entidad.
+
+Un solo ``groupby`` sobre las filas arma la tabla de hojas (una por entidad,
+con las claves ``nivel``/``entidad`` que :mod:`pgn.data` parsea de
+``Código``); los niveles de arriba se suman desde esas hojas, que son pocas.
+Para cada nodo quedan montos 2025/2026, cantidad de ítems, variación % y
+participación sobre el padre y sobre el total.
+
+El cubo se guarda por versión del dataset (:func:`get_cube`); un drill-down
+(:meth:`RollupCube.children`) es un lookup en el índice de hijos, sin volver
+a recorrer las filas.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .artifacts import memoize
+from .data import AMOUNT_COLUMNS, entity_code
+
+LEVELS = ("seccion", "categoria", "entidad")
+TOTAL_LABEL = "Total PGN"
+# Celdas vacías de Sección/Categoría: sin etiqueta la hoja no tendría padre
+MISSING_LABELS = {"seccion": "(sin sección)", "categoria": "(sin categoría)"}
+
+
+def fill_missing(values, level: str) -> np.ndarray:
+    """Claves de ``level`` como objetos, con la etiqueta de :data:`MISSING_LABELS` donde falta."""
+    values = pd.Series(values).astype(object)
+    return values.where(values.notna(), MISSING_LABELS[level]).to_numpy()
+
+
+def _pct(num, den) -> np.ndarray:
+    num, den = np.asarray(num, dtype=float), np.asarray(den, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(den > 0, num / den * 100.0, np.nan)
+
+
+@dataclass(frozen=True)
+class RollupCube:
+    version: str | None
+    table: pd.DataFrame  # un nodo por fila; ``parent`` = posición del padre (-1 en la raíz)
+    index: dict[tuple, int]  # camino (seccion, categoria, entidad) → posición
+    children_of: dict[int, np.ndarray]  # posición → hijos, ya ordenados por monto 2026
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.table.memory_usage(deep=True).sum() + sum(c.nbytes for c in self.children_of.values()))
+
+    def node(self, path: tuple = ()) -> pd.Series:
+        return self.table.iloc[self.index[tuple(path)]]
+
+    def children(self, path: tuple = ()) -> pd.DataFrame:
+        """Hijos del nodo ``path`` (``()`` = total), de mayor a menor monto 2026."""
+        return self.table.iloc[self.children_of.get(self.index[tuple(path)], np.empty(0, dtype=np.intp))]
+
+    def level(self, name: str) -> pd.DataFrame:
+        return self.table[self.table["level"] == name]
+
+    def leaves(self) -> pd.DataFrame:
+        """Tabla de hojas en el formato de :func:`assemble`."""
+        return self.level("entidad")[[*LEVELS, "nombre", "monto_2025", "monto_2026", "items"]].reset_index(drop=True)
+
+
+def _leaves(df: pd.DataFrame) -> pd.DataFrame:
+    frame = df[["seccion", "categoria", "nivel", "entidad", *AMOUNT_COLUMNS, "item_2025", "item_2026"]]
+    leaves = frame.groupby(["seccion", "categoria", "nivel", "entidad"], observed=True, sort=False, dropna=False).agg(
+        monto_2025=("monto_2025", "sum"),
+        monto_2026=("monto_2026", "sum"),
+        items=("monto_2026", "size"),
+        item_2025=("item_2025", "first"),
+        item_2026=("item_2026", "first"),
+    ).reset_index()
+    # nombre de la entidad: primer ítem (los sintéticos son "ENTIDAD / PROG n / PROY m")
+    names = leaves.pop("item_2026").astype("string").fillna(leaves.pop("item_2025").astype("string"))
+    leaves["nombre"] = names.str.split(" / ", n=1).str[0]
+    leaves["entidad"] = [entity_code(n, e) for n, e in zip(leaves.pop("nivel"), leaves["entidad"])]
+    for level in MISSING_LABELS:
+        leaves[level] = fill_missing(leaves[level], level)
+    return leaves
+
+
+def build_cube(df: pd.DataFrame) -> RollupCube:
+    return assemble(_leaves(df), df.attrs.get("version"))
+
+
+def assemble(leaves: pd.DataFrame, version: str | None) -> RollupCube:
+    """Cubo desde la tabla de hojas (seccion, categoria, entidad, nombre, montos, items).
+
+    Sólo recorre las hojas, no las filas: :mod:`pgn.delta` lo usa para
+    actualizar el cubo sumando lo que cambió en cada hoja.
+    """
+    sums = ["monto_2025", "monto_2026", "items"]
+    parts = [pd.DataFrame({"level": ["total"], "nombre": [TOTAL_LABEL], **{c: [leaves[c].sum()] for c in sums}})]
+    for depth, level in enumerate(LEVELS[:-1], start=1):
+        keys = list(LEVELS[:depth])
+        agg = leaves.groupby(keys, observed=True, sort=False)[sums].sum().reset_index()
+        agg["nombre"] = agg[level].astype(str)
+        parts.append(agg.assign(level=level))
+    parts.append(leaves.assign(level="entidad"))
+
+    table = pd.concat(parts, ignore_index=True)
+    for col in LEVELS:  # None en los niveles de arriba (el total no tiene sección, etc.)
+        table[col] = table[col].astype(object).where(table[col].notna(), None)
+    table = table[["level", *LEVELS, "nombre", *sums]]
+    for col in sums:
+        table[col] = table[col].astype("int64")
+
+    # índice de caminos y padres
+    paths = [
+        tuple(v for v in row[: LEVELS.index(lvl) + 1]) if lvl != "total" else ()
+        for lvl, row in zip(table["level"], table[list(LEVELS)].itertuples(index=False, name=None))
+    ]
+    index = {path: i for i, path in enumerate(paths)}
+    parent = np.array([index[p[:-1]] if p else -1 for p in paths], dtype=np.intp)
+    table["parent"] = parent
+
+    total = table.loc[0, "monto_2026"]
+    table["variacion_pct"] = _pct(table["monto_2026"], table["monto_2025"]) - 100.0
+    table["share_parent_pct"] = _pct(table["monto_2026"], np.where(parent >= 0, table["monto_2026"].to_numpy()[parent], total))
+    table["share_total_pct"] = _pct(table["monto_2026"], np.full(len(table), total))
+
+    order = np.lexsort((-table["monto_2026"].to_numpy(), parent))  # por padre, mayor monto primero
+    children_of = {}
+    ordered_parents = parent[order]
+    bounds = np.flatnonzero(np.diff(ordered_parents)) + 1
+    for chunk in np.split(order, bounds):
+        if len(chunk) and parent[chunk[0]] >= 0:
+            children_of[int(parent[chunk[0]])] = chunk
+    return RollupCube(version=version, table=table, index=index, children_of=children_of)
+
+
+def get_cube(df: pd.DataFrame) -> RollupCube:
+    """Cubo del frame canónico, construido una vez por versión del dataset."""
+    return memoize(df, "rollups", lambda: build_cube(df))
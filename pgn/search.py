@@ -0,0 +1,244 @@
+"""Búsqueda de organismos por nombre o código: sin acentos, por prefijo y aproximada.
+
+El índice se arma una vez por versión del dataset (:func:`get_index`) sobre los
+textos distintos de ``item_2025``/``item_2026``/``codigo`` (normalizados como
+:func:`normalize_name`), y cada texto apunta a las filas donde aparece:
+
+- palabras ordenadas: "salud pub" encuentra "MINISTERIO DE SALUD PÚBLICA"
+  (cada palabra de la consulta es prefijo de alguna palabra, en cualquier
+  orden) con dos ``bisect`` por palabra;
+- textos ordenados: coincidencia exacta y prefijo del nombre completo;
+- trigramas → textos: "minsterio salud" también encuentra el ministerio
+  (proporción de trigramas de la consulta presentes en el texto).
+
+Una consulta no recorre las filas: son búsquedas binarias y un ``bincount``
+sobre las listas de trigramas. Los dashboards embebidos reciben el índice ya
+armado (:meth:`SearchIndex.to_payload`) y consultan con :data:`JS_SEARCH`, que
+puntúa igual.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .artifacts import memoize
+
+SEARCH_COLUMNS = ["item_2025", "item_2026", "codigo"]
+MIN_SIMILARITY = 0.5  # proporción mínima de trigramas de la consulta para la búsqueda aproximada
+# Puntaje: nivel de coincidencia + similitud (0–1) para ordenar dentro del nivel
+EXACT, PREFIX, WORDS = 3.0, 2.0, 1.0
+_END = "\uffff"  # mayor que cualquier carácter de un texto: [q, q + _END) = textos con prefijo q
+
+
+def normalize_name(name: str) -> str:
+    # igual que norm() del frontend: sin acentos, minúsculas, espacios simples
+    text = unicodedata.normalize("NFD", str(name))
+    return " ".join("".join(c for c in text if not unicodedata.combining(c)).lower().split())
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    texts: list[str]  # textos normalizados distintos
+    docs: list[np.ndarray]  # por texto: documentos (filas) donde aparece, ordenados
+    sorted_texts: list[str]  # textos ordenados (para bisect)
+    text_order: np.ndarray  # posición en ``texts`` de cada ``sorted_texts``
+    tokens: list[str]  # palabras de todos los textos, ordenadas
+    token_text: np.ndarray  # texto de cada palabra
+    trigrams: dict[str, np.ndarray]  # trigrama → textos que lo contienen
+    lengths: np.ndarray  # largo de cada texto (desempate: el más corto primero)
+
+    @property
+    def nbytes(self) -> int:
+        strings = sum(len(t) for t in self.texts) * 3 + sum(len(t) for t in self.tokens)
+        arrays = sum(d.nbytes for d in self.docs) + sum(a.nbytes for a in self.trigrams.values())
+        return int(strings + arrays + self.token_text.nbytes + self.text_order.nbytes + self.lengths.nbytes)
+
+    def _range(self, keys: list[str], prefix: str) -> tuple[int, int]:
+        return bisect_left(keys, prefix), bisect_left(keys, prefix + _END)
+
+    def scores(self, query: str) -> np.ndarray:
+        """Puntaje de cada texto para ``query`` (0 = no coincide)."""
+        q = normalize_name(query)
+        scores = np.zeros(len(self.texts))
+        if not q:
+            return scores
+        grams = _trigrams(q)
+        hits = [self.trigrams[g] for g in grams if g in self.trigrams]
+        similarity = (
+            np.bincount(np.concatenate(hits), minlength=len(self.texts)) / len(grams) if hits else scores.copy()
+        )
+        scores = np.where(similarity >= MIN_SIMILARITY, similarity, 0.0)
+
+        common = np.ones(len(self.texts), dtype=bool)
+        for word in q.split():
+            lo, hi = self._range(self.tokens, word)
+            has_word = np.zeros(len(self.texts), dtype=bool)
+            has_word[self.token_text[lo:hi]] = True
+            common &= has_word
+        scores[common] = WORDS + similarity[common]
+
+        lo, hi = self._range(self.sorted_texts, q)
+        prefix = self.text_order[lo:hi]
+        scores[prefix] = PREFIX + similarity[prefix]
+        exact = self.text_order[lo:bisect_right(self.sorted_texts, q, lo, hi)]
+        scores[exact] = EXACT + similarity[exact]
+        return scores
+
+    def search(self, query: str, limit: int | None = 20) -> np.ndarray:
+        """Documentos (posiciones de fila, para ``iloc``) que coinciden, del más relevante al menos."""
+        scores = self.scores(query)
+        matched = np.flatnonzero(scores)
+        ranked = matched[np.lexsort((self.lengths[matched], -scores[matched]))]
+        out, seen = [], set()
+        for t in ranked:
+            for doc in self.docs[t].tolist():
+                if doc not in seen:
+                    seen.add(doc)
+                    out.append(doc)
+            if limit is not None and len(out) >= limit:
+                break
+        return np.asarray(out[:limit], dtype=np.intp)
+
+    def to_payload(self) -> dict:
+        # Lo que consume createSearchIndex (JS_SEARCH); los trigramas se arman allá
+        return {
+            "texts": self.texts,
+            "docs": [d.tolist() for d in self.docs],
+            "sorted": self.text_order.tolist(),
+            "tokens": self.tokens,
+            "token_text": self.token_text.tolist(),
+        }
+
+
+def build_index(columns: list[pd.Series]) -> SearchIndex:
+    """Índice sobre los valores de ``columns``; el documento de cada valor es su posición de fila."""
+    ids: dict[str, int] = {}
+    text_parts, doc_parts = [], []
+    for col in columns:
+        # se normalizan los valores distintos, no fila por fila
+        values = col if isinstance(col.dtype, pd.CategoricalDtype) else col.astype("category")
+        codes = values.cat.codes.to_numpy()
+        norm = [normalize_name(c) for c in values.cat.categories]
+        cat_ids = np.array([ids.setdefault(n, len(ids)) if n else -1 for n in norm] + [-1], dtype=np.int64)
+        text_ids = cat_ids[codes]  # código -1 (NA) → último elemento → -1
+        keep = text_ids >= 0
+        text_parts.append(text_ids[keep])
+        doc_parts.append(np.flatnonzero(keep))
+    texts = list(ids)
+    t = np.concatenate(text_parts) if text_parts else np.empty(0, np.int64)
+    d = np.concatenate(doc_parts) if doc_parts else np.empty(0, np.int64)
+    pairs = np.unique(np.stack([t, d], axis=1), axis=0) if len(t) else np.empty((0, 2), np.int64)
+    bounds = np.searchsorted(pairs[:, 0], np.arange(len(texts) + 1))
+    docs = [pairs[bounds[i]:bounds[i + 1], 1].astype(np.int32) for i in range(len(texts))]
+
+    text_order = np.array(sorted(range(len(texts)), key=texts.__getitem__), dtype=np.int32)
+    words = sorted((w, i) for i, text in enumerate(texts) for w in set(text.split()))
+    grams: dict[str, list[int]] = {}
+    for i, text in enumerate(texts):
+        for g in _trigrams(text):
+            grams.setdefault(g, []).append(i)
+    return SearchIndex(
+        texts=texts,
+        docs=docs,
+        sorted_texts=[texts[i] for i in text_order],
+        text_order=text_order,
+        tokens=[w for w, _ in words],
+        token_text=np.array([i for _, i in words], dtype=np.int32),
+        trigrams={g: np.array(v, dtype=np.int32) for g, v in grams.items()},
+        lengths=np.array([len(t) for t in texts], dtype=np.int32),
+    )
+
+
+def get_index(df: pd.DataFrame) -> SearchIndex:
+    """Índice de ítems y códigos del frame canónico, construido una vez por versión."""
+    return memoize(df, "search", lambda: build_index([df[c] for c in SEARCH_COLUMNS]))
+
+
+# Cliente JS (sin dependencias): misma normalización y mismo puntaje que
+# SearchIndex.scores, sobre el payload de to_payload().
+JS_SEARCH = r"""
+function normalizeName(s) {
+  return String(s == null ? "" : s).normalize("NFD").replace(/[\u0300-\u036f]/g, "")
+    .toLowerCase().split(/\s+/).filter(Boolean).join(" ");
+}
+
+function createSearchIndex(p) {
+  p = p || {};
+  const texts = p.texts || [];
+  const docs = p.docs || [];
+  const sorted = (p.sorted || []).map(function (i) { return texts[i]; });
+  const tokens = p.tokens || [];
+  const tokenText = p.token_text || [];
+  const END = "\uffff";
+  function trigrams(text) {
+    const padded = " " + text + " ";
+    const out = new Set();
+    for (let i = 0; i + 3 <= padded.length; i++) out.add(padded.slice(i, i + 3));
+    return out;
+  }
+  const grams = new Map();
+  texts.forEach(function (text, i) {
+    trigrams(text).forEach(function (g) {
+      if (!grams.has(g)) grams.set(g, []);
+      grams.get(g).push(i);
+    });
+  });
+  function lower(keys, x) {
+    let lo = 0, hi = keys.length;
+    while (lo < hi) { const mid = (lo + hi) >> 1; if (keys[mid] < x) lo = mid + 1; else hi = mid; }
+    return lo;
+  }
+  function scores(query) {
+    const q = normalizeName(query);
+    const out = new Float64Array(texts.length);
+    if (!q) return out;
+    const qg = trigrams(q);
+    const sim = new Float64Array(texts.length);
+    qg.forEach(function (g) { (grams.get(g) || []).forEach(function (i) { sim[i] += 1; }); });
+    for (let i = 0; i < sim.length; i++) {
+      sim[i] /= qg.size;
+      out[i] = sim[i] >= __MIN_SIMILARITY__ ? sim[i] : 0;
+    }
+    let common = null;
+    q.split(" ").forEach(function (word) {
+      const ids = new Set();
+      for (let k = lower(tokens, word), hi = lower(tokens, word + END); k < hi; k++) ids.add(tokenText[k]);
+      common = common === null ? ids : new Set([...common].filter(function (i) { return ids.has(i); }));
+    });
+    common.forEach(function (i) { out[i] = __WORDS__ + sim[i]; });
+    for (let k = lower(sorted, q), hi = lower(sorted, q + END); k < hi; k++) {
+      const i = p.sorted[k];
+      out[i] = (sorted[k] === q ? __EXACT__ : __PREFIX__) + sim[i];
+    }
+    return out;
+  }
+  return {
+    size: texts.length,
+    // documentos que coinciden, del más relevante al menos
+    search: function (query, limit) {
+      const s = scores(query);
+      const matched = [];
+      for (let i = 0; i < s.length; i++) if (s[i] > 0) matched.push(i);
+      matched.sort(function (a, b) { return s[b] - s[a] || texts[a].length - texts[b].length || a - b; });
+      const out = [], seen = new Set();
+      for (const t of matched) {
+        for (const d of docs[t] || []) if (!seen.has(d)) { seen.add(d); out.push(d); }
+        if (limit && out.length >= limit) break;
+      }
+      return limit ? out.slice(0, limit) : out;
+    },
+  };
+}
+""".replace("__MIN_SIMILARITY__", str(MIN_SIMILARITY)).replace("__EXACT__", str(EXACT)).replace(
+    "__PREFIX__", str(PREFIX)
+).replace("__WORDS__", str(WORDS))
@@ -0,0 +1,233 @@
+"""Serie multianual del PGN: montos indexados por año, no por par 2025/2026.
+
+El frame canónico (:mod:`pgn.data`) compara dos años fijos. Acá cada fuente se
+lee con todos sus pares ``Item_<año>``/``Monto_<año>`` (los que haya) y queda
+como una matriz ``claves × años`` de int64; agregar un año es cargar otra
+columna u otra fuente, no cambiar código.
+
+- Las variaciones (interanual, entre dos años cualesquiera, CAGR) se calculan
+  vectorizadas sobre las columnas de la matriz: una operación para todos los
+  pares, el costo crece lineal con los años y no con la cantidad de pares.
+- :meth:`BudgetSeries.to_long` / :meth:`BudgetSeries.from_long` pasan a/desde
+  formato largo (una fila por clave y año, como vienen los extractos de
+  SITUFIN); :func:`combine` junta fuentes de años distintos por clave.
+- :func:`load_series` la cachea por versión del dataset (:mod:`pgn.artifacts`).
+  Para fuentes grandes/CSV no se arma la hoja cruda: si sólo trae los años
+  del frame canónico sale de ese frame (sin volver a leer la fuente) y si no
+  cada bloque de :func:`pgn.ingest.iter_raw_chunks` se reduce a su serie y se
+  van juntando (:func:`concat`).
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from .artifacts import artifacts
+from .cache import DEFAULT_SHEET
+from .data import DEFAULT_WORKBOOK, DISPLAY_MAP, RENAME_MAP, dataset_version, load_budget, parse_codigo
+
+YEAR_COLUMN = re.compile(r"^(Item|Monto)_(\d{4})$")
+KEY_COLUMNS = ["seccion", "categoria", "codigo"]
+OBJECT_COLUMN = "objeto"  # desglose por objeto de gasto (datasets sintéticos / SITUFIN)
+
+
+def year_columns(columns: Iterable) -> dict[int, dict[str, str]]:
+    """``{año: {"item": "Item_<año>", "monto": "Monto_<año>"}}`` según las columnas presentes."""
+    years: dict[int, dict[str, str]] = {}
+    for col in columns:
+        m = YEAR_COLUMN.match(str(col))
+        if m:
+            years.setdefault(int(m.group(2)), {})[m.group(1).lower()] = str(col)
+    return {y: cols for y, cols in sorted(years.items()) if "monto" in cols}
+
+
+def _pct(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    # variación % con NaN donde la base es 0 (ítem inexistente ese año)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(den > 0, (num / den - 1.0) * 100.0, np.nan)
+
+
+def _cagr(first: np.ndarray, last: np.ndarray, span: int) -> np.ndarray:
+    # crecimiento anual compuesto % con NaN donde algún extremo no es positivo
+    first, last = np.asarray(first, dtype=float), np.asarray(last, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where((first > 0) & (last > 0), ((last / first) ** (1.0 / span) - 1.0) * 100.0, np.nan)
+
+
+@dataclass(frozen=True)
+class BudgetSeries:
+    keys: pd.DataFrame  # una fila por ítem: seccion, categoria, codigo[, objeto], nivel, entidad, item
+    years: np.ndarray  # años ordenados (int)
+    amounts: np.ndarray  # (len(keys), len(years)) int64; 0 si el ítem no existe ese año
+    present: np.ndarray  # (len(keys), len(years)) bool: el ítem existe ese año
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.keys.memory_usage(deep=True).sum() + self.amounts.nbytes + self.present.nbytes)
+
+    def _idx(self, year: int) -> int:
+        pos = np.searchsorted(self.years, year)
+        if pos == len(self.years) or self.years[pos] != year:
+            raise KeyError(f"Año {year} no está en la serie ({self.years.tolist()})")
+        return int(pos)
+
+    def amount(self, year: int) -> np.ndarray:
+        return self.amounts[:, self._idx(year)]
+
+    def totals(self) -> pd.Series:
+        return pd.Series(self.amounts.sum(axis=0), index=pd.Index(self.years, name="año"), name="monto")
+
+    def yoy(self) -> pd.DataFrame:
+        """Variación % interanual de cada ítem, todos los años en una operación."""
+        pct = _pct(self.amounts[:, 1:], self.amounts[:, :-1])
+        names = [f"{a}→{b}" for a, b in zip(self.years[:-1], self.years[1:])]
+        return pd.DataFrame(pct, columns=names, index=self.keys.index)
+
+    def variations(self, pairs: Iterable[tuple[int, int]]) -> pd.DataFrame:
+        """Variación % para pares ``(desde, hasta)`` arbitrarios, todos juntos."""
+        pairs = list(pairs)
+        start = np.array([self._idx(a) for a, _ in pairs], dtype=np.intp)
+        end = np.array([self._idx(b) for _, b in pairs], dtype=np.intp)
+        pct = _pct(self.amounts[:, end], self.amounts[:, start])
+        return pd.DataFrame(pct, columns=[f"{a}→{b}" for a, b in pairs], index=self.keys.index)
+
+    def variation(self, start: int, end: int) -> np.ndarray:
+        return _pct(self.amount(end), self.amount(start))
+
+    def _span(self, start: int | None, end: int | None) -> tuple[int, int]:
+        start = int(self.years[0]) if start is None else start
+        end = int(self.years[-1]) if end is None else end
+        if end <= start:
+            raise ValueError("CAGR necesita end > start")
+        return start, end
+
+    def cagr(self, start: int | None = None, end: int | None = None) -> np.ndarray:
+        """Crecimiento anual compuesto (%) de cada ítem entre ``start`` y ``end`` (por defecto primer/último año)."""
+        start, end = self._span(start, end)
+        return _cagr(self.amount(start), self.amount(end), end - start)
+
+    def total_cagr(self, start: int | None = None, end: int | None = None) -> float:
+        """Crecimiento anual compuesto (%) del total entre ``start`` y ``end``."""
+        start, end = self._span(start, end)
+        totals = self.totals()
+        return float(_cagr(totals[start], totals[end], end - start))
+
+    def summary(self) -> pd.DataFrame:
+        """Totales por año con variación interanual y cantidad de ítems vigentes."""
+        totals = self.totals()
+        out = pd.DataFrame({"monto": totals, "items": self.present.sum(axis=0)})
+        out["variacion_pct"] = np.concatenate([[np.nan], _pct(totals.to_numpy()[1:], totals.to_numpy()[:-1])])
+        return out
+
+    def to_long(self) -> pd.DataFrame:
+        """Formato largo: una fila por (ítem, año) vigente."""
+        n, y = self.amounts.shape
+        row = np.repeat(np.arange(n), y)
+        mask = self.present.ravel()
+        long = self.keys.iloc[row[mask]].reset_index(drop=True)
+        long["anio"] = np.tile(self.years, n)[mask].astype("int16")
+        long["monto"] = self.amounts.ravel()[mask]
+        return long
+
+    @classmethod
+    def from_long(cls, long: pd.DataFrame) -> "BudgetSeries":
+        """Desde formato largo (``anio``, ``monto`` + claves); duplicados: gana el último."""
+        key_cols = [c for c in [*KEY_COLUMNS, OBJECT_COLUMN] if c in long.columns]
+        long = long.drop_duplicates([*key_cols, "anio"], keep="last")
+        codes = long.groupby(key_cols, sort=False, observed=True, dropna=False).ngroup().to_numpy()
+        years, year_idx = np.unique(long["anio"].to_numpy(dtype=np.int64), return_inverse=True)
+        amounts = np.zeros((codes.max() + 1 if len(codes) else 0, len(years)), dtype=np.int64)
+        present = np.zeros(amounts.shape, dtype=bool)
+        amounts[codes, year_idx] = long["monto"].to_numpy(dtype=np.int64)
+        present[codes, year_idx] = True
+        # atributos del ítem: los del año más reciente en que aparece
+        last = long.assign(_code=codes).sort_values("anio", kind="stable").drop_duplicates("_code", keep="last")
+        keys = last.set_index("_code").sort_index()
+        keys = keys[[c for c in keys.columns if c not in ("anio", "monto")]].reset_index(drop=True)
+        return cls(keys=keys, years=years, amounts=amounts, present=present)
+
+    @classmethod
+    def from_frame(cls, raw: pd.DataFrame) -> "BudgetSeries":
+        """Desde la hoja cruda (columnas del Excel), con todos sus años."""
+        by_year = year_columns(raw.columns)
+        if not by_year:
+            raise ValueError("La hoja no tiene columnas Monto_<año>")
+        rename = {k: v for k, v in RENAME_MAP.items() if v in KEY_COLUMNS}
+        rename["Objeto"] = OBJECT_COLUMN
+        keys = raw.rename(columns=rename)
+        key_cols = [c for c in [*KEY_COLUMNS, OBJECT_COLUMN] if c in keys.columns]
+        keys = keys[key_cols].reset_index(drop=True)
+        for col in key_cols:
+            keys[col] = keys[col].astype("category") if col != "codigo" else keys[col].astype("string")
+        keys["nivel"], keys["entidad"] = parse_codigo(keys["codigo"])
+
+        years = np.array(list(by_year), dtype=np.int64)
+        amounts = np.empty((len(raw), len(years)), dtype=np.int64)
+        present = np.empty(amounts.shape, dtype=bool)
+        item = pd.Series(pd.NA, index=keys.index, dtype="object")
+        for j, (year, cols) in enumerate(by_year.items()):
+            monto = pd.to_numeric(raw[cols["monto"]], errors="coerce").fillna(0).to_numpy()
+            amounts[:, j] = np.rint(monto).astype(np.int64)
+            if "item" in cols:
+                names = raw[cols["item"]].reset_index(drop=True)
+                present[:, j] = names.notna().to_numpy()
+                item = names.where(names.notna(), item)  # nombre del año más reciente
+            else:
+                present[:, j] = amounts[:, j] != 0
+        keys["item"] = item.astype("category")
+        return cls(keys=keys, years=years, amounts=amounts, present=present)
+
+
+def combine(*series: BudgetSeries) -> BudgetSeries:
+    """Junta series (p. ej. un Excel por ejercicio) por clave; a igual año gana la última."""
+    return BudgetSeries.from_long(pd.concat([s.to_long() for s in series], ignore_index=True))
+
+
+def concat(parts: list[BudgetSeries]) -> BudgetSeries:
+    """Une series de los mismos años fila a fila (bloques de una misma hoja)."""
+    years = parts[0].years
+    if any(not np.array_equal(p.years, years) for p in parts):
+        raise ValueError("concat necesita los mismos años en todas las partes (ver combine)")
+    keys = {}
+    for col in parts[0].keys.columns:
+        cols = [p.keys[col] for p in parts]
+        if isinstance(cols[0].dtype, pd.CategoricalDtype):
+            keys[col] = pd.Series(union_categoricals(cols))
+        else:
+            keys[col] = pd.concat(cols, ignore_index=True)
+    return BudgetSeries(
+        keys=pd.DataFrame(keys),
+        years=years,
+        amounts=np.concatenate([p.amounts for p in parts]),
+        present=np.concatenate([p.present for p in parts]),
+    )
+
+
+def _build(path: Path, sheet_name: str) -> BudgetSeries:
+    from . import ingest
+    from .cache import HAS_PYARROW, read_excel_cached
+
+    if not (path.suffix.lower() in ingest.STREAM_SUFFIXES or (HAS_PYARROW and ingest.should_stream(path))):
+        return BudgetSeries.from_frame(read_excel_cached(path, sheet_name=sheet_name))
+
+    # fuente grande: nunca la hoja cruda entera en memoria
+    columns = ingest.raw_columns(path, sheet_name)
+    if "Objeto" not in columns and set(year_columns(columns)) <= {2025, 2026}:
+        # los mismos datos que el frame canónico (ya cargado o en su Parquet)
+        df = load_budget(path, sheet_name=sheet_name)
+        return BudgetSeries.from_frame(df.rename(columns=DISPLAY_MAP))
+    return concat([BudgetSeries.from_frame(chunk) for chunk in ingest.iter_raw_chunks(path, sheet_name)])
+
+
+def load_series(path=DEFAULT_WORKBOOK, sheet_name: str = DEFAULT_SHEET) -> BudgetSeries:
+    """Serie multianual de ``path``, cacheada por versión del archivo."""
+    path = Path(path).resolve()
+    version = dataset_version(path, sheet_name)
+    return artifacts.get_or_build(version, f"series:{sheet_name}", lambda: _build(path, sheet_name))
@@ -0,0 +1,215 @@
+"""Datos bajo demanda para los dashboards embebidos (``presup_2``/``presup_3``).
+
+Antes el HTML llevaba el dataset entero (``records`` + rankings) aunque en
+pantalla hay dos tablas de 15 filas. Acá cada vista se publica como JSON
+chicos y versionados en ``static/data/<versión>/<modo>/``, que Streamlit sirve
+en ``/app/static`` (``enableStaticServing``):
+
+- ``rankings/<nombre>/<página>.json``: páginas de :data:`PAGE_SIZE` filas de
+  cada ranking de :mod:`pgn.rankings` (hasta :data:`MAX_RANK_ROWS`), en el
+  formato de ``PGN_PAYLOAD_MODE`` (:mod:`pgn.payload`);
+- ``rollups/<nodo>.json``: un nodo del cubo de :mod:`pgn.rollups` con sus hijos;
+- ``manifest.json``: páginas por ranking, cantidad de archivos y bytes.
+
+El desglose por objeto se publica aparte (:func:`pgn.objects.publish`).
+
+El HTML lleva sólo :func:`bootstrap`: el manifest, la primera página de cada
+ranking, la raíz del cubo y el índice de organismos. :data:`JS_CLIENT` pide lo
+demás al navegar y lo guarda en memoria; como las rutas llevan la versión, el
+browser también puede cachearlas.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+from .artifacts import KEEP_FILES, artifacts
+from .assets import STATIC_DIR, static_url
+from .payload import MODES, build_payload
+from .rankings import RANKINGS, get_rankings
+from .rollups import get_cube
+
+DATA_DIR = STATIC_DIR / "data"
+PAGE_SIZE = 15
+MAX_RANK_ROWS = 150  # las tablas muestran el Top 15; más allá no se publica
+ROLLUP_COLUMNS = ["level", "nombre", "monto_2025", "monto_2026", "variacion_pct", "share_parent_pct", "items"]
+
+
+def _dumps(doc) -> str:
+    return json.dumps(doc, ensure_ascii=False, separators=(",", ":"))
+
+
+def publish_tree(rel: str, files: dict[str, object]) -> Path:
+    """Escribe ``files`` (ruta relativa → documento JSON) en ``static/<rel>`` de una sola vez.
+
+    Carpeta temporal + rename: nunca queda una versión a medio publicar. Si la
+    carpeta ya existe no se toca (el contenido depende sólo de la versión).
+    """
+    target = STATIC_DIR / rel
+    if target.is_dir():
+        return target
+    tmp = target.with_name(f"{target.name}.tmp{os.getpid()}")
+    shutil.rmtree(tmp, ignore_errors=True)
+    for name, doc in files.items():
+        path = tmp / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(_dumps(doc), encoding="utf-8")
+    try:
+        os.replace(tmp, target)
+    except OSError:  # otro proceso la publicó primero
+        shutil.rmtree(tmp, ignore_errors=True)
+    return target
+
+
+def _records(frame: pd.DataFrame) -> list[dict]:
+    out = frame.astype(object).where(frame.notna(), None)
+    return out.to_dict("records")
+
+
+def _rollup_node(cube, pos: int) -> dict:
+    table = cube.table
+    children = cube.children_of.get(pos)
+    rows = table.iloc[children] if children is not None else table.iloc[:0]
+    kids = _records(rows[ROLLUP_COLUMNS])
+    for row, child in zip(kids, rows.index):
+        row["id"] = int(child)
+        row["has_children"] = int(child) in cube.children_of
+    node = _records(table.iloc[[pos]][ROLLUP_COLUMNS])[0]
+    # camino desde la raíz, para el breadcrumb
+    path, cur = [], int(table["parent"].iat[pos])
+    while cur >= 0:
+        path.insert(0, {"id": cur, "nombre": table["nombre"].iat[cur]})
+        cur = int(table["parent"].iat[cur])
+    return {"id": pos, **node, "path": path, "children": kids}
+
+
+def _ranking_pages(df: pd.DataFrame, mode: str) -> dict[str, list[dict]]:
+    rankings = get_rankings(df)
+    pages = {}
+    for name in RANKINGS:
+        order = rankings.top(name, MAX_RANK_ROWS)
+        pages[name] = [
+            build_payload(df.iloc[order[start:start + PAGE_SIZE]], mode, meta={"page": i, "offset": start})
+            for i, start in enumerate(range(0, len(order), PAGE_SIZE))
+        ] or [build_payload(df.iloc[:0], mode, meta={"page": 0, "offset": 0})]
+    return pages
+
+
+def _rel(version: str, mode: str) -> str:
+    return f"data/{version}/{mode}"
+
+
+def publish(df: pd.DataFrame, mode: str = "columnar") -> dict:
+    """Publica las vistas de ``df`` (una vez por versión y modo); devuelve el manifest.
+
+    Memoizado por versión: después de la primera llamada no toca el disco.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Modo de payload desconocido: {mode!r} (disponibles: {MODES})")
+    version = df.attrs.get("version")
+    if version is None:
+        raise ValueError("El frame no tiene versión (df.attrs['version']): no se puede publicar")
+    return artifacts.get_or_build(version, f"service.publish:{mode}", lambda: _publish(df, version, mode))
+
+
+def _publish(df: pd.DataFrame, version: str, mode: str) -> dict:
+    target = STATIC_DIR / _rel(version, mode)
+    manifest_path = target / "manifest.json"
+    if manifest_path.is_file():
+        return json.loads(manifest_path.read_text(encoding="utf-8"))
+
+    files: dict[str, object] = {}
+    pages = _ranking_pages(df, mode)
+    for name, docs in pages.items():
+        for i, doc in enumerate(docs):
+            files[f"rankings/{name}/{i}.json"] = doc
+    cube = get_cube(df)
+    for pos in [0, *cube.children_of]:
+        files[f"rollups/{pos}.json"] = _rollup_node(cube, pos)
+    manifest = {
+        "version": version,
+        "mode": mode,
+        "page_size": PAGE_SIZE,
+        "rankings": {name: {"pages": len(docs), "rows": min(MAX_RANK_ROWS, len(get_rankings(df).top(name)))}
+                     for name, docs in pages.items()},
+        "files": len(files) + 1,
+        "bytes": sum(len(_dumps(doc).encode("utf-8")) for doc in files.values()),
+    }
+    files["manifest.json"] = manifest
+    publish_tree(_rel(version, mode), files)
+    return manifest
+
+
+def _read(version: str, mode: str, name: str):
+    return json.loads((STATIC_DIR / _rel(version, mode) / name).read_text(encoding="utf-8"))
+
+
+def bootstrap(df: pd.DataFrame, mode: str = "columnar", base_url: str = "", objetos: dict | None = None) -> dict:
+    """Lo que va incrustado en el HTML: manifest + primera vista de cada cosa."""
+    manifest = publish(df, mode)
+    version = manifest["version"]
+    return {
+        **manifest,
+        "base": static_url(base_url, _rel(version, mode)) + "/",
+        "initial": {
+            "rankings": {name: _read(version, mode, f"rankings/{name}/0.json") for name in manifest["rankings"]},
+            "rollup": _read(version, mode, "rollups/0.json"),
+        },
+        "objetos": objetos,
+    }
+
+
+def _drop_files(version: str) -> None:
+    shutil.rmtree(DATA_DIR / version, ignore_errors=True)
+
+
+# se conservan las últimas KEEP_FILES versiones descartadas: las páginas ya
+# abiertas siguen pidiendo sus archivos
+artifacts.on_evict(_drop_files, keep=KEEP_FILES)
+
+
+# Cliente JS (sin dependencias; usa loadPgnPayload de pgn.payload y
+# createObjetosStore de pgn.objects). Cada ruta se pide una vez.
+JS_CLIENT = r"""
+function createPgnClient(boot) {
+  boot = boot || {};
+  const cache = new Map();  // ruta → promesa (un pedido por ruta)
+  const done = new Map();   // ruta → valor ya resuelto (para el primer render sin esperar)
+  const initial = boot.initial || {};
+  function remember(rel, req) {
+    req.then(function (v) { done.set(rel, v); }, function () { cache.delete(rel); });
+    cache.set(rel, req);
+    return req;
+  }
+  function get(rel, decode) {
+    if (!cache.has(rel)) {
+      if (!boot.base) return Promise.reject(new Error("datos no publicados (static serving)"));
+      remember(rel, fetch(boot.base + rel)
+        .then(function (r) { if (!r.ok) throw new Error("HTTP " + r.status); return r.json(); })
+        .then(decode || function (x) { return x; }));
+    }
+    return cache.get(rel);
+  }
+  function rankingRel(name, page) { return "rankings/" + name + "/" + page + ".json"; }
+  function rankingRows(p) { return loadPgnPayload(p).then(function (ds) { return ds.records || []; }); }
+  const seeded = Object.keys(initial.rankings || {}).map(function (name) {
+    return remember(rankingRel(name, 0), rankingRows(initial.rankings[name]));
+  });
+  if (initial.rollup) remember("rollups/" + initial.rollup.id + ".json", Promise.resolve(initial.rollup));
+  return {
+    ready: Promise.all(seeded).catch(function () {}),
+    pageSize: boot.page_size || 15,
+    pages: function (name) { return ((boot.rankings || {})[name] || {}).pages || 1; },
+    rankingPage: function (name, page) { return get(rankingRel(name, page), rankingRows); },
+    peekRankingPage: function (name, page) { return done.get(rankingRel(name, page)); },
+    rollup: function (id) { return get("rollups/" + id + ".json"); },
+    rootRollup: initial.rollup || null,
+    objetos: createObjetosStore(boot.objetos),
+  };
+}
+"""
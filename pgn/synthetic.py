@@ -0,0 +1,195 @@
+"""Datasets sintéticos del PGN para pruebas de escala (10^3–10^7 filas).
+
+Los Excel del repo tienen ~107 filas (una por entidad). El generador arma un
+dataset con el mismo formato de columnas (``Sección``, ``Categoría``,
+``Código``, ``Item_<año>``, ``Monto_<año>``, ``Variación %``) pero a nivel
+entidad → programa → proyecto → objeto de gasto (100–900, como en
+``frontend/src/data/organismos_por_objeto.json``) y con varios años.
+
+- Las entidades (sección, categoría, código, nombre y monto del último año)
+  salen del Excel base (``presup_py_v3.xlsx``), así los totales por entidad
+  quedan en el orden de magnitud real.
+- ``Código`` pasa a ser ``<entidad>-<programa>-<proyecto>`` y se agrega la
+  columna ``Objeto``; ``normalize`` las ignora o las lee como antes, así que
+  las apps cargan el archivo sin cambios (vía ``PGN_WORKBOOK``).
+- Se genera por bloques y se escribe con :func:`pgn.exports.write_chunks`:
+  10^7 filas no pasan nunca enteras por memoria. Mismo ``seed`` y
+  ``chunk_rows`` → mismo archivo.
+
+Uso::
+
+    python -m pgn.synthetic 1e5 -o /tmp/pgn_1e5.xlsx /tmp/pgn_1e5.parquet
+    python -m pgn.synthetic 1e7 -o /tmp/pgn_1e7.parquet --years 2019-2026
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from .data import DEFAULT_WORKBOOK
+from .exports import write_chunks
+
+OBJECTS = (100, 200, 300, 400, 500, 600, 700, 800, 900)
+# Participación aproximada de cada objeto en el gasto de una entidad
+OBJECT_WEIGHTS = np.array([0.45, 0.08, 0.07, 0.03, 0.07, 0.03, 0.12, 0.13, 0.02])
+# Objetos que muchas entidades no usan (monto 0): inversión financiera, transferencias, ...
+SPARSE_OBJECTS = {400: 0.4, 600: 0.6, 700: 0.5}
+DEFAULT_YEARS = (2022, 2023, 2024, 2025, 2026)
+NEW_ITEM_RATE = 0.03  # proyectos que existen sólo en el último año ("Item inexistente")
+CHUNK_ROWS = 200_000
+XLSX_MAX_ROWS = 1_048_575  # límite de Excel (sin contar el encabezado)
+SUFFIX_FORMATS = {".csv": "csv", ".xlsx": "xlsx", ".parquet": "parquet"}
+
+
+@dataclass(frozen=True)
+class Layout:
+    """Cómo se reparten ``rows`` filas: entidades × programas × proyectos × objetos."""
+
+    rows: int
+    entities: int
+    programs: int
+    projects: int
+
+    @property
+    def per_entity(self) -> int:
+        return self.programs * self.projects * len(OBJECTS)
+
+    @classmethod
+    def for_rows(cls, rows: int, entities: int) -> "Layout":
+        units = max(math.ceil(rows / (entities * len(OBJECTS))), 1)
+        programs = math.ceil(math.sqrt(units))
+        return cls(rows, entities, programs, math.ceil(units / programs))
+
+
+def _base_entities(path) -> pd.DataFrame:
+    raw = pd.read_excel(path, sheet_name="Sheet1", engine="openpyxl")
+    last = [c for c in raw.columns if str(c).startswith("Monto_")][-1]
+    item = last.replace("Monto_", "Item_")
+    ent = raw[["Sección", "Categoría", "Código", item, last]].copy()
+    ent.columns = ["seccion", "categoria", "codigo", "nombre", "monto"]
+    ent["monto"] = pd.to_numeric(ent["monto"], errors="coerce").fillna(0).clip(lower=1e9)
+    return ent.reset_index(drop=True)
+
+
+def _unit_hash(unit: np.ndarray, salt: int) -> np.ndarray:
+    # Valor en [0, 1) fijo por proyecto (independiente del bloque): Knuth multiplicativo
+    return ((unit.astype(np.uint64) * np.uint64(2654435761) + np.uint64(salt)) % np.uint64(1 << 32)) / float(1 << 32)
+
+
+def iter_frames(
+    rows: int,
+    years=DEFAULT_YEARS,
+    seed: int = 0,
+    base=DEFAULT_WORKBOOK,
+    chunk_rows: int = CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """Bloques de ``chunk_rows`` filas con las columnas del Excel del PGN."""
+    years = sorted(int(y) for y in years)
+    if len(years) < 2:
+        raise ValueError("Se necesitan al menos dos años (Variación % compara los dos últimos)")
+    ent = _base_entities(base)
+    layout = Layout.for_rows(rows, len(ent))
+    width_p = max(2, len(str(layout.programs)))
+    width_q = max(3, len(str(layout.projects)))
+    scale = ent["monto"].to_numpy() / (layout.programs * layout.projects)
+    secc = ent["seccion"].to_numpy(dtype=object)
+    cat = ent["categoria"].to_numpy(dtype=object)
+    code = ent["codigo"].astype(str).to_numpy(dtype=object)
+    name = ent["nombre"].astype(str).to_numpy(dtype=object)
+
+    for chunk_no, start in enumerate(range(0, rows, chunk_rows)):
+        rng = np.random.default_rng([seed, chunk_no])
+        i = np.arange(start, min(start + chunk_rows, rows), dtype=np.int64)
+        e, r = np.divmod(i, layout.per_entity)
+        p = r // (layout.projects * len(OBJECTS)) + 1
+        q = (r // len(OBJECTS)) % layout.projects + 1
+        o = r % len(OBJECTS)
+        unit = i // len(OBJECTS)
+
+        codigo = pd.Series(code[e]) + "-" + pd.Series(p).astype(str).str.zfill(width_p) + "-" + pd.Series(q).astype(str).str.zfill(width_q)
+        item = pd.Series(name[e]) + " / PROG " + pd.Series(p).astype(str) + " / PROY " + pd.Series(q).astype(str)
+
+        # Monto del último año: escala de la entidad × peso del objeto × ruido
+        amount = scale[e] * OBJECT_WEIGHTS[o] * rng.lognormal(0.0, 0.6, len(i))
+        objects = np.asarray(OBJECTS)[o]
+        for obj, rate in SPARSE_OBJECTS.items():
+            amount[(objects == obj) & (_unit_hash(unit, obj) < rate)] = 0.0
+        is_new = _unit_hash(unit, 7) < NEW_ITEM_RATE
+
+        frame = {
+            "Sección": secc[e],
+            "Categoría": cat[e],
+            "Código": codigo.to_numpy(dtype=object),
+            "Objeto": objects.astype(str),
+        }
+        amounts = {years[-1]: amount}
+        for year in reversed(years[:-1]):  # hacia atrás: crecimiento anual ~6 % ± 8 %
+            amount = amount / (1 + rng.normal(0.06, 0.08, len(i)).clip(-0.5))
+            amounts[year] = amount
+        items_old = item.where(~is_new).to_numpy(dtype=object)
+        for year in years:
+            last = year == years[-1]
+            monto = np.where(is_new & ~last, 0.0, amounts[year])
+            frame[f"Item_{year}"] = item.to_numpy(dtype=object) if last else items_old
+            frame[f"Monto_{year}"] = np.rint(monto).astype(np.int64)
+
+        prev, cur = frame[f"Monto_{years[-2]}"], frame[f"Monto_{years[-1]}"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            frame["Variación %"] = np.where(prev > 0, (cur / prev - 1) * 100, np.nan)
+        yield pd.DataFrame(frame)
+
+
+def _format(path: Path) -> str:
+    try:
+        return SUFFIX_FORMATS[path.suffix.lower()]
+    except KeyError:
+        raise ValueError(f"Extensión no soportada: {path.name} (usar {', '.join(SUFFIX_FORMATS)})") from None
+
+
+def generate(path, rows: int, years=DEFAULT_YEARS, seed: int = 0, base=DEFAULT_WORKBOOK, chunk_rows: int = CHUNK_ROWS) -> Path:
+    """Escribe un dataset sintético de ``rows`` filas; el formato sale de la extensión."""
+    path = Path(path)
+    fmt = _format(path)
+    if fmt == "xlsx" and rows > XLSX_MAX_ROWS:
+        raise ValueError(f"xlsx admite hasta {XLSX_MAX_ROWS:,} filas; usar .csv o .parquet")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    write_chunks(fmt, iter_frames(rows, years, seed, base, chunk_rows), tmp)
+    tmp.replace(path)
+    return path
+
+
+def _years(text: str) -> list[int]:
+    if "-" in text:
+        first, last = (int(x) for x in text.split("-"))
+        return list(range(first, last + 1))
+    return [int(x) for x in text.split(",")]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Genera datasets sintéticos del PGN.")
+    parser.add_argument("rows", type=lambda s: int(float(s)), help="cantidad de filas (acepta 1e6)")
+    parser.add_argument("-o", "--out", type=Path, nargs="+", required=True, help=".xlsx, .csv y/o .parquet")
+    parser.add_argument("--years", type=_years, default=list(DEFAULT_YEARS), help="2022-2026 o 2024,2025,2026")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--base", type=Path, default=DEFAULT_WORKBOOK, help="Excel con las entidades")
+    args = parser.parse_args(argv)
+
+    for out in args.out:
+        t0 = time.perf_counter()
+        generate(out, args.rows, args.years, args.seed, args.base)
+        print(f"{out}: {args.rows:,} filas, {out.stat().st_size / 1e6:,.1f} MB en {time.perf_counter() - t0:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
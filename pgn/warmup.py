@@ -0,0 +1,285 @@
+"""Precalentado en segundo plano: la versión nueva del Excel se arma fuera de los reruns.
+
+Sin esto, cuando se reemplaza el Excel con el proceso andando (commit nuevo
+en Streamlit Cloud) la primera sesión que llega paga el parseo y todos los
+derivados. :func:`start` lanza un hilo por proceso que mira las rutas que le
+pasan las apps cada ``PGN_WARMUP_INTERVAL`` segundos (2; sólo ``stat``:
+tamaño y mtime) y, cuando una cambia y queda igual dos vueltas seguidas:
+
+1. lee la versión nueva dentro de :func:`pgn.data.staging`: las sesiones
+   siguen con la publicada, :func:`pgn.data.dataset_version` les devuelve
+   esa sin mirar el archivo;
+2. arma lo derivado de esa versión: rankings, cubo, índice de búsqueda,
+   vínculos entre años, serie y desglose por objeto (:data:`BUILTIN`), más lo
+   que registran las apps con :func:`register` (tablas y exports de
+   ``presup.py``, JSON de ``static/data`` y HTML de ``presup_2``/``presup_3``);
+3. la publica con :func:`pgn.data.promote` (un único cambio bajo lock) y se
+   descartan los derivados de la anterior. El rerun siguiente encuentra todo
+   en :mod:`pgn.artifacts`.
+
+Si la lectura falla (por ejemplo un Excel a medio copiar) se sigue sirviendo
+la versión anterior, el error queda en :func:`status` y se reintenta cuando
+el archivo vuelva a cambiar. Cada preparación queda en :mod:`pgn.metrics`
+como un rerun de la "app" ``warmup``.
+
+En un proceso recién arrancado la primera sesión todavía espera la primera
+lectura (el hilo arranca con ella); el Parquet de :mod:`pgn.cache` la hace
+corta. ``python -m pgn.warmup`` hace esa pasada antes de levantar el server
+(Parquet, ``static/data``). ``PGN_WARMUP=0`` apaga el hilo: cada rerun vuelve
+a mirar el Excel como antes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from . import data
+from .matching import resolve
+from .metrics import metrics
+from .objects import load_objects
+from .parallel import prefetch
+from .rankings import get_rankings
+from .rollups import get_cube
+from .search import get_index
+from .series import load_series
+
+ENABLED = os.environ.get("PGN_WARMUP", "1") != "0"
+INTERVAL = float(os.environ.get("PGN_WARMUP_INTERVAL", "2"))
+
+# Derivados de cualquier Excel seguido: (nombre, función(df, ruta))
+BUILTIN: tuple[tuple[str, Callable[[pd.DataFrame, Path], object]], ...] = (
+    ("rankings", lambda df, path: get_rankings(df)),
+    ("rollups", lambda df, path: get_cube(df)),
+    ("search", lambda df, path: get_index(df)),
+    ("matching", lambda df, path: resolve(df)),
+    ("series", lambda df, path: load_series(path)),
+    ("objects", lambda df, path: load_objects(path)),
+)
+
+_registry_lock = threading.Lock()
+_registry: dict[str, tuple[Callable[[pd.DataFrame], object], str | None]] = {}
+
+
+def register(name: str, warm: Callable[[pd.DataFrame], object], path=None) -> None:
+    """Agrega ``warm(df)`` a lo que se arma antes de publicar una versión de ``path`` (o de todas).
+
+    Las apps lo llaman en cada rerun: el mismo ``name`` reemplaza al anterior.
+    ``warm`` corre fuera de Streamlit: nada de ``st.*`` adentro.
+    """
+    key = str(Path(path).resolve()) if path is not None else None
+    with _registry_lock:
+        _registry[name] = (warm, key)
+
+
+def _steps(path: Path) -> list[tuple[str, Callable[[pd.DataFrame], object]]]:
+    steps = [(name, lambda df, fn=fn: fn(df, path)) for name, fn in BUILTIN]
+    with _registry_lock:
+        steps += [(name, warm) for name, (warm, key) in _registry.items() if key in (None, str(path))]
+    return steps
+
+
+@dataclass
+class Status:
+    path: str
+    version: str | None = None  # publicada
+    preparing: str | None = None  # en preparación
+    seconds: float = 0.0  # duración de la última preparación
+    steps: dict[str, float] = field(default_factory=dict)
+    error: str | None = None  # la última versión no se pudo publicar
+    warnings: list[str] = field(default_factory=list)  # derivados que fallaron (se arman al pedirlos)
+    updated: float = 0.0  # epoch de la última publicación o error
+
+
+class Watcher:
+    """Hilo que sigue un conjunto de Excel y publica cada versión nueva ya preparada."""
+
+    def __init__(self, interval: float = INTERVAL):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._status: dict[str, Status] = {}
+        self._seen: dict[str, tuple[int, int] | None] = {}  # (tamaño, mtime) ya procesado
+        self._pending: dict[str, tuple[int, int]] = {}  # cambio visto, esperando que quede estable
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add(self, *paths) -> list[str]:
+        """Agrega rutas a seguir (sin arrancar el hilo); devuelve las nuevas."""
+        with self._lock:
+            new = [str(Path(p).resolve()) for p in paths]
+            new = [p for p in dict.fromkeys(new) if p not in self._seen]
+            for p in new:
+                self._status.setdefault(p, Status(path=p))
+                self._seen[p] = None
+            return new
+
+    def watch(self, *paths) -> None:
+        """Agrega rutas a seguir y arranca el hilo si no está andando."""
+        new = self.add(*paths)
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped.clear()
+                self._thread = threading.Thread(target=self._loop, name="pgn-warmup", daemon=True)
+                self._thread.start()
+            elif new:
+                self._wake.set()
+
+    def stop(self, release: bool = True) -> None:
+        """Frena el hilo; con ``release`` las sesiones vuelven a mirar el Excel en cada rerun."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        with self._lock:
+            paths = list(self._seen)
+        if release:
+            for p in paths:
+                data.release(p)
+
+    def status(self) -> dict[str, Status]:
+        with self._lock:
+            return dict(self._status)
+
+    def _loop(self) -> None:
+        while not self._stopped.is_set():
+            self.poll()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def poll(self) -> list[str]:
+        """Una vuelta: prepara y publica las rutas que cambiaron; devuelve las publicadas."""
+        with self._lock:
+            paths = list(self._seen)
+        ready = []
+        for p in paths:
+            try:
+                st = os.stat(p)
+                fp = (st.st_size, st.st_mtime_ns)
+            except OSError:
+                continue  # el archivo no está (se está reemplazando): se sigue con la versión publicada
+            seen = self._seen.get(p)
+            if fp == seen:
+                continue
+            # la primera vez se lee directo; un cambio tiene que quedar estable una vuelta
+            if seen is not None and self._pending.get(p) != fp:
+                self._pending[p] = fp
+                continue
+            self._pending.pop(p, None)
+            ready.append((p, fp))
+        if len(ready) > 1:  # varios cambiaron (o el arranque): los parseos van en paralelo (pgn.parallel)
+            try:
+                prefetch(p for p, _ in ready)
+            except Exception:  # se parsean en serie en refresh()
+                pass
+        done = []
+        for p, fp in ready:
+            if self._stopped.is_set():
+                break
+            if self.refresh(p) is not None:
+                done.append(p)
+            self._seen[p] = fp
+        return done
+
+    def refresh(self, path) -> str | None:
+        """Prepara la versión actual de ``path`` y la publica; ``None`` si ya estaba o falló."""
+        path = Path(path).resolve()
+        with self._lock:
+            status = self._status.setdefault(str(path), Status(path=str(path)))
+        try:
+            version = data.file_version(path)
+        except OSError as e:
+            status.error, status.updated = f"{type(e).__name__}: {e}", time.time()
+            return None
+        if version == status.version:
+            return None
+
+        status.preparing, status.error, status.warnings = version, None, []
+        metrics.begin_run("warmup")
+        t0 = time.perf_counter()
+        steps: dict[str, float] = {}
+        try:
+            with data.staging(path, version):
+                s0 = time.perf_counter()
+                with metrics.span("load_budget"):
+                    df = data.load_budget(path)
+                steps["load_budget"] = time.perf_counter() - s0
+                for name, warm in _steps(path):
+                    s0 = time.perf_counter()
+                    try:
+                        with metrics.span(name):
+                            warm(df)
+                    except Exception:  # un derivado que falla se arma al pedirlo, como sin warmup
+                        status.warnings.append(f"{name}: {traceback.format_exc().strip().splitlines()[-1]}")
+                    steps[name] = time.perf_counter() - s0
+        except Exception as e:
+            status.preparing = None
+            status.error, status.updated = f"{type(e).__name__}: {e}", time.time()
+            metrics.end_run()
+            return None
+        data.promote(path, version)
+        metrics.end_run()
+        status.version, status.preparing = version, None
+        status.seconds, status.steps, status.updated = time.perf_counter() - t0, steps, time.time()
+        return version
+
+
+watcher = Watcher()
+
+
+def start(*paths) -> Watcher | None:
+    """Sigue ``paths`` (default: el Excel de las apps) en el hilo del proceso; no-op con ``PGN_WARMUP=0``."""
+    if not ENABLED:
+        return None
+    watcher.watch(*(paths or (data.DEFAULT_WORKBOOK,)))
+    return watcher
+
+
+def status(path=None) -> Status | None:
+    """Estado de ``path`` (default: el Excel de las apps) si está seguido."""
+    return watcher.status().get(str(Path(path or data.DEFAULT_WORKBOOK).resolve()))
+
+
+def preparing(path=None) -> str | None:
+    """Versión nueva de ``path`` que se está preparando, si hay una."""
+    st = status(path)
+    return st.preparing if st is not None else None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Prepara Parquet, static/data y derivados del Excel antes de servir.")
+    parser.add_argument("paths", nargs="*", type=Path, help=f"Excel a preparar (default: {data.DEFAULT_WORKBOOK.name})")
+    parser.add_argument("--watch", action="store_true", help="seguir los archivos y repetir en cada cambio")
+    args = parser.parse_args(argv)
+
+    w = Watcher()
+    w.add(*(args.paths or [data.DEFAULT_WORKBOOK]))
+    w.poll()
+    for st in w.status().values():
+        steps = ", ".join(f"{name} {secs:.2f}s" for name, secs in st.steps.items())
+        print(f"{Path(st.path).name}: {st.version or 'error'} en {st.seconds:.2f}s ({steps})")
+        for problem in filter(None, [st.error, *st.warnings]):
+            print(f"  {problem}")
+    if args.watch:
+        try:
+            while True:
+                time.sleep(w.interval)
+                for p in w.poll():
+                    st = w.status()[p]
+                    print(f"{Path(p).name}: {st.version} en {st.seconds:.2f}s")
+        except KeyboardInterrupt:
+            pass
+    return 1 if any(st.version is None for st in w.status().values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
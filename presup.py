@@ -1,46 +1,97 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 from pathlib import Path
 
+from pgn import data as pgn_data
+from pgn import warmup
+from pgn.artifacts import memoize
+from pgn.delta import get_revision
+from pgn.exports import FORMATS, cached_export, get_export, lazy_export
+from pgn.matching import linked_table, resolve
+from pgn.metrics import metrics, render_panel
+from pgn.rankings import get_rankings
+from pgn.revisions import available, compare, load_revisions
+from pgn.revisions import summary as revision_summary
+from pgn.rollups import get_cube
+from pgn.search import get_index
+from pgn.series import load_series
+
 st.set_page_config(
     page_title="PGN Paraguay 2025 vs 2026 - Clasificación Institucional",
     layout="wide",
 )
+# Tiempos por etapa de cada rerun (pgn.metrics): no-op salvo con PGN_METRICS=1/panel
+metrics.begin_run("presup")
 
-DEFAULT_FILE = Path("presup_py_v3.xlsx")  # dejalo en el repo (misma carpeta que app.py)
+DEFAULT_FILE = pgn_data.DEFAULT_WORKBOOK  # presup_py_v3.xlsx del repo, o PGN_WORKBOOK
 SHEET_NAME = "Sheet1"
 MILLION = 1_000_000
+NEW_ITEM = "Item inexistente"
+SEARCH_LIMIT = 20
 
 
-@st.cache_data(show_spinner=False)
+@metrics.timed()
 def load_excel(file) -> pd.DataFrame:
-    # file puede ser Path o UploadedFile
-    df = pd.read_excel(file, sheet_name=SHEET_NAME, engine="openpyxl")
-    # limpiar columna basura típica de export (Unnamed: 0)
-    df = df.loc[:, ~df.columns.astype(str).str.match(r"^Unnamed")]
-    return df
+    # file puede ser Path o UploadedFile. Los Path usan el cache de proceso
+    # compartido con presup_2/presup_3 (pgn.data); no copiar por sesión.
+    if isinstance(file, (str, Path)):
+        return pgn_data.load_budget(file, sheet_name=SHEET_NAME)
+    return load_uploaded(file)
 
 
-def prepare_tables(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+@st.cache_data(show_spinner=False)
+def load_uploaded(file) -> pd.DataFrame:
+    return pgn_data.normalize(pd.read_excel(file, sheet_name=SHEET_NAME, engine="openpyxl"))
+
 
-    # 1) reemplazar NaN de 2025 (item inexistente en 2025)
-    df["Item_2025"] = df["Item_2025"].fillna("Item inexistente")
-    # si el monto 2025 es NaN para esos casos, poner 0
-    df["Monto_2025"] = df["Monto_2025"].fillna(0)
+@metrics.timed()
+def prepare_tables(df: pd.DataFrame) -> pd.DataFrame:
+    # df viene en el esquema canónico (pgn.data); acá volvemos a los nombres del Excel
+    df = pgn_data.to_display(df)
 
-    # 2) montos en millones de Gs (mantener numérico)
-    df["Monto_2025_MM"] = df["Monto_2025"] / MILLION
-    df["Monto_2026_MM"] = df["Monto_2026"] / MILLION
+    # 1) reemplazar NaN de 2025 (item inexistente en 2025); es categórica: se
+    #    agrega la categoría en vez de pasar la columna a strings
+    item = df["Item_2025"]
+    if isinstance(item.dtype, pd.CategoricalDtype) and NEW_ITEM not in item.cat.categories:
+        item = item.cat.add_categories([NEW_ITEM])
+    df["Item_2025"] = item.fillna(NEW_ITEM)
 
-    # 3) variación % redondeada a 1 decimal (si existe)
-    if "Variación %" in df.columns:
-        df["Variación %"] = df["Variación %"].round(1)
+    # 2) variación % redondeada a 1 decimal
+    df["Variación %"] = df["Variación %"].round(1)
 
+    # los montos quedan en Gs (int64): los millones se calculan al mostrar (in_millions)
     return df
 
 
+MAIN_COLUMNS = ["Sección", "Categoría", "Código", "Item_2025", "Monto_2025", "Item_2026", "Monto_2026", "Variación %"]
+
+
+def derived_tables(df_raw: pd.DataFrame) -> dict:
+    # Tablas derivadas cacheadas por versión del Excel (pgn.artifacts): un rerun
+    # sólo corta filas. Los frames cacheados son compartidos, no modificarlos.
+    def build():
+        df = prepare_tables(df_raw)
+        df_main = df[MAIN_COLUMNS]
+        # nuevos = ítems 2026 sin pareja en 2025 según pgn.matching (no sólo
+        # Item_2025 vacío: un organismo renombrado o recodificado no es nuevo)
+        with metrics.span("matching"):
+            match = resolve(df_raw)
+            df_new = df_main.iloc[match.unmatched_right()].reset_index(drop=True)
+            linked = linked_table(df_raw, match)
+        return {"df": df, "main": df_main, "new": df_new, "linked": linked}
+
+    with metrics.span("derived_tables"):
+        return memoize(df_raw, "presup.tables", build)
+
+
+def in_millions(df_show: pd.DataFrame) -> pd.DataFrame:
+    # montos en millones de Gs, sólo para las filas que se muestran o descargan
+    return df_show.assign(
+        Monto_2025=df_show["Monto_2025"] / MILLION,
+        Monto_2026=df_show["Monto_2026"] / MILLION,
+    ).rename(columns={"Monto_2025": "Monto_2025_MM", "Monto_2026": "Monto_2026_MM"})
+
+
 def display_table(df_show: pd.DataFrame, key: str):
     # Config visual: montos en millones con 1 decimal, variación con 1 decimal
     colcfg = {
@@ -48,97 +99,344 @@ def display_table(df_show: pd.DataFrame, key: str):
         "Monto_2026_MM": st.column_config.NumberColumn("Monto 2026 (MM Gs)", format="%.1f"),
         "Variación %": st.column_config.NumberColumn("Variación %", format="%.1f"),
     }
-    st.dataframe(
-        df_show,
-        use_container_width=True,
-        hide_index=True,
-        column_config=colcfg,
-        key=key,
+    with metrics.span(f"st.dataframe:{key}"):
+        st.dataframe(
+            in_millions(df_show),
+            use_container_width=True,
+            hide_index=True,
+            column_config=colcfg,
+            key=key,
+        )
+
+
+def top_variation(df_main: pd.DataFrame, rankings, name: str, n: int) -> pd.DataFrame:
+    # el índice ordena la variación sin redondear; como antes, el signo se mira
+    # sobre la redondeada que se muestra (una fila con +0.04 % no entra como "+0.0")
+    order = rankings.top(name)
+    shown = df_main["Variación %"].iloc[order]
+    order = order[(shown > 0 if name == "var_pos" else shown < 0).to_numpy(dtype=bool)]
+    return df_main.iloc[order[:n]].reset_index(drop=True)
+
+
+def warm_exports(df_raw: pd.DataFrame) -> None:
+    # Exports de las tablas que no dependen de la sesión, en todos los formatos
+    version = df_raw.attrs.get("version")
+    if version is None:
+        return
+    tables = derived_tables(df_raw)
+    for fmt in FORMATS:
+        get_export(version, "tabla_completa_2025_2026", fmt, lambda: in_millions(tables["main"]))
+        get_export(version, "items_nuevos_2026", fmt, lambda: in_millions(tables["new"]))
+
+
+# Una revisión nueva del Excel se prepara en segundo plano (pgn.warmup), con
+# las tablas y exports de esta app, y se publica ya armada.
+warmup.register("presup.tables", derived_tables, DEFAULT_FILE)
+warmup.register("presup.exports", warm_exports, DEFAULT_FILE)
+warmup.register("presup.revisions", lambda df: load_revisions(available(DEFAULT_FILE)), DEFAULT_FILE)
+
+try:
+    st.title("Presupuesto General de la Nación (PY) – Comparación 2025 vs 2026")
+    st.caption("Clasificación Institucional – Montos expresados en **millones de guaraníes (Gs)**.")
+
+    with st.sidebar:
+        st.header("Fuente de datos: Presupuesto General de la Nación")
+        #uploaded = st.file_uploader("Subí el Excel final (opcional)", type=["xlsx"])
+        #if uploaded is None:
+        if not DEFAULT_FILE.exists():
+            st.error(
+                "No encuentro el archivo 'presup_py.xlsx' en el repositorio. "
+                "Subilo con el uploader o agregalo al repo."
+            )
+            st.stop()
+        data_source = DEFAULT_FILE
+        # Revisiones del Excel en el repo (pgn.revisions): por defecto la que usan las apps
+        revisions = available(DEFAULT_FILE)
+        revision_labels = list(revisions)
+        warmup.start(DEFAULT_FILE, *revisions.values())
+        if warmup.preparing(DEFAULT_FILE):
+            st.caption("Hay una revisión nueva del Excel en preparación: se muestra la anterior hasta que esté lista.")
+        if len(revision_labels) > 1:
+            revision_label = st.selectbox(
+                "Revisión del Excel",
+                options=revision_labels,
+                index=revision_labels.index(DEFAULT_FILE.resolve().stem),
+                key="revision",
+            )
+            data_source = revisions[revision_label]
+        #st.info("Usando archivo del repositorio: presup_py.xlsx")
+        #else:
+        #data_source = uploaded
+        #st.success("Usando archivo subido")
+        st.divider()
+        st.subheader("Rankings")
+        top_n_monto = st.selectbox("Top por mayor gasto 2026", options=[5, 10, 15], index=1)
+        top_n_pos = st.selectbox("Top por variación positiva", options=[5, 10, 15], index=1)
+        top_n_neg = st.selectbox("Top por variación negativa", options=[5, 10, 15], index=1)
+
+        st.divider()
+        st.subheader("Buscar organismo")
+        query = st.text_input("Nombre o código", placeholder="ej. salud pública, 12-07", key="buscar")
+
+    # Cargar y preparar
+    df_raw = load_excel(data_source)
+    tables = derived_tables(df_raw)
+
+    # Columnas base esperadas (normalize las agrega vacías si faltan en el Excel)
+    missing_cols = df_raw.attrs.get("missing_columns", [])
+    if missing_cols:
+        st.warning(f"Faltan columnas esperadas en el Excel: {sorted(missing_cols)}")
+
+    # Si el Excel se reemplazó con el proceso andando, la versión nueva se armó
+    # desde la anterior (pgn.delta) y queda el reporte de qué organismos se movieron.
+    revision = get_revision(df_raw)
+    if revision is not None:
+        summary = revision.summary()
+        with st.expander(
+            f"Cambios respecto de la revisión anterior del Excel: {summary['filas_modificadas']} filas modificadas, "
+            f"{summary['filas_nuevas']} nuevas, {summary['filas_eliminadas']} eliminadas"
+        ):
+            report = revision.report
+            st.dataframe(
+                report.assign(
+                    monto_2026_antes=report["monto_2026_antes"] / MILLION,
+                    monto_2026_despues=report["monto_2026_despues"] / MILLION,
+                    diferencia=report["diferencia"] / MILLION,
+                )[["entidad", "nombre", "monto_2026_antes", "monto_2026_despues", "diferencia", "variacion_pct", "estado"]],
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "entidad": st.column_config.TextColumn("Código"),
+                    "nombre": st.column_config.TextColumn("Organismo"),
+                    "monto_2026_antes": st.column_config.NumberColumn("2026 antes (MM Gs)", format="%.1f"),
+                    "monto_2026_despues": st.column_config.NumberColumn("2026 ahora (MM Gs)", format="%.1f"),
+                    "diferencia": st.column_config.NumberColumn("Diferencia (MM Gs)", format="%+.1f"),
+                    "variacion_pct": st.column_config.NumberColumn("Variación %", format="%+.1f"),
+                    "estado": st.column_config.TextColumn("Cambio"),
+                },
+                key="cambios_revision",
+            )
+
+    # Búsqueda: índice por versión del dataset (pgn.search), sin acentos, por
+    # prefijo y aproximada; se arma recién con la primera consulta.
+    if query.strip():
+        with metrics.span("search"):
+            hits = tables["main"].iloc[get_index(df_raw).search(query, limit=SEARCH_LIMIT)]
+        with st.sidebar:
+            if hits.empty:
+                st.caption("Sin resultados.")
+            else:
+                st.dataframe(
+                    pd.DataFrame({
+                        "Código": hits["Código"],
+                        "Ítem": hits["Item_2026"].astype("string").fillna(hits["Item_2025"].astype("string")),
+                        "Monto_2026_MM": hits["Monto_2026"] / MILLION,
+                    }),
+                    hide_index=True,
+                    column_config={"Monto_2026_MM": st.column_config.NumberColumn("2026 (MM Gs)", format="%.1f")},
+                    key="buscar_resultados",
+                )
+
+    # Tabla principal (entera)
+    st.subheader("1) Tabla completa (2025 vs 2026)")
+    df_main = tables["main"]
+    display_table(df_main, key="tabla_completa")
+
+    # Rankings: índice precalculado por versión del dataset (pgn.rankings); cada
+    # Top-N es un slice de posiciones, sin re-ordenar df_main en cada rerun.
+    with metrics.span("rankings"):
+        rankings = get_rankings(df_raw)
+
+    # 4) Top por monto 2026
+    st.subheader(f"2) Ítems con mayor monto en 2026 (Top {top_n_monto})")
+    df_top_2026 = df_main.iloc[rankings.top("monto_2026", top_n_monto)].reset_index(drop=True)
+    display_table(df_top_2026, key=f"top_monto_2026_{top_n_monto}")
+
+    # 5) Top subas %
+    st.subheader(f"3) Mayor variación porcentual positiva (Top {top_n_pos})")
+    df_top_pos = top_variation(df_main, rankings, "var_pos", top_n_pos)
+    display_table(df_top_pos, key=f"top_subas_{top_n_pos}")
+
+    # 6) Top bajas %
+    st.subheader(f"4) Mayor variación porcentual negativa (Top {top_n_neg})")
+    df_top_neg = top_variation(df_main, rankings, "var_neg", top_n_neg)
+    display_table(df_top_neg, key=f"top_bajas_{top_n_neg}")
+
+
+    # 7) Items nuevos 2026 (no estaban en 2025)
+    st.subheader("5) Organismos que aparecen en 2026 y no existían en 2025")
+    df_new_show = tables["new"]
+    if df_new_show.empty:
+        st.info("No se detectaron ítems nuevos en 2026 (sin pareja en 2025 por código, nombre ni similitud).")
+    else:
+        display_table(df_new_show, key="items_nuevos_2026")
+
+    # Renombrados/recodificados: en el Excel figuran como baja + alta; acá se
+    # muestran vinculados, con la variación entre los dos montos.
+    df_linked = tables["linked"]
+    if not df_linked.empty:
+        st.markdown("**Organismos renombrados o recodificados (vinculados entre 2025 y 2026)**")
+        with metrics.span("st.dataframe:organismos_vinculados"):
+            st.dataframe(
+                df_linked.assign(monto_2025=df_linked["monto_2025"] / MILLION, monto_2026=df_linked["monto_2026"] / MILLION),
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "codigo_2025": st.column_config.TextColumn("Código 2025"),
+                    "item_2025": st.column_config.TextColumn("Item_2025"),
+                    "monto_2025": st.column_config.NumberColumn("Monto 2025 (MM Gs)", format="%.1f"),
+                    "codigo_2026": st.column_config.TextColumn("Código 2026"),
+                    "item_2026": st.column_config.TextColumn("Item_2026"),
+                    "monto_2026": st.column_config.NumberColumn("Monto 2026 (MM Gs)", format="%.1f"),
+                    "variacion_pct": st.column_config.NumberColumn("Variación %", format="%.1f"),
+                    "metodo": st.column_config.TextColumn("Vínculo"),
+                    "score": st.column_config.NumberColumn("Similitud", format="%.2f"),
+                },
+                key="organismos_vinculados",
+            )
+        st.caption(
+            "La variación vinculada se ve sólo acá: la tabla completa y los rankings usan la "
+            "variación del Excel por fila, donde estos organismos siguen como baja y alta."
+        )
+
+    # Totales por jerarquía institucional: cubo precalculado por versión del
+    # dataset (pgn.rollups); elegir sección/categoría es un lookup, no un groupby.
+    st.subheader("6) Totales por Sección, Categoría y Entidad")
+    with metrics.span("rollups"):
+        cube = get_cube(df_raw)
+    sel_cols = st.columns(2)
+    secciones = cube.children(())["seccion"].tolist()
+    seccion = sel_cols[0].selectbox("Sección", options=["(todas)", *secciones], key="rollup_seccion")
+    path = () if seccion == "(todas)" else (seccion,)
+    if path:
+        categorias = cube.children(path)["categoria"].tolist()
+        categoria = sel_cols[1].selectbox("Categoría", options=["(todas)", *categorias], key="rollup_categoria")
+        if categoria != "(todas)":
+            path = (seccion, categoria)
+    node = cube.node(path)
+    df_rollup = cube.children(path)[["nombre", "monto_2025", "monto_2026", "variacion_pct", "share_parent_pct", "items"]]
+    with metrics.span("st.dataframe:rollup"):
+        st.dataframe(
+            df_rollup.assign(monto_2025=df_rollup["monto_2025"] / MILLION, monto_2026=df_rollup["monto_2026"] / MILLION),
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "nombre": st.column_config.TextColumn("Entidad" if len(path) == 2 else "Nombre"),
+                "monto_2025": st.column_config.NumberColumn("Monto 2025 (MM Gs)", format="%.1f"),
+                "monto_2026": st.column_config.NumberColumn("Monto 2026 (MM Gs)", format="%.1f"),
+                "variacion_pct": st.column_config.NumberColumn("Variación %", format="%.1f"),
+                "share_parent_pct": st.column_config.NumberColumn(f"% de {node['nombre']}", format="%.1f"),
+                "items": st.column_config.NumberColumn("Ítems"),
+            },
+            key=f"rollup_{'_'.join(map(str, path)) or 'total'}",
+        )
+    st.caption(
+        f"{node['nombre']}: {node['monto_2026'] / MILLION:,.1f} MM Gs en 2026 "
+        f"({node['variacion_pct']:+.1f} % vs 2025, {node['share_total_pct']:.1f} % del total)."
     )
 
+    # Secciones opcionales: se numeran a continuación de las fijas, según cuáles se muestran
+    section = 7
 
-st.title("Presupuesto General de la Nación (PY) – Comparación 2025 vs 2026")
-st.caption("Clasificación Institucional – Montos expresados en **millones de guaraníes (Gs)**.")
+    # Serie multianual: sólo si la fuente trae más de dos años (Monto_<año>);
+    # sumar un ejercicio es agregar columnas al Excel, no tocar este código.
+    with metrics.span("series"):
+        series = load_series(data_source)
+    if len(series.years) > 2:
+        first, last = int(series.years[0]), int(series.years[-1])
+        st.subheader(f"{section}) Evolución {first}–{last}")
+        section += 1
+        summary = series.summary().reset_index()
+        summary["monto"] = summary["monto"] / MILLION
+        st.dataframe(
+            summary,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "año": st.column_config.NumberColumn("Año", format="%d"),
+                "monto": st.column_config.NumberColumn("Monto (MM Gs)", format="%.1f"),
+                "items": st.column_config.NumberColumn("Ítems vigentes"),
+                "variacion_pct": st.column_config.NumberColumn("Variación % interanual", format="%.1f"),
+            },
+            key="serie_multianual",
+        )
+        st.caption(f"Crecimiento anual compuesto {first}–{last}: {series.total_cagr():.1f} %")
 
-with st.sidebar:
-    st.header("Fuente de datos: Presupuesto General de la Nación")
-    #uploaded = st.file_uploader("Subí el Excel final (opcional)", type=["xlsx"])
-    #if uploaded is None:
-    if not DEFAULT_FILE.exists():
-        st.error(
-            "No encuentro el archivo 'presup_py.xlsx' en el repositorio. "
-            "Subilo con el uploader o agregalo al repo."
+    # Cambios entre revisiones del Excel: las revisiones se alinean una vez por
+    # código (pgn.revisions) y cada par comparado queda cacheado.
+    if len(revision_labels) > 1:
+        st.subheader(f"{section}) Cambios entre revisiones del Excel")
+        current = revision_labels.index(Path(data_source).resolve().stem)
+        rev_cols = st.columns(2)
+        rev_a = rev_cols[0].selectbox("Desde", options=revision_labels, index=max(current - 1, 0), key="revision_desde")
+        rev_b = rev_cols[1].selectbox("Hasta", options=revision_labels, index=current, key="revision_hasta")
+        with metrics.span("revisions"):
+            df_changes = compare(load_revisions(revisions), rev_a, rev_b)
+        counts = revision_summary(df_changes)
+        st.caption(
+            f"{counts['modificado']} con montos modificados, {counts['renombrado']} renombrados, "
+            f"{counts['nuevo']} nuevos, {counts['eliminado']} eliminados · "
+            f"diferencia total 2026: {counts['diferencia_2026'] / MILLION:+,.1f} MM Gs"
         )
-        st.stop()
-    data_source = DEFAULT_FILE
-    #st.info("Usando archivo del repositorio: presup_py.xlsx")
-    #else:
-    #data_source = uploaded
-    #st.success("Usando archivo subido")
-    st.divider()
-    st.subheader("Rankings")
-    top_n_monto = st.selectbox("Top por mayor gasto 2026", options=[5, 10, 15], index=1)
-    top_n_pos = st.selectbox("Top por variación positiva", options=[5, 10, 15], index=1)
-    top_n_neg = st.selectbox("Top por variación negativa", options=[5, 10, 15], index=1)
+        if not df_changes.empty:
+            with metrics.span("st.dataframe:cambios_revisiones"):
+                st.dataframe(
+                    df_changes.assign(
+                        monto_2026_antes=df_changes["monto_2026_antes"] / MILLION,
+                        monto_2026_despues=df_changes["monto_2026_despues"] / MILLION,
+                        diferencia=df_changes["diferencia"] / MILLION,
+                    ),
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "codigo": st.column_config.TextColumn("Código"),
+                        "item": st.column_config.TextColumn("Ítem"),
+                        "item_antes": st.column_config.TextColumn("Ítem antes"),
+                        "monto_2026_antes": st.column_config.NumberColumn(f"2026 {rev_a} (MM Gs)", format="%.1f"),
+                        "monto_2026_despues": st.column_config.NumberColumn(f"2026 {rev_b} (MM Gs)", format="%.1f"),
+                        "diferencia": st.column_config.NumberColumn("Diferencia (MM Gs)", format="%+.1f"),
+                        "variacion_pct": st.column_config.NumberColumn("Variación %", format="%+.1f"),
+                        "puesto_antes": st.column_config.NumberColumn("Puesto antes"),
+                        "puesto_despues": st.column_config.NumberColumn("Puesto ahora"),
+                        "cambio_puesto": st.column_config.NumberColumn("Δ puesto", format="%+d"),
+                        "estado": st.column_config.TextColumn("Cambio"),
+                    },
+                    key="cambios_revisiones",
+                )
 
+    # Download (opcional): cada archivo se genera recién al hacer click y queda
+    # cacheado por versión del Excel (pgn.exports), no se re-codifica en cada rerun.
+    # Ya generado, Streamlit lo sirve desde static/ por partes (link) en vez de
+    # cargarlo entero en memoria para el botón.
     st.divider()
+    st.subheader("Descargas")
+    fmt = st.radio("Formato", options=list(FORMATS), format_func=str.upper, horizontal=True)
+    version = df_raw.attrs.get("version")
+    base_url = st.get_option("server.baseUrlPath") or ""
+    downloads = {
+        "tabla_completa_2025_2026": ("tabla completa", lambda: in_millions(df_main)),
+        f"top{top_n_monto}_monto_2026": (f"Top {top_n_monto} monto 2026", lambda: in_millions(df_top_2026)),
+        f"top{top_n_pos}_variacion_positiva": (f"Top {top_n_pos} variación +", lambda: in_millions(df_top_pos)),
+        f"top{top_n_neg}_variacion_negativa": (f"Top {top_n_neg} variación −", lambda: in_millions(df_top_neg)),
+        "items_nuevos_2026": ("ítems nuevos 2026", lambda: in_millions(df_new_show)),
+    }
+    for col, (table, (label, frame)) in zip(st.columns(len(downloads)), downloads.items()):
+        exported = cached_export(version, table, fmt)
+        url = exported.url(base_url) if exported is not None else None
+        with metrics.span("download_button"):
+            if url:
+                col.link_button(f"Descargar {label} ({fmt.upper()})", url)
+            else:
+                col.download_button(
+                    f"Descargar {label} ({fmt.upper()})",
+                    data=lazy_export(version, table, fmt, frame),
+                    file_name=f"{table}.{FORMATS[fmt]['ext']}",
+                    mime=FORMATS[fmt]["mime"],
+                    key=f"dl_{table}_{fmt}",
+                    on_click="ignore",
+                )
+finally:
+    # también cuando st.stop() corta el rerun: la corrida no queda abierta en pgn.metrics
+    metrics.end_run()
 
-# Cargar y preparar
-df_raw = load_excel(data_source)
-df = prepare_tables(df_raw)
-
-# Columnas base esperadas
-required = {"Sección", "Categoría", "Código", "Item_2025", "Monto_2025", "Item_2026", "Monto_2026", "Variación %"}
-missing_cols = required - set(df_raw.columns)
-if missing_cols:
-    st.warning(f"Faltan columnas esperadas en el Excel: {sorted(missing_cols)}")
-
-# Tabla principal (entera)
-st.subheader("1) Tabla completa (2025 vs 2026)")
-df_main = df[["Sección", "Categoría", "Código", "Item_2025", "Monto_2025_MM", "Item_2026", "Monto_2026_MM", "Variación %"]].copy()
-display_table(df_main, key="tabla_completa")
-
-# 4) Top por monto 2026
-st.subheader(f"2) Ítems con mayor monto en 2026 (Top {top_n_monto})")
-df_top_2026 = (
-    df_main.sort_values("Monto_2026_MM", ascending=False)
-           .head(top_n_monto)
-           .reset_index(drop=True)
-)
-display_table(df_top_2026, key=f"top_monto_2026_{top_n_monto}")
-
-# 5) Top subas %
-st.subheader(f"3) Mayor variación porcentual positiva (Top {top_n_pos})")
-df_pos = df_main[df_main["Variación %"].notna() & (df_main["Variación %"] > 0)]
-df_top_pos = (
-    df_pos.sort_values("Variación %", ascending=False)
-          .head(top_n_pos)
-          .reset_index(drop=True)
-)
-display_table(df_top_pos, key=f"top_subas_{top_n_pos}")
-
-# 6) Top bajas %
-st.subheader(f"4) Mayor variación porcentual negativa (Top {top_n_neg})")
-df_neg = df_main[df_main["Variación %"].notna() & (df_main["Variación %"] < 0)]
-df_top_neg = (
-    df_neg.sort_values("Variación %", ascending=True)
-          .head(top_n_neg)
-          .reset_index(drop=True)
-)
-display_table(df_top_neg, key=f"top_bajas_{top_n_neg}")
-
-
-# 7) Items nuevos 2026 (no estaban en 2025)
-st.subheader("5) Organismos que aparecen en 2026 y no existían en 2025")
-df_new = df[df["Item_2025"].eq("Item inexistente")].copy()
-df_new_show = df_new[["Sección", "Categoría", "Código", "Item_2025", "Monto_2025_MM", "Item_2026", "Monto_2026_MM", "Variación %"]]
-if df_new_show.empty:
-    st.info("No se detectaron ítems nuevos en 2026 (según Item_2025 == NaN en el Excel).")
-else:
-    display_table(df_new_show.reset_index(drop=True), key="items_nuevos_2026")
-
-# Download (opcional)
-st.divider()
-st.subheader("Descargas")
-csv_bytes = df_main.to_csv(index=False).encode("utf-8-sig")
-st.download_button("Descargar tabla completa (CSV)", data=csv_bytes, file_name="tabla_completa_2025_2026.csv", mime="text/csv")
+render_panel("presup")
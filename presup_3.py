@@ -1,70 +1,39 @@
-import json
-from pathlib import Path
+import os
 
-import pandas as pd
 import streamlit as st
 import streamlit.components.v1 as components
 
-st.set_page_config(page_title="PGN Dashboard Paraguay 2025-2026", layout="wide")
-
-EXCEL_PATH = Path(__file__).parent / "presup_py_v3.xlsx"  # debe estar en el repo
-
-@st.cache_data(show_spinner=False)
-def load_payload():
-    if not EXCEL_PATH.exists():
-        raise FileNotFoundError(f"No se encontró el Excel en: {EXCEL_PATH}")
-    df = pd.read_excel(EXCEL_PATH, sheet_name="Sheet1")
-    df = df.loc[:, ~df.columns.astype(str).str.startswith("Unnamed")].copy()
+from pgn import assets as pgn_assets
+from pgn import data as pgn_data
+from pgn import warmup
+from pgn.html import register_page
+from pgn.metrics import metrics, render_panel
 
-    rename_map = {
-        "Sección": "seccion",
-        "Categoría": "categoria",
-        "Código": "codigo",
-        "Item_2025": "item_2025",
-        "Monto_2025": "monto_2025",
-        "Item_2026": "item_2026",
-        "Monto_2026": "monto_2026",
-        "Variación %": "variacion_pct",
-    }
-    df = df.rename(columns={k: v for k, v in rename_map.items() if k in df.columns})
-
-    for c in ["monto_2025", "monto_2026"]:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0).astype("int64")
-
-    if "variacion_pct" in df.columns:
-        df["variacion_pct"] = pd.to_numeric(df["variacion_pct"], errors="coerce")
+st.set_page_config(page_title="PGN Dashboard Paraguay 2025-2026", layout="wide")
+# Tiempos por etapa de cada rerun (pgn.metrics): no-op salvo con PGN_METRICS=1/panel
+metrics.begin_run("presup_3")
 
-    return {"records": df.fillna("").to_dict(orient="records"), "meta": {"row_count": int(df.shape[0])}}
+EXCEL_PATH = pgn_data.DEFAULT_WORKBOOK  # presup_py_v3.xlsx (debe estar en el repo), o PGN_WORKBOOK
+PAYLOAD_MODE = os.environ.get("PGN_PAYLOAD_MODE", "columnar")  # records | columnar | columnar+gzip
+DEV_OVERLAY = os.environ.get("PGN_DEV_OVERLAY", "0") == "1"  # overlay de tiempos de render en el iframe
 
 st.title("PGN Dashboard Paraguay 2025-2026")
-st.caption("Streamlit Cloud: React + Recharts via CDN embebido (sin Babel/JSX, para evitar bloqueos de CSP).")
-
-try:
-    payload = load_payload()
-except Exception as e:
-    st.error(f"Error leyendo el Excel: {e}")
-    st.stop()
-
-data_json = json.dumps(payload, ensure_ascii=False)
+st.caption("Streamlit Cloud: React + Recharts embebido (sin Babel/JSX, para evitar bloqueos de CSP).")
 
 # IMPORTANTE:
 # - NO usamos Babel (porque requiere eval y Streamlit Cloud/CSP suele bloquearlo), así evitamos pantalla en blanco.
 # - Construimos React sin JSX (React.createElement).
-html = """
+HTML_TEMPLATE = """
 <!doctype html>
 <html>
   <head>
     <meta charset=\"utf-8\" />
     <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
     <title>PGN Dashboard</title>
+    <meta name=\"pgn-digest\" content=\"__PGN_DIGEST__\" />
 
-    <!-- React (UMD) -->
-    <script crossorigin src=\"https://unpkg.com/react@18/umd/react.production.min.js\"></script>
-    <script crossorigin src=\"https://unpkg.com/react-dom@18/umd/react-dom.production.min.js\"></script>
-
-    <!-- Recharts (UMD) -->
-    <script src=\"https://unpkg.com/recharts/umd/Recharts.min.js\"></script>
+    <!-- React + Recharts (UMD, versiones fijas; ver pgn.assets) -->
+    __PGN_VENDOR_SCRIPTS__
 
     <style>
       body {
@@ -113,8 +82,9 @@ html = """
         display: inline-block;
       }
       .mono { font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, \"Liberation Mono\", \"Courier New\", monospace; }
-      select {
+      select, input[type=search] {
         width: 100%;
+        box-sizing: border-box;
         padding: 12px 16px;
         font-size: 16px;
         background: #1e293b;
@@ -124,6 +94,7 @@ html = """
         cursor: pointer;
         outline: none;
       }
+      input[type=search] { cursor: text; margin-bottom: 8px; }
       .chips { margin-top: 12px; display: flex; gap: 8px; flex-wrap: wrap; }
       .chip { padding: 4px 12px; border-radius: 999px; font-size: 12px; }
       .chip-blue { background: rgba(14,165,233,0.2); color: #0ea5e9; }
@@ -153,15 +124,42 @@ html = """
       const h = React.createElement;
       const { ResponsiveContainer, BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, PieChart, Pie, Cell } = Recharts;
 
-      function parseData() {
-        try {
-          const el = document.getElementById("pgn-data");
-          return JSON.parse(el.textContent || "{}");
-        } catch (e) {
-          return { records: [], meta: { error: String(e) } };
-        }
+      __PGN_DECODER_JS__
+
+      // Datos bajo demanda (pgn.service): el HTML trae sólo la primera página de cada
+      // ranking, la raíz del cubo y el índice de organismos; lo demás se pide al navegar.
+      __PGN_SEARCH_JS__
+      __PGN_OBJETOS_JS__
+      __PGN_CLIENT_JS__
+      let CLIENT = createPgnClient(null);
+      let OBJETOS = CLIENT.objetos;
+
+      function toRankRow(r) {
+        return { codigo: r.codigo, organismo: r.item_2026 || r.item_2025 || "", monto_2026: Number(r.monto_2026 || 0), variacion_pct: Number(r.variacion_pct) };
+      }
+
+      // Overlay de tiempos de render (dev): PGN_DEV_OVERLAY=1 al lanzar Streamlit.
+      // Mide render + commit de App con performance.now() (el Profiler de React no
+      // reporta en el build de producción) y escribe directo al DOM, sin re-render.
+      const DEV_OVERLAY = __PGN_DEV_OVERLAY__;
+      const FRAME_BUDGET_MS = 16.7;
+
+      function createRenderOverlay() {
+        const el = document.createElement("div");
+        el.setAttribute("style", "position:fixed;right:8px;bottom:8px;z-index:9999;padding:6px 10px;border-radius:8px;font:12px monospace;background:rgba(15,23,42,0.9);color:#e2e8f0;border:1px solid #334155");
+        document.body.appendChild(el);
+        let count = 0, max = 0, over = 0;
+        return function record(ms) {
+          count += 1;
+          max = Math.max(max, ms);
+          if (ms > FRAME_BUDGET_MS) over += 1;
+          el.style.borderColor = ms > FRAME_BUDGET_MS ? "#ef4444" : "#10b981";
+          el.textContent = "render " + ms.toFixed(2) + " ms | máx " + max.toFixed(2) + " ms | " + count + " renders | " + over + " > " + FRAME_BUDGET_MS + " ms";
+        };
       }
 
+      const recordRender = DEV_OVERLAY ? createRenderOverlay() : null;
+
       function formatGs(num) {
         const n = Number(num || 0);
         if (n >= 1e12) return "₲ " + (n / 1e12).toFixed(2) + " B";
@@ -175,33 +173,14 @@ html = """
         return str.length > max ? str.slice(0, max - 1) + "…" : str;
       }
 
-      const entidadesData = {
-        "Ministerio de Educación y Ciencias": {
-          codigo: "20",
-          nivel: "Poder Ejecutivo",
-          pgn2025: { 100: 6310000000000, 200: 485000000000, 300: 2350000000000, 400: 165000000000, 500: 285000000000, 800: 105000000000, 900: 0 },
-          pgn2026: { 100: 6850000000000, 200: 545000000000, 300: 2580000000000, 400: 185000000000, 500: 320000000000, 800: 120000000000, 900: 0 }
-        },
-        "Ministerio de Salud Pública": {
-          codigo: "21",
-          nivel: "Poder Ejecutivo",
-          pgn2025: { 100: 4150000000000, 200: 720000000000, 300: 3280000000000, 400: 485000000000, 500: 680000000000, 800: 185000000000, 900: 0 },
-          pgn2026: { 100: 4650000000000, 200: 850000000000, 300: 3520000000000, 400: 540000000000, 500: 780000000000, 800: 220000000000, 900: 0 }
-        },
-        "Ministerio de Economía y Finanzas": {
-          codigo: "12",
-          nivel: "Poder Ejecutivo",
-          pgn2025: { 100: 520000000000, 200: 145000000000, 300: 92000000000, 400: 38000000000, 500: 65000000000, 800: 16300000000000, 900: 4840000000000 },
-          pgn2026: { 100: 555000000000, 200: 158000000000, 300: 98000000000, 400: 42000000000, 500: 72000000000, 800: 17500000000000, 900: 5275000000000 }
-        }
-      };
-
       const objetosGasto = {
         100: { nombre: "Servicios Personales", color: "#0ea5e9" },
         200: { nombre: "Servicios No Personales", color: "#8b5cf6" },
         300: { nombre: "Bienes de Consumo e Insumos", color: "#10b981" },
         400: { nombre: "Bienes de Cambio", color: "#f59e0b" },
         500: { nombre: "Inversión Física", color: "#ef4444" },
+        600: { nombre: "Inversión Financiera", color: "#14b8a6" },
+        700: { nombre: "Servicio de Deuda Pública", color: "#f97316" },
         800: { nombre: "Transferencias", color: "#ec4899" },
         900: { nombre: "Otros Gastos", color: "#6b7280" }
       };
@@ -211,14 +190,16 @@ html = """
       }
 
       function RankTable(props) {
-        const { title, subtitle, rows, type } = props;
+        const { title, subtitle, rows, type, offset = 0, pager = null, error = null } = props;
         return h("div", { className: "card" },
           h("div", { style: { display: "flex", justifyContent: "space-between", alignItems: "baseline", gap: 12 } },
             h("div", null,
               h("h3", { style: { margin: 0, fontSize: 16, fontWeight: 800 } }, title),
               h("p", { style: { margin: "6px 0 0", fontSize: 12, color: "#64748b" } }, subtitle)
-            )
+            ),
+            pager
           ),
+          error ? h("p", { className: "small", style: { color: "#ef4444" } }, "No se pudo cargar la página: " + error) : null,
           h("table", null,
             h("thead", null,
               h("tr", null,
@@ -232,7 +213,7 @@ html = """
             h("tbody", null,
               rows.map((r, idx) =>
                 h("tr", { key: (r.codigo || "NA") + "-" + idx },
-                  h("td", { style: { textAlign: "right", color: "#94a3b8" } }, String(idx + 1)),
+                  h("td", { style: { textAlign: "right", color: "#94a3b8" } }, String(offset + idx + 1)),
                   h("td", { style: { textAlign: "center" } }, h("span", { className: "mono" }, r.codigo || "—")),
                   h("td", null, clampText(r.organismo, 60)),
                   type === "var"
@@ -246,30 +227,113 @@ html = """
         );
       }
 
+      // Un ranking paginado: sólo se pide al servicio la página que está en pantalla
+      function RankingCard(props) {
+        const { name } = props;
+        const [page, setPage] = React.useState(0);
+        const [view, setView] = React.useState(() => ({ rows: (CLIENT.peekRankingPage(name, 0) || []).map(toRankRow), error: null }));
+        React.useEffect(() => {
+          let alive = true;
+          CLIENT.rankingPage(name, page).then(
+            (rows) => { if (alive) setView({ rows: rows.map(toRankRow), error: null }); },
+            (e) => { if (alive) setView({ rows: [], error: String(e.message || e) }); }
+          );
+          return () => { alive = false; };
+        }, [name, page]);
+        const pages = CLIENT.pages(name);
+        const pager = pages > 1
+          ? h("div", { className: "btnrow", style: { marginBottom: 0, alignItems: "center" } },
+              h("button", { disabled: page === 0, onClick: () => setPage(page - 1) }, "‹"),
+              h("span", { className: "small", style: { margin: 0 } }, (page + 1) + " / " + pages),
+              h("button", { disabled: page >= pages - 1, onClick: () => setPage(page + 1) }, "›")
+            )
+          : null;
+        return h(RankTable, Object.assign({}, props, { rows: view.rows, error: view.error, offset: page * CLIENT.pageSize, pager: pager }));
+      }
+
+      // Props fijas: no se re-renderizan al cambiar de organismo
+      const RankingCardMemo = React.memo(RankingCard);
+
+      // Totales por Sección → Categoría → Entidad (pgn.rollups): un nodo por pedido
+      function RollupCard() {
+        const [node, setNode] = React.useState(CLIENT.rootRollup);
+        const [error, setError] = React.useState(null);
+        const open = (id) => CLIENT.rollup(id).then(
+          (n) => { setNode(n); setError(null); },
+          (e) => setError(String(e.message || e))
+        );
+        if (!node) return null;
+        const right = { style: { textAlign: "right" } };
+        const pct = (v) => v === null || v === undefined ? "—" : (v >= 0 ? "+" : "") + Number(v).toFixed(1) + "%";
+        const crumbs = (node.path || []).concat([{ id: node.id, nombre: node.nombre }]);
+        return h("div", { className: "card", style: { marginBottom: 24 } },
+          h("h2", { style: { margin: "0 0 12px", fontSize: 18, fontWeight: 900 } }, "🏛️ Totales por Sección, Categoría y Entidad"),
+          h("div", { className: "btnrow", style: { flexWrap: "wrap" } },
+            crumbs.map((c, i) => h("button", { key: c.id, className: i === crumbs.length - 1 ? "active" : "", onClick: () => open(c.id) }, clampText(c.nombre, 40)))
+          ),
+          error ? h("p", { className: "small", style: { color: "#ef4444" } }, "No se pudo cargar: " + error) : null,
+          h("table", null,
+            h("thead", null,
+              h("tr", null,
+                h("th", null, node.level === "categoria" ? "Entidad" : "Nombre"),
+                h("th", right, "Monto 2025"),
+                h("th", right, "Monto 2026"),
+                h("th", right, "Var. %"),
+                h("th", right, "% del nivel")
+              )
+            ),
+            h("tbody", null,
+              (node.children || []).map((c) =>
+                h("tr", { key: c.id, onClick: c.has_children ? () => open(c.id) : undefined, style: { cursor: c.has_children ? "pointer" : "default" } },
+                  h("td", null, (c.has_children ? "▸ " : "") + clampText(c.nombre, 60)),
+                  h("td", right, h("span", { className: "mono" }, formatGs(c.monto_2025))),
+                  h("td", right, h("span", { className: "mono" }, formatGs(c.monto_2026))),
+                  h("td", right, pct(c.variacion_pct)),
+                  h("td", right, c.share_parent_pct === null ? "—" : Number(c.share_parent_pct).toFixed(1) + "%")
+                )
+              )
+            )
+          )
+        );
+      }
+
+      const RollupCardMemo = React.memo(RollupCard);
+
       function App() {
-        const dataset = parseData();
-        const records = Array.isArray(dataset.records) ? dataset.records : [];
+        const t0 = DEV_OVERLAY ? performance.now() : 0;
+        React.useLayoutEffect(() => {
+          if (recordRender) recordRender(performance.now() - t0);
+        });
 
-        const [selectedEntity, setSelectedEntity] = React.useState("Ministerio de Educación y Ciencias");
+        const [selectedEntity, setSelectedEntity] = React.useState(OBJETOS.selected);
+        const [entitySlice, setEntitySlice] = React.useState({ slice: OBJETOS.initial, error: null });
         const [comparisonMode, setComparisonMode] = React.useState("absoluto");
 
-        const top15Monto2026 = React.useMemo(() => {
-          return records
-            .map(r => ({ codigo: r.codigo, organismo: r.item_2026 || r.item_2025 || "", monto_2026: Number(r.monto_2026 || 0) }))
-            .sort((a, b) => b.monto_2026 - a.monto_2026)
-            .slice(0, 15);
-        }, [records]);
-
-        const top15VarPos = React.useMemo(() => {
-          return records
-            .map(r => ({ codigo: r.codigo, organismo: r.item_2026 || r.item_2025 || "", monto_2026: Number(r.monto_2026 || 0), variacion_pct: Number(r.variacion_pct) }))
-            .filter(r => Number.isFinite(r.variacion_pct) && r.variacion_pct > 0)
-            .sort((a, b) => b.variacion_pct - a.variacion_pct)
-            .slice(0, 15);
-        }, [records]);
+        const entityOptions = React.useMemo(
+          () => OBJETOS.entities.map((e, pos) => Object.assign({}, e, { pos: pos })).sort((a, b) => a.nombre.localeCompare(b.nombre)),
+          []
+        );
 
-        const entityKeys = React.useMemo(() => Object.keys(entidadesData).sort(), []);
-        const entityData = entidadesData[selectedEntity];
+        // Búsqueda (pgn.search): el índice viene armado en el payload; con consulta,
+        // el select muestra sólo las coincidencias, de la más relevante a la menos
+        const [query, setQuery] = React.useState("");
+        const searchIndex = React.useMemo(() => createSearchIndex(OBJETOS.index), []);
+        const matches = React.useMemo(() => (query.trim() ? searchIndex.search(query, 50) : null), [query]);
+        const shownOptions = matches ? matches.map((pos) => Object.assign({}, OBJETOS.entities[pos], { pos: pos })) : entityOptions;
+        React.useEffect(() => {
+          if (matches && matches.length && matches.indexOf(selectedEntity) < 0) setSelectedEntity(matches[0]);
+        }, [matches]);
+
+        React.useEffect(() => {
+          let alive = true;
+          OBJETOS.get(selectedEntity).then(
+            (slice) => { if (alive) setEntitySlice({ slice: slice, error: null }); },
+            (e) => { if (alive) setEntitySlice({ slice: null, error: String(e.message || e) }); }
+          );
+          return () => { alive = false; };
+        }, [selectedEntity]);
+
+        const entityData = React.useMemo(() => objetosEntityData(entitySlice.slice), [entitySlice]);
 
         const comparisonData = React.useMemo(() => {
           if (!entityData) return [];
@@ -293,8 +357,9 @@ html = """
 
         const totalData = React.useMemo(() => {
           if (!entityData) return { total2025: 0, total2026: 0, variacion: 0 };
-          const total2025 = sumObj(entityData.pgn2025);
-          const total2026 = sumObj(entityData.pgn2026);
+          // totales de control si la fuente los trae; si no, suma de objetos
+          const total2025 = Number(entityData.total2025) || sumObj(entityData.pgn2025);
+          const total2026 = Number(entityData.total2026) || sumObj(entityData.pgn2026);
           const variacion = total2025 > 0 ? ((total2026 - total2025) / total2025) * 100 : 0;
           return { total2025, total2026, variacion: Number(variacion.toFixed(1)) };
         }, [entityData]);
@@ -326,18 +391,25 @@ html = """
           ),
 
           h("div", { className: "grid", style: { marginBottom: 24 } },
-            h(RankTable, { title: "Top 15 — Organismos con mayor gasto asignado (2026)", subtitle: "Ranking institucional (monto 2026)", rows: top15Monto2026, type: "monto" }),
-            h(RankTable, { title: "Top 15 — Mayor variación positiva (2026 vs 2025)", subtitle: "Ranking institucional (variación %)", rows: top15VarPos, type: "var" })
+            h(RankingCardMemo, { name: "monto_2026", title: "Top 15 — Organismos con mayor gasto asignado (2026)", subtitle: "Ranking institucional (monto 2026)", type: "monto" }),
+            h(RankingCardMemo, { name: "var_pos", title: "Top 15 — Mayor variación positiva (2026 vs 2025)", subtitle: "Ranking institucional (variación %)", type: "var" })
           ),
 
+          h(RollupCardMemo, null),
+
           h("div", { className: "card", style: { marginBottom: 24 } },
-            h("label", { style: { display: "block", marginBottom: 8, fontSize: 14, color: "#94a3b8", fontWeight: 800 } }, "📊 Seleccionar Organismo (mock para desglose por objeto)"),
-            h("select", { value: selectedEntity, onChange: (e) => setSelectedEntity(e.target.value) },
-              entityKeys.map(k => h("option", { key: k, value: k }, k))
+            h("label", { style: { display: "block", marginBottom: 8, fontSize: 14, color: "#94a3b8", fontWeight: 800 } }, "📊 Seleccionar Organismo (desglose por objeto)"),
+            h("input", { type: "search", value: query, placeholder: "Buscar por nombre o código (sin acentos, aproximada)", onChange: (e) => setQuery(e.target.value) }),
+            h("select", { value: selectedEntity, onChange: (e) => setSelectedEntity(Number(e.target.value)) },
+              shownOptions.map(e => h("option", { key: e.pos, value: e.pos }, e.nombre))
             ),
             h("div", { className: "chips" },
+              matches ? h("span", { className: "chip", style: { background: "rgba(148,163,184,0.15)", color: "#94a3b8" } }, matches.length ? matches.length + (matches.length === 1 ? " coincidencia" : " coincidencias") : "Sin coincidencias") : null,
               h("span", { className: "chip chip-blue" }, "Código: " + (entityData ? entityData.codigo : "—")),
-              h("span", { className: "chip chip-purple" }, entityData ? entityData.nivel : "—")
+              h("span", { className: "chip chip-purple" }, entityData ? entityData.nivel : "—"),
+              entitySlice.error
+                ? h("span", { className: "chip", style: { background: "rgba(239,68,68,0.2)", color: "#ef4444" } }, "No se pudo cargar el desglose: " + entitySlice.error)
+                : null
             )
           ),
 
@@ -360,7 +432,7 @@ html = """
           ),
 
           h("div", { className: "card", style: { marginBottom: 24 } },
-            h("h2", { style: { margin: "0 0 20px", fontSize: 18, fontWeight: 900 } }, "📈 Desglose por tipo de gasto (objeto) — mock"),
+            h("h2", { style: { margin: "0 0 20px", fontSize: 18, fontWeight: 900 } }, "📈 Desglose por tipo de gasto (objeto)"),
             h("div", { className: "btnrow" }, btn("absoluto", "Valores"), btn("variacion", "Variación %")),
             h("div", { style: { height: 360 } },
               h(ResponsiveContainer, { width: "100%", height: "100%" },
@@ -420,16 +492,58 @@ html = """
 
           h("div", { className: "footer" },
             h("div", null, "✅ Rankings salen del Excel del repo (", h("span", { className: "mono" }, "presup_py_v3.xlsx"), ")."),
-            h("div", { style: { marginTop: 6, fontSize: 11, color: "#475569" } }, "Si querés, conectamos el desglose real por objeto cuando tengas esa tabla.")
+            h("div", { style: { marginTop: 6, fontSize: 11, color: "#475569" } }, "Desglose por objeto: columna ", h("span", { className: "mono" }, "Objeto"), " del Excel o ", h("span", { className: "mono" }, "organismos_por_objeto.json"), ".")
           )
         );
       }
 
       const root = ReactDOM.createRoot(document.getElementById("root"));
-      root.render(h(App));
+      // Primera página de cada ranking decodificada antes del primer render (sin parpadeo)
+      Promise.resolve()
+        .then(() => { CLIENT = createPgnClient(JSON.parse(document.getElementById("pgn-data").textContent || "{}")); })
+        .catch(() => { CLIENT = createPgnClient(null); })
+        .then(() => { OBJETOS = CLIENT.objetos; return CLIENT.ready; })
+        .then(() => root.render(h(App)));
     </script>
   </body>
 </html>
-""".replace("__PGN_DATA_JSON__", data_json)
+"""
+
+# El HTML lleva sólo el bootstrap de pgn.service (primera página de cada ranking,
+# raíz del cubo, índice de organismos); el resto lo pide el iframe a
+# /app/static/data/<versión>/ al navegar. Las vistas se publican y el HTML se
+# arma una vez por versión del Excel (pgn.html): en un rerun no se re-serializa
+# nada y el iframe recibe el mismo string (no se re-monta).
+scripts = pgn_assets.resolve(base_url=st.get_option("server.baseUrlPath"))
+if scripts.warning:
+    st.warning(scripts.warning)
+
+# La página se arma en pgn.html (también la usa pgn.warmup cuando llega una
+# revisión nueva del Excel); se registra una sola vez por proceso.
+build_page = register_page(
+    "presup_3",
+    HTML_TEMPLATE,
+    scripts,
+    EXCEL_PATH,
+    PAYLOAD_MODE,
+    base_url=st.get_option("server.baseUrlPath"),
+    values={"__PGN_DEV_OVERLAY__": "true" if DEV_OVERLAY else "false"},
+)
+warmup.start(EXCEL_PATH)
 
-components.html(html, height=1650, scrolling=True)
+try:
+    try:
+        with metrics.span("load_budget"):
+            df = pgn_data.load_budget(EXCEL_PATH)
+        page = build_page(df)
+    except Exception as e:
+        st.error(f"Error leyendo el Excel: {e}")
+        st.stop()
+
+    with metrics.span("components.html"):
+        components.html(page.html, height=2400, scrolling=True)
+finally:
+    # también cuando st.stop() corta el rerun: la corrida no queda abierta en pgn.metrics
+    metrics.end_run()
+
+render_panel("presup_3")
@@ -0,0 +1,407 @@
+// Dashboard embebido de presup_2.py (JSX).
+//
+// No editar el HTML de presup_2.py para cambiar la UI: este archivo es la fuente.
+// `python -m pgn.assets build` lo compila (sin Babel en el browser) a
+// static/build/; si no hay build, presup_2.py lo transpila con Babel en el browser.
+// Usa los globales React, ReactDOM, Recharts, loadPgnPayload (pgn.payload),
+// createObjetosStore/objetosEntityData (pgn.objects), createPgnClient (pgn.service) y
+// createSearchIndex (pgn.search).
+
+const {
+  ResponsiveContainer,
+  BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend,
+  PieChart, Pie, Cell,
+} = Recharts;
+
+const MILLION = 1_000_000;
+
+const formatGs = (num) => {
+  const n = Number(num || 0);
+  if (n >= 1e12) return `₲ ${(n / 1e12).toFixed(2)} B`;
+  if (n >= 1e9) return `₲ ${(n / 1e9).toFixed(1)} MM`;
+  if (n >= 1e6) return `₲ ${(n / 1e6).toFixed(0)} M`;
+  return `₲ ${n.toLocaleString()}`;
+};
+
+const clampText = (s, max = 60) => {
+  const str = String(s || "");
+  return str.length > max ? str.slice(0, max - 1) + "…" : str;
+};
+
+const objetosGasto = {
+  100: { nombre: "Servicios Personales", color: "#0ea5e9" },
+  200: { nombre: "Servicios No Personales", color: "#8b5cf6" },
+  300: { nombre: "Bienes de Consumo e Insumos", color: "#10b981" },
+  400: { nombre: "Bienes de Cambio", color: "#f59e0b" },
+  500: { nombre: "Inversión Física", color: "#ef4444" },
+  600: { nombre: "Inversión Financiera", color: "#14b8a6" },
+  700: { nombre: "Servicio de Deuda Pública", color: "#f97316" },
+  800: { nombre: "Transferencias", color: "#ec4899" },
+  900: { nombre: "Otros Gastos", color: "#6b7280" },
+};
+
+function sumObj(obj) {
+  return Object.values(obj || {}).reduce((a, b) => a + (Number(b) || 0), 0);
+}
+
+function RankTable({ title, subtitle, rows, type, offset = 0, pager = null, error = null }) {
+  return (
+    <div className="card">
+      <div style={{ display:"flex", justifyContent:"space-between", alignItems:"baseline", gap:12 }}>
+        <div>
+          <h3 style={{ margin:0, fontSize:16, fontWeight:800 }}>{title}</h3>
+          <p style={{ margin:"6px 0 0", fontSize:12, color:"#64748b" }}>{subtitle}</p>
+        </div>
+        {pager}
+      </div>
+      {error ? <p style={{ margin:"12px 0 0", fontSize:12, color:"#ef4444" }}>No se pudo cargar la página: {error}</p> : null}
+
+      <table>
+        <thead>
+          <tr>
+            <th style={{ textAlign:"right" }}>#</th>
+            <th style={{ textAlign:"center" }}>Código</th>
+            <th>Organismo</th>
+            {type === "var" ? <th style={{ textAlign:"right" }}>Var. %</th> : null}
+            <th style={{ textAlign:"right" }}>Monto 2026</th>
+          </tr>
+        </thead>
+        <tbody>
+          {rows.map((r, idx) => (
+            <tr key={`${r.codigo}-${idx}`}>
+              <td style={{ textAlign:"right", color:"#94a3b8" }}>{offset+idx+1}</td>
+              <td style={{ textAlign:"center" }}><span className="mono">{r.codigo || "—"}</span></td>
+              <td>{clampText(r.organismo, 60)}</td>
+              {type === "var" ? (
+                <td style={{ textAlign:"right" }}><span className="pill-green">+{Number(r.variacion_pct || 0).toFixed(1)}%</span></td>
+              ) : null}
+              <td style={{ textAlign:"right", color:"#8b5cf6" }}><span className="mono">{formatGs(r.monto_2026)}</span></td>
+            </tr>
+          ))}
+        </tbody>
+      </table>
+    </div>
+  );
+}
+
+// Datos bajo demanda (pgn.service): el HTML trae sólo la primera página de cada
+// ranking, la raíz del cubo y el índice de organismos; lo demás se pide al navegar.
+let CLIENT = createPgnClient(null);
+let OBJETOS = CLIENT.objetos;
+
+const toRankRow = (r) => ({
+  codigo: r.codigo,
+  organismo: r.item_2026 || r.item_2025 || "",
+  monto_2026: Number(r.monto_2026 || 0),
+  variacion_pct: Number(r.variacion_pct),
+});
+
+// Un ranking paginado: sólo se pide al servicio la página que está en pantalla
+function RankingCard({ name, ...props }) {
+  const [page, setPage] = React.useState(0);
+  const [view, setView] = React.useState(() => ({ rows: (CLIENT.peekRankingPage(name, 0) || []).map(toRankRow), error: null }));
+
+  React.useEffect(() => {
+    let alive = true;
+    CLIENT.rankingPage(name, page).then(
+      (rows) => { if (alive) setView({ rows: rows.map(toRankRow), error: null }); },
+      (e) => { if (alive) setView({ rows: [], error: String(e.message || e) }); }
+    );
+    return () => { alive = false; };
+  }, [name, page]);
+
+  const pages = CLIENT.pages(name);
+  const pager = pages > 1 ? (
+    <div className="btnrow" style={{ marginBottom:0, alignItems:"center" }}>
+      <button disabled={page === 0} onClick={() => setPage(page - 1)}>‹</button>
+      <span style={{ fontSize:12, color:"#64748b" }}>{page + 1} / {pages}</span>
+      <button disabled={page >= pages - 1} onClick={() => setPage(page + 1)}>›</button>
+    </div>
+  ) : null;
+  return <RankTable {...props} rows={view.rows} error={view.error} offset={page * CLIENT.pageSize} pager={pager} />;
+}
+
+// Props fijas: no se re-renderizan al cambiar de organismo
+const RankingCardMemo = React.memo(RankingCard);
+
+const pctText = (v) => (v === null || v === undefined ? "—" : `${v >= 0 ? "+" : ""}${Number(v).toFixed(1)}%`);
+
+// Totales por Sección → Categoría → Entidad (pgn.rollups): un nodo por pedido
+function RollupCard() {
+  const [node, setNode] = React.useState(CLIENT.rootRollup);
+  const [error, setError] = React.useState(null);
+  const open = (id) => CLIENT.rollup(id).then(
+    (n) => { setNode(n); setError(null); },
+    (e) => setError(String(e.message || e))
+  );
+  if (!node) return null;
+  const crumbs = [...(node.path || []), { id: node.id, nombre: node.nombre }];
+
+  return (
+    <div className="card" style={{ marginBottom:24 }}>
+      <h2 style={{ margin:"0 0 12px", fontSize:18, fontWeight:900 }}>🏛️ Totales por Sección, Categoría y Entidad</h2>
+      <div className="btnrow" style={{ flexWrap:"wrap" }}>
+        {crumbs.map((c, i) => (
+          <button key={c.id} className={i === crumbs.length - 1 ? "active" : ""} onClick={() => open(c.id)}>{clampText(c.nombre, 40)}</button>
+        ))}
+      </div>
+      {error ? <p style={{ margin:0, fontSize:12, color:"#ef4444" }}>No se pudo cargar: {error}</p> : null}
+      <table>
+        <thead>
+          <tr>
+            <th>{node.level === "categoria" ? "Entidad" : "Nombre"}</th>
+            <th style={{ textAlign:"right" }}>Monto 2025</th>
+            <th style={{ textAlign:"right" }}>Monto 2026</th>
+            <th style={{ textAlign:"right" }}>Var. %</th>
+            <th style={{ textAlign:"right" }}>% del nivel</th>
+          </tr>
+        </thead>
+        <tbody>
+          {(node.children || []).map((c) => (
+            <tr key={c.id} onClick={c.has_children ? () => open(c.id) : undefined} style={{ cursor: c.has_children ? "pointer" : "default" }}>
+              <td>{c.has_children ? "▸ " : ""}{clampText(c.nombre, 60)}</td>
+              <td style={{ textAlign:"right" }}><span className="mono">{formatGs(c.monto_2025)}</span></td>
+              <td style={{ textAlign:"right" }}><span className="mono">{formatGs(c.monto_2026)}</span></td>
+              <td style={{ textAlign:"right" }}>{pctText(c.variacion_pct)}</td>
+              <td style={{ textAlign:"right" }}>{c.share_parent_pct === null ? "—" : `${Number(c.share_parent_pct).toFixed(1)}%`}</td>
+            </tr>
+          ))}
+        </tbody>
+      </table>
+    </div>
+  );
+}
+
+const RollupCardMemo = React.memo(RollupCard);
+
+function App() {
+  const [selectedEntity, setSelectedEntity] = React.useState(OBJETOS.selected);
+  const [entitySlice, setEntitySlice] = React.useState({ slice: OBJETOS.initial, error: null });
+  const [comparisonMode, setComparisonMode] = React.useState("absoluto");
+
+  const entityOptions = React.useMemo(
+    () => OBJETOS.entities.map((e, pos) => ({ ...e, pos })).sort((a, b) => a.nombre.localeCompare(b.nombre)),
+    []
+  );
+
+  // Búsqueda (pgn.search): el índice viene armado en el payload; con consulta,
+  // el select muestra sólo las coincidencias, de la más relevante a la menos
+  const [query, setQuery] = React.useState("");
+  const searchIndex = React.useMemo(() => createSearchIndex(OBJETOS.index), []);
+  const matches = React.useMemo(() => (query.trim() ? searchIndex.search(query, 50) : null), [query]);
+  const shownOptions = matches ? matches.map((pos) => ({ ...OBJETOS.entities[pos], pos })) : entityOptions;
+  React.useEffect(() => {
+    if (matches && matches.length && !matches.includes(selectedEntity)) setSelectedEntity(matches[0]);
+  }, [matches]);
+
+  React.useEffect(() => {
+    let alive = true;
+    OBJETOS.get(selectedEntity).then(
+      (slice) => { if (alive) setEntitySlice({ slice, error: null }); },
+      (e) => { if (alive) setEntitySlice({ slice: null, error: String(e.message || e) }); }
+    );
+    return () => { alive = false; };
+  }, [selectedEntity]);
+
+  const entityData = React.useMemo(() => objetosEntityData(entitySlice.slice), [entitySlice]);
+
+  const comparisonData = React.useMemo(() => {
+    if (!entityData) return [];
+    return Object.keys(objetosGasto)
+      .map((key) => {
+        const pgn2025 = entityData.pgn2025?.[key] || 0;
+        const pgn2026 = entityData.pgn2026?.[key] || 0;
+        const variacion = pgn2025 > 0 ? ((pgn2026 - pgn2025) / pgn2025) * 100 : 0;
+        return {
+          objeto: key,
+          nombre: objetosGasto[key].nombre,
+          nombreCorto: objetosGasto[key].nombre.split(" ").slice(0,2).join(" "),
+          pgn2025,
+          pgn2026,
+          variacion: Number.isFinite(variacion) ? Number(variacion.toFixed(1)) : 0,
+          color: objetosGasto[key].color,
+        };
+      })
+      .filter(d => d.pgn2025 > 0 || d.pgn2026 > 0);
+  }, [entityData]);
+
+  const totalData = React.useMemo(() => {
+    if (!entityData) return { total2025: 0, total2026: 0, variacion: 0 };
+    // totales de control si la fuente los trae; si no, suma de objetos
+    const total2025 = Number(entityData.total2025) || sumObj(entityData.pgn2025);
+    const total2026 = Number(entityData.total2026) || sumObj(entityData.pgn2026);
+    const variacion = total2025 > 0 ? ((total2026 - total2025) / total2025) * 100 : 0;
+    return { total2025, total2026, variacion: Number(variacion.toFixed(1)) };
+  }, [entityData]);
+
+  const pieData2025 = comparisonData.map(d => ({ name: d.nombreCorto, value: d.pgn2025, color: d.color }));
+  const pieData2026 = comparisonData.map(d => ({ name: d.nombreCorto, value: d.pgn2026, color: d.color }));
+
+  return (
+    <div className="wrap">
+      <div className="header">
+        <div style={{ display:"flex", alignItems:"center", gap:16 }}>
+          <div style={{
+            width:48, height:48, borderRadius:12,
+            background:"linear-gradient(135deg,#0ea5e9,#8b5cf6)",
+            display:"flex", alignItems:"center", justifyContent:"center",
+            fontSize:24
+          }}>🇵🇾</div>
+          <div>
+            <h1 className="title">Dashboard PGN Paraguay</h1>
+            <p className="subtitle">Análisis Comparativo del Presupuesto General de la Nación 2025 vs 2026</p>
+          </div>
+        </div>
+        <p style={{ margin:"12px 0 0", fontSize:12, color:"#64748b" }}>
+          Fuente: MEF | SITUFIN — Rankings desde el Excel (presup_py_v3.xlsx)
+        </p>
+      </div>
+
+      <div className="grid" style={{ marginBottom:24 }}>
+        <RankingCardMemo
+          name="monto_2026"
+          title="Top 15 — Organismos con mayor gasto asignado (2026)"
+          subtitle="Ranking institucional (monto 2026)"
+          type="monto"
+        />
+        <RankingCardMemo
+          name="var_pos"
+          title="Top 15 — Mayor variación positiva (2026 vs 2025)"
+          subtitle="Ranking institucional (variación %)"
+          type="var"
+        />
+      </div>
+
+      <RollupCardMemo />
+
+      <div className="card" style={{ marginBottom:24 }}>
+        <label style={{ display:"block", marginBottom:8, fontSize:14, color:"#94a3b8", fontWeight:800 }}>
+          📊 Seleccionar Organismo (desglose por objeto)
+        </label>
+        <input
+          type="search"
+          value={query}
+          placeholder="Buscar por nombre o código (sin acentos, aproximada)"
+          onChange={(e) => setQuery(e.target.value)}
+        />
+        <select value={selectedEntity} onChange={(e) => setSelectedEntity(Number(e.target.value))}>
+          {shownOptions.map((e) => <option key={e.pos} value={e.pos}>{e.nombre}</option>)}
+        </select>
+        <div className="chips">
+          {matches ? (
+            <span className="chip" style={{ background:"rgba(148,163,184,0.15)", color:"#94a3b8" }}>
+              {matches.length ? `${matches.length} ${matches.length === 1 ? "coincidencia" : "coincidencias"}` : "Sin coincidencias"}
+            </span>
+          ) : null}
+          <span className="chip chip-blue">Código: {entityData?.codigo || "—"}</span>
+          <span className="chip chip-purple">{entityData?.nivel || "—"}</span>
+          {entitySlice.error ? <span className="chip" style={{ background:"rgba(239,68,68,0.2)", color:"#ef4444" }}>No se pudo cargar el desglose: {entitySlice.error}</span> : null}
+        </div>
+      </div>
+
+      <div className="grid" style={{ marginBottom:24, gridTemplateColumns:"repeat(auto-fit, minmax(280px, 1fr))" }}>
+        <div className="card" style={{ border:"1px solid rgba(14,165,233,0.3)", background:"linear-gradient(135deg, rgba(14,165,233,0.2) 0%, rgba(14,165,233,0.05) 100%)" }}>
+          <div style={{ fontSize:12, color:"#0ea5e9", fontWeight:900, letterSpacing:1, textTransform:"uppercase" }}>PGN 2025</div>
+          <div style={{ fontSize:28, fontWeight:900, marginTop:8 }}>{formatGs(totalData.total2025)}</div>
+        </div>
+        <div className="card" style={{ border:"1px solid rgba(139,92,246,0.3)", background:"linear-gradient(135deg, rgba(139,92,246,0.2) 0%, rgba(139,92,246,0.05) 100%)" }}>
+          <div style={{ fontSize:12, color:"#8b5cf6", fontWeight:900, letterSpacing:1, textTransform:"uppercase" }}>PGN 2026</div>
+          <div style={{ fontSize:28, fontWeight:900, marginTop:8 }}>{formatGs(totalData.total2026)}</div>
+        </div>
+        <div className="card" style={{
+          border:`1px solid ${totalData.variacion >= 0 ? "rgba(16,185,129,0.3)" : "rgba(239,68,68,0.3)"}`,
+          background:`linear-gradient(135deg, ${totalData.variacion >= 0 ? "rgba(16,185,129,0.2)" : "rgba(239,68,68,0.2)"} 0%, ${totalData.variacion >= 0 ? "rgba(16,185,129,0.05)" : "rgba(239,68,68,0.05)"} 100%)`
+        }}>
+          <div style={{ fontSize:12, color: totalData.variacion >= 0 ? "#10b981" : "#ef4444", fontWeight:900, letterSpacing:1, textTransform:"uppercase" }}>Variación</div>
+          <div style={{ fontSize:28, fontWeight:900, marginTop:8 }}>
+            {totalData.variacion >= 0 ? "+" : ""}{totalData.variacion}%
+          </div>
+        </div>
+      </div>
+
+      <div className="card" style={{ marginBottom:24 }}>
+        <h2 style={{ margin:"0 0 20px", fontSize:18, fontWeight:900 }}>📈 Desglose por tipo de gasto (objeto)</h2>
+        <div className="btnrow">
+          <button className={comparisonMode === "absoluto" ? "active" : ""} onClick={() => setComparisonMode("absoluto")}>Valores</button>
+          <button className={comparisonMode === "variacion" ? "active" : ""} onClick={() => setComparisonMode("variacion")}>Variación %</button>
+        </div>
+
+        <div style={{ height:360 }}>
+          <ResponsiveContainer width="100%" height="100%">
+            {comparisonMode === "absoluto" ? (
+              <BarChart data={comparisonData} margin={{ top:20, right:30, left:20, bottom:70 }}>
+                <CartesianGrid strokeDasharray="3 3" stroke="#334155" />
+                <XAxis dataKey="nombreCorto" angle={-45} textAnchor="end" fontSize={11} stroke="#64748b" height={90} />
+                <YAxis stroke="#64748b" fontSize={11}
+                  tickFormatter={(v) => v >= 1e12 ? `${(v/1e12).toFixed(1)}B` : v >= 1e9 ? `${(v/1e9).toFixed(0)}MM` : `${(v/1e6).toFixed(0)}M`}
+                />
+                <Tooltip contentStyle={{ background:"#1e293b", border:"1px solid #334155", borderRadius:10 }} formatter={(value) => formatGs(value)} />
+                <Legend />
+                <Bar dataKey="pgn2025" name="PGN 2025" fill="#0ea5e9" radius={[4,4,0,0]} />
+                <Bar dataKey="pgn2026" name="PGN 2026" fill="#8b5cf6" radius={[4,4,0,0]} />
+              </BarChart>
+            ) : (
+              <BarChart data={comparisonData} margin={{ top:20, right:30, left:20, bottom:70 }}>
+                <CartesianGrid strokeDasharray="3 3" stroke="#334155" />
+                <XAxis dataKey="nombreCorto" angle={-45} textAnchor="end" fontSize={11} stroke="#64748b" height={90} />
+                <YAxis stroke="#64748b" fontSize={11} unit="%" />
+                <Tooltip contentStyle={{ background:"#1e293b", border:"1px solid #334155", borderRadius:10 }} formatter={(value) => `${value}%`} />
+                <Bar dataKey="variacion" name="Variación %" radius={[4,4,0,0]}>
+                  {comparisonData.map((entry, index) => (
+                    <Cell key={`c-${index}`} fill={entry.variacion >= 0 ? "#10b981" : "#ef4444"} />
+                  ))}
+                </Bar>
+              </BarChart>
+            )}
+          </ResponsiveContainer>
+        </div>
+      </div>
+
+      <div className="grid" style={{ marginBottom:24, gridTemplateColumns:"repeat(auto-fit, minmax(350px, 1fr))" }}>
+        <div className="card">
+          <h3 style={{ margin:"0 0 16px", fontSize:16, fontWeight:900, color:"#0ea5e9" }}>🥧 Distribución PGN 2025</h3>
+          <div style={{ height:280 }}>
+            <ResponsiveContainer width="100%" height="100%">
+              <PieChart>
+                <Pie data={pieData2025} cx="50%" cy="50%" innerRadius={60} outerRadius={100} paddingAngle={2} dataKey="value">
+                  {pieData2025.map((entry, index) => <Cell key={`p25-${index}`} fill={entry.color} />)}
+                </Pie>
+                <Tooltip contentStyle={{ background:"#1e293b", border:"1px solid #334155", borderRadius:10, fontSize:12 }} formatter={(value) => formatGs(value)} />
+              </PieChart>
+            </ResponsiveContainer>
+          </div>
+        </div>
+
+        <div className="card">
+          <h3 style={{ margin:"0 0 16px", fontSize:16, fontWeight:900, color:"#8b5cf6" }}>🥧 Distribución PGN 2026</h3>
+          <div style={{ height:280 }}>
+            <ResponsiveContainer width="100%" height="100%">
+              <PieChart>
+                <Pie data={pieData2026} cx="50%" cy="50%" innerRadius={60} outerRadius={100} paddingAngle={2} dataKey="value">
+                  {pieData2026.map((entry, index) => <Cell key={`p26-${index}`} fill={entry.color} />)}
+                </Pie>
+                <Tooltip contentStyle={{ background:"#1e293b", border:"1px solid #334155", borderRadius:10, fontSize:12 }} formatter={(value) => formatGs(value)} />
+              </PieChart>
+            </ResponsiveContainer>
+          </div>
+        </div>
+      </div>
+
+      <div className="footer">
+        <div>✅ Rankings salen del Excel del repo (<span className="mono">presup_py_v3.xlsx</span>).</div>
+        <div style={{ marginTop:6, fontSize:11, color:"#475569" }}>
+          Desglose por objeto: columna <span className="mono">Objeto</span> del Excel o <span className="mono">organismos_por_objeto.json</span>.
+        </div>
+      </div>
+    </div>
+  );
+}
+
+const root = ReactDOM.createRoot(document.getElementById("root"));
+// La primera página de cada ranking puede venir columnar/comprimida: se decodifica
+// antes del primer render (sin parpadeo)
+Promise.resolve()
+  .then(() => { CLIENT = createPgnClient(window.__PGN_DATA__); })
+  .catch(() => { CLIENT = createPgnClient(null); })
+  .then(() => { OBJETOS = CLIENT.objetos; return CLIENT.ready; })
+  .then(() => root.render(<App />));
@@ -0,0 +1,35 @@
+from pgn.artifacts import ArtifactCache
+
+
+def test_evict_listener_keeps_last_versions():
+    cache = ArtifactCache()
+    dropped = []
+    cache.on_evict(dropped.append, keep=2)
+    for version in ("v1", "v2", "v3"):
+        cache.put(version, "x", b"1")
+        cache.evict_version(version)
+    assert dropped == ["v1"]
+
+
+def test_version_used_again_is_not_dropped():
+    cache = ArtifactCache()
+    dropped = []
+    cache.on_evict(dropped.append, keep=1)
+    cache.put("v1", "x", b"1")
+    cache.evict_version("v1")
+    cache.put("v1", "x", b"1")  # la versión vuelve (p. ej. se restauró el Excel)
+    cache.evict_version("v2")
+    cache.evict_version("v3")
+    assert dropped == ["v2"]
+
+
+def test_lru_eviction_notifies_when_version_is_gone():
+    cache = ArtifactCache(max_bytes=100)
+    dropped = []
+    cache.on_evict(dropped.append)
+    cache.put("a", "x", b"1" * 40)
+    cache.put("a", "y", b"1" * 40)
+    cache.put("b", "x", b"1" * 40)
+    assert dropped == []  # "a" todavía tiene "y"
+    cache.put("b", "y", b"1" * 40)
+    assert dropped == ["a"]
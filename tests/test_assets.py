@@ -0,0 +1,39 @@
+import io
+import json
+
+from pgn import assets
+
+
+def _use_tmp_vendor(monkeypatch, tmp_path):
+    vendor = tmp_path / "vendor"
+    monkeypatch.setattr(assets, "VENDOR_DIR", vendor)
+    monkeypatch.setattr(assets, "LOCK_FILE", vendor / "assets.lock.json")
+    return vendor
+
+
+def test_ensure_fetches_only_missing(monkeypatch, tmp_path):
+    _use_tmp_vendor(monkeypatch, tmp_path)
+    fetched = []
+
+    def urlopen(url, timeout):
+        fetched.append(url)
+        return io.BytesIO(b"// " + url.encode())
+
+    monkeypatch.setattr(assets.urllib.request, "urlopen", urlopen)
+    assert assets.ensure() == []
+    assert len(fetched) == len(assets.VENDOR) and assets.local_ready()
+    fetched.clear()
+    assert assets.ensure() == [] and fetched == []
+
+
+def test_ensure_rejects_content_not_in_lock(monkeypatch, tmp_path):
+    vendor = _use_tmp_vendor(monkeypatch, tmp_path)
+    vendor.mkdir()
+    asset = assets.VENDOR["react"]
+    lock = {"vendor": {"react": {"version": asset.version, "url": asset.url, "file": "react.js",
+                                 "integrity": assets._integrity(b"original")}}, "build": {}}
+    (vendor / "assets.lock.json").write_text(json.dumps(lock))
+    monkeypatch.setattr(assets.urllib.request, "urlopen", lambda url, timeout: io.BytesIO(b"otro"))
+    errors = assets.ensure()
+    assert any(e.startswith("react@") for e in errors)
+    assert not (vendor / "react.js").exists()
@@ -0,0 +1,13 @@
+import pandas as pd
+
+from pgn.data import row_keys
+
+
+def test_row_keys_match_by_code_and_occurrence():
+    old = pd.DataFrame({"codigo": ["12-01", "12-01", "23-04", None]})
+    new = pd.DataFrame({"codigo": [None, "23-04", "12-01", "12-01", "12-01"]})
+    old_keys, new_keys = row_keys(old, new)
+    # mismo código y misma aparición → misma clave, en cualquier posición
+    assert new_keys[1] == old_keys[2] and new_keys[0] == old_keys[3]
+    assert new_keys[2] == old_keys[0] and new_keys[3] == old_keys[1]
+    assert new_keys[4] not in set(old_keys)
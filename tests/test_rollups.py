@@ -0,0 +1,37 @@
+import pandas as pd
+
+from pgn.data import normalize
+from pgn.delta import apply_revision
+from pgn.rollups import MISSING_LABELS, build_cube, get_cube
+
+
+def _frame(monto_2026=(100, 200, 300)):
+    raw = pd.DataFrame({
+        "Sección": ["Administración Central", None, "Administración Central"],
+        "Categoría": ["Poder Legislativo", "Poder Legislativo", None],
+        "Código": ["11-01", "11-02", "12-01"],
+        "Item_2025": ["Congreso", "Senado", "Presidencia"],
+        "Monto_2025": [90, 180, 310],
+        "Item_2026": ["Congreso", "Senado", "Presidencia"],
+        "Monto_2026": list(monto_2026),
+    })
+    return normalize(raw)
+
+
+def test_blank_seccion_and_categoria_get_a_parent():
+    cube = build_cube(_frame())
+    secciones = cube.children(())["seccion"].tolist()
+    assert MISSING_LABELS["seccion"] in secciones
+    node = cube.node((MISSING_LABELS["seccion"], "Poder Legislativo"))
+    assert node["monto_2026"] == 200
+    assert cube.node(("Administración Central", MISSING_LABELS["categoria"]))["monto_2026"] == 300
+    assert cube.node(())["monto_2026"] == 600
+
+
+def test_incremental_cube_matches_rebuild_with_blank_keys():
+    old, new = _frame(), _frame(monto_2026=(100, 250, 300))
+    old.attrs["version"], new.attrs["version"] = "test-old", "test-new"
+    get_cube(old)
+    apply_revision(old, new)
+    expected = build_cube(new).table
+    pd.testing.assert_frame_equal(get_cube(new).table, expected)